@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from auth.security import get_current_user
+from jarvis_core import INTENT_INDEX
+from utils.metrics import snapshot
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+def require_admin(current_user: dict = Depends(get_current_user)):
+    if current_user.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
+
+# ==============================
+# 🧭 INTENT INDEX STATUS
+# ==============================
+@router.get("/intent-index")
+def intent_index_status(_: dict = Depends(require_admin)):
+    return INTENT_INDEX.status()
+
+
+# ==============================
+# 🔄 FORCE INTENT INDEX RELOAD
+# ==============================
+@router.post("/intent-index/reload")
+def reload_intent_index(_: dict = Depends(require_admin)):
+    swapped = INTENT_INDEX.reload(force=True)
+    return {"reloaded": swapped, **INTENT_INDEX.status()}
+
+
+# ==============================
+# 📈 RUNTIME METRICS
+# ==============================
+@router.get("/metrics")
+def runtime_metrics(_: dict = Depends(require_admin)):
+    return snapshot()
@@ -0,0 +1,110 @@
+# ai_cache.py
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_command(text: str) -> str:
+    """Case/whitespace/trailing punctuation only — "c++" must stay "c++"."""
+    text = re.sub(r"\s+", " ", text.lower()).strip()
+    return text.rstrip("?!. ")
+
+
+class AIResponseCache:
+    """
+    Bounded TTL + LRU cache of AI replies.
+
+    The key hashes the normalized command together with the exact
+    intent_context and memory summary the model would see, so a hit is
+    only possible when the prompt is effectively identical. With
+    scope="user" the user id is part of the key as well, and requests
+    without one (guests, who would all share a scope) are not cached;
+    "global" shares answers between users whose prompts match.
+
+    `reject(text)` decides which replies must never be stored
+    (error messages, responses caught by the bad-response filter).
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 3600,
+                 scope: str = "user", reject=None, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.scope = scope
+        self.reject = reject or (lambda text: False)
+        self.enabled = enabled
+
+        self._entries = OrderedDict()   # key -> (expires_at, reply, cost_ms)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.saved_ms = 0.0
+
+    def key(self, user_command: str, memory_summary: str = "",
+            intent_context=None, user_id=None):
+        """Cache key, or None when the request must not be cached."""
+        if self.scope == "user" and not user_id:
+            return None
+
+        parts = [
+            normalize_command(user_command),
+            intent_context or "",
+            memory_summary or "",
+            user_id if self.scope == "user" else "",
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        if not self.enabled or key is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            self.saved_ms += entry[2]
+            return entry[1]
+
+    def put(self, key, reply: str, cost_ms: float = 0.0) -> bool:
+        if not self.enabled or key is None:
+            return False
+
+        if not reply or self.reject(reply):
+            with self._lock:
+                self.rejected += 1
+            return False
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, reply, cost_ms)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "scope": self.scope,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "rejected": self.rejected,
+                "latency_saved_ms": round(self.saved_ms, 1),
+            }
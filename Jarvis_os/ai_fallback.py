@@ -1,13 +1,27 @@
 # ai_fallback.py
 import os
+import json
+import time
+import asyncio
 import requests
+import httpx
 from dotenv import load_dotenv
 from typing import Optional
 
+from ai_cache import AIResponseCache
+from utils.metrics import latency, counter, register
+
 load_dotenv()
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_URL = os.getenv(
+    "OPENROUTER_URL",
+    "https://openrouter.ai/api/v1/chat/completions"
+)
+
+AI_TIMEOUT = 10
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "8"))
+AI_KEEPALIVE_SECONDS = 60
 
 # -----------------------------
 # Safe fallback messages
@@ -25,16 +39,138 @@ BAD_AI_PATTERNS = [
     "please clarify",
 ]
 
+# -----------------------------
+# Response cache (identical prompt → same answer)
+# -----------------------------
+AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "1") == "1"
+AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", "512"))
+AI_CACHE_TTL = float(os.getenv("AI_CACHE_TTL", "3600"))
+AI_CACHE_SCOPE = os.getenv("AI_CACHE_SCOPE", "user")   # user | global
+
+# -----------------------------
+# Pooled connections (keep-alive)
+# -----------------------------
+_session = requests.Session()
+_async_client = None
+_async_limit = None
+
+# -----------------------------
+# Streaming metrics
+# -----------------------------
+STREAM_TTFT = latency("ai.stream.ttft_ms")
+STREAM_TOTAL = latency("ai.stream.total_ms")
+STREAM_ERRORS = counter("ai.stream.errors")
+
 
 def _is_bad_ai_response(text: str) -> bool:
     text = text.lower()
     return any(pattern in text for pattern in BAD_AI_PATTERNS)
 
 
+def _never_cache(text: str) -> bool:
+    return (
+        text in {CONFIG_ERROR_MSG, NETWORK_ERROR_MSG, EMPTY_RESPONSE_MSG}
+        or _is_bad_ai_response(text)
+    )
+
+
+AI_CACHE = AIResponseCache(
+    max_entries=AI_CACHE_SIZE,
+    ttl=AI_CACHE_TTL,
+    scope=AI_CACHE_SCOPE,
+    reject=_never_cache,
+    enabled=AI_CACHE_ENABLED,
+)
+register("ai.cache", AI_CACHE.stats)
+
+
+def _headers() -> dict:
+    return {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+
+def _build_payload(
+    user_command: str,
+    memory_summary: str = "",
+    intent_context: Optional[str] = None,
+) -> dict:
+    # -----------------------------
+    # System prompt (STRICT)
+    # -----------------------------
+    system_prompt = (
+        "You are JARVIS, a calm, confident, intelligent assistant. "
+        "You must respect the active task context if provided. "
+        "If the user gives a short or partial reply, "
+        "treat it as a continuation of the active request. "
+        "Never invent personal facts. "
+        "Never ask repeated clarification questions. "
+        "Do not mention system internals."
+    )
+
+    # -----------------------------
+    # Inject active intent context
+    # -----------------------------
+    if intent_context:
+        system_prompt += (
+            "\n\nActive task context (important, system-controlled):\n"
+            f"{intent_context}"
+        )
+
+    # -----------------------------
+    # Inject memory (read-only)
+    # -----------------------------
+    if memory_summary:
+        system_prompt += (
+            "\n\nKnown user facts (read-only, do NOT modify):\n"
+            f"{memory_summary}"
+        )
+
+    return {
+        "model": "openai/gpt-3.5-turbo",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_command.strip()},
+        ],
+        "temperature": 0.6,
+    }
+
+
+def _extract_content(status_code: int, data_fn) -> str:
+    if status_code != 200:
+        return NETWORK_ERROR_MSG
+
+    data = data_fn()
+
+    content = (
+        data.get("choices", [{}])[0]
+        .get("message", {})
+        .get("content", "")
+    )
+    return validate_ai_content(content)
+
+
+def validate_ai_content(content: str) -> str:
+    content = (content or "").strip()
+
+    # -----------------------------
+    # Validate AI output
+    # -----------------------------
+    if not content or len(content) < 4:
+        return EMPTY_RESPONSE_MSG
+
+    if _is_bad_ai_response(content):
+        return EMPTY_RESPONSE_MSG
+
+    return content
+
+
 def get_ai_response(
     user_command: str,
     memory_summary: str = "",
     intent_context: Optional[str] = None,
+    user_id: Optional[str] = None,
 ) -> str:
     """
     AI fallback responder (stateless but context-aware).
@@ -43,85 +179,179 @@ def get_ai_response(
     - Memory is READ-ONLY
     - Intent context is SHORT-LIVED (not stored permanently)
     - AI must continue the active task if context exists
-    - Bad AI responses are discarded
+    - Bad AI responses are discarded (and never cached)
     """
 
     if not OPENROUTER_API_KEY:
         return CONFIG_ERROR_MSG
 
+    key = AI_CACHE.key(user_command, memory_summary, intent_context, user_id)
+    cached = AI_CACHE.get(key)
+    if cached:
+        return cached
+
+    started = time.perf_counter()
     try:
-        # -----------------------------
-        # System prompt (STRICT)
-        # -----------------------------
-        system_prompt = (
-            "You are JARVIS, a calm, confident, intelligent assistant. "
-            "You must respect the active task context if provided. "
-            "If the user gives a short or partial reply, "
-            "treat it as a continuation of the active request. "
-            "Never invent personal facts. "
-            "Never ask repeated clarification questions. "
-            "Do not mention system internals."
+        response = _session.post(
+            OPENROUTER_URL,
+            headers=_headers(),
+            json=_build_payload(user_command, memory_summary, intent_context),
+            timeout=AI_TIMEOUT,
         )
+        content = _extract_content(response.status_code, response.json)
 
-        # -----------------------------
-        # Inject active intent context
-        # -----------------------------
-        if intent_context:
-            system_prompt += (
-                "\n\nActive task context (important, system-controlled):\n"
-                f"{intent_context}"
-            )
+    except Exception:
+        return NETWORK_ERROR_MSG
 
-        # -----------------------------
-        # Inject memory (read-only)
-        # -----------------------------
-        if memory_summary:
-            system_prompt += (
-                "\n\nKnown user facts (read-only, do NOT modify):\n"
-                f"{memory_summary}"
-            )
+    AI_CACHE.put(key, content, (time.perf_counter() - started) * 1000)
+    return content
 
-        payload = {
-            "model": "openai/gpt-3.5-turbo",
-            "messages": [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_command.strip()},
-            ],
-            "temperature": 0.6,
-        }
 
-        response = requests.post(
-            OPENROUTER_URL,
-            headers={
-                "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json=payload,
-            timeout=10,
+# -----------------------------
+# Async client (for the /command route)
+# -----------------------------
+def _get_async_client():
+    global _async_client, _async_limit
+
+    if _async_client is None or _async_client.is_closed:
+        _async_client = httpx.AsyncClient(
+            timeout=AI_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=AI_MAX_CONCURRENCY,
+                max_keepalive_connections=AI_MAX_CONCURRENCY,
+                keepalive_expiry=AI_KEEPALIVE_SECONDS,
+            ),
         )
+        _async_limit = asyncio.Semaphore(AI_MAX_CONCURRENCY)
 
-        if response.status_code != 200:
-            return NETWORK_ERROR_MSG
+    return _async_client, _async_limit
 
-        data = response.json()
 
-        content = (
-            data.get("choices", [{}])[0]
-            .get("message", {})
-            .get("content", "")
-            .strip()
-        )
+async def get_ai_response_async(
+    user_command: str,
+    memory_summary: str = "",
+    intent_context: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> str:
+    """
+    Same as get_ai_response, but awaitable: no worker thread is held
+    while the model answers, and connections are reused across calls.
+    At most AI_MAX_CONCURRENCY requests are in flight at once.
+    """
 
-        # -----------------------------
-        # Validate AI output
-        # -----------------------------
-        if not content or len(content) < 4:
-            return EMPTY_RESPONSE_MSG
+    if not OPENROUTER_API_KEY:
+        return CONFIG_ERROR_MSG
 
-        if _is_bad_ai_response(content):
-            return EMPTY_RESPONSE_MSG
+    key = AI_CACHE.key(user_command, memory_summary, intent_context, user_id)
+    cached = AI_CACHE.get(key)
+    if cached:
+        return cached
 
-        return content
+    started = time.perf_counter()
+    try:
+        client, limit = _get_async_client()
+
+        async with limit:
+            response = await client.post(
+                OPENROUTER_URL,
+                headers=_headers(),
+                json=_build_payload(user_command, memory_summary, intent_context),
+            )
+        content = _extract_content(response.status_code, response.json)
 
     except Exception:
         return NETWORK_ERROR_MSG
+
+    AI_CACHE.put(key, content, (time.perf_counter() - started) * 1000)
+    return content
+
+
+async def stream_ai_response(
+    user_command: str,
+    memory_summary: str = "",
+    intent_context: Optional[str] = None,
+    user_id: Optional[str] = None,
+):
+    """
+    Async generator of text deltas from an OpenRouter `stream: true`
+    completion. Same prompt as get_ai_response; a failure before any text
+    yields the usual error message, one after the first delta is raised
+    (the text so far is not an answer). Run the joined text through validate_ai_content
+    before storing it. A cached answer is yielded as a single delta.
+    """
+
+    if not OPENROUTER_API_KEY:
+        yield CONFIG_ERROR_MSG
+        return
+
+    key = AI_CACHE.key(user_command, memory_summary, intent_context, user_id)
+    cached = AI_CACHE.get(key)
+    if cached:
+        yield cached
+        return
+
+    parts = []
+    payload = _build_payload(user_command, memory_summary, intent_context)
+    payload["stream"] = True
+
+    started = time.perf_counter()
+    first = True
+
+    try:
+        client, limit = _get_async_client()
+
+        async with limit:
+            async with client.stream(
+                "POST",
+                OPENROUTER_URL,
+                headers=_headers(),
+                json=payload,
+            ) as response:
+                if response.status_code != 200:
+                    STREAM_ERRORS.inc()
+                    yield NETWORK_ERROR_MSG
+                    return
+
+                async for line in response.aiter_lines():
+                    # SSE: "data: {...}", ": keep-alive comments", "data: [DONE]"
+                    if not line.startswith("data:"):
+                        continue
+
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+
+                    try:
+                        delta = (
+                            json.loads(data)
+                            .get("choices", [{}])[0]
+                            .get("delta", {})
+                            .get("content")
+                        )
+                    except (ValueError, IndexError, AttributeError):
+                        continue
+
+                    if delta:
+                        if first:
+                            STREAM_TTFT.observe((time.perf_counter() - started) * 1000)
+                            first = False
+                        parts.append(delta)
+                        yield delta
+
+        elapsed = (time.perf_counter() - started) * 1000
+        STREAM_TOTAL.observe(elapsed)
+        AI_CACHE.put(key, validate_ai_content("".join(parts)), elapsed)
+
+    except Exception:
+        STREAM_ERRORS.inc()
+        if not first:
+            raise
+        yield NETWORK_ERROR_MSG
+
+
+async def close_ai_client():
+    global _async_client
+
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
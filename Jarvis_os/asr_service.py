@@ -0,0 +1,214 @@
+# asr_service.py
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psutil
+from vosk import KaldiRecognizer, Model, SetLogLevel
+
+from utils.metrics import register
+from voice.capture import SAMPLE_RATE
+
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "vosk-model-small-en-us-0.15")
+
+# concurrent transcription sessions per worker; more wait (then 503)
+ASR_POOL_SIZE = int(os.getenv("ASR_POOL_SIZE", "4"))
+ASR_ACQUIRE_TIMEOUT = float(os.getenv("ASR_ACQUIRE_TIMEOUT", "5"))
+
+MB = 1024 * 1024
+
+SetLogLevel(-1)
+
+
+class ASRUnavailable(Exception):
+    """Model missing / still loading, or every recognizer is busy."""
+
+
+def _rss() -> int:
+    return psutil.Process().memory_info().rss
+
+
+# ==============================
+# 🧠 ONE MODEL PER PROCESS
+# ==============================
+class SharedModel:
+    """
+    The Vosk model, loaded once per process (or once in the gunicorn
+    master before fork, see gunicorn.conf.py) and
+    shared by every recognizer. start() loads it on a background thread
+    so startup isn't blocked; get() waits for that load if needed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._model = None
+        self._lock = threading.Lock()
+
+        self.loaded_by = None     # pid that loaded it (the master when preloaded)
+        self.load_ms = None
+        self.model_bytes = None   # RSS growth while loading
+        self.last_error = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def get(self, timeout: float = None):
+        model = self._model
+        if model is not None:
+            return model
+
+        if not self._lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise ASRUnavailable("Speech model is still loading")
+        try:
+            if self._model is None:
+                self._load()
+            return self._model
+        finally:
+            self._lock.release()
+
+    def _load(self):
+        if not os.path.isdir(self.path):
+            self.last_error = f"model directory not found: {self.path}"
+            raise ASRUnavailable(self.last_error)
+
+        started = time.perf_counter()
+        rss_before = _rss()
+        try:
+            model = Model(self.path)
+        except Exception as e:
+            self.last_error = str(e)
+            raise ASRUnavailable(f"Speech model failed to load: {e}") from e
+
+        self.load_ms = (time.perf_counter() - started) * 1000
+        self.model_bytes = _rss() - rss_before
+        self.loaded_by = os.getpid()
+        self.last_error = None
+        self._model = model
+        print(f"🎙️ Vosk model loaded in {self.load_ms:.0f} ms ({self.model_bytes / MB:.0f} MB)")
+
+    def start(self):
+        """Background load (no-op when already loaded, e.g. preloaded)."""
+        if self.loaded:
+            return
+
+        def load():
+            try:
+                self.get()
+            except ASRUnavailable as e:
+                print("⚠️ Speech recognition disabled:", e)
+
+        threading.Thread(target=load, name="asr-model-load", daemon=True).start()
+
+
+# ==============================
+# 🎛️ BOUNDED RECOGNIZER POOL
+# ==============================
+class RecognizerPool:
+    """
+    At most `size` KaldiRecognizers per process, all on the shared model.
+    Idle recognizers are Reset() and reused, so a session costs only the
+    decoder state, never another model.
+
+        with ASR_POOL.session() as recognizer:
+            recognizer.AcceptWaveform(pcm)
+    """
+
+    def __init__(self, model: SharedModel, size: int = ASR_POOL_SIZE):
+        self.model = model
+        self.size = size
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = []
+        self._lock = threading.Lock()
+
+        self.in_use = 0
+        self.created = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.session_bytes = 0   # RSS growth per new recognizer (running average)
+
+    def _take(self, timeout):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+
+        model = self.model.get(timeout)
+        rss_before = _rss()
+        recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+        grown = max(0, _rss() - rss_before)
+
+        with self._lock:
+            self.created += 1
+            self.session_bytes += (grown - self.session_bytes) / self.created
+        return recognizer
+
+    def acquire(self, timeout: float = ASR_ACQUIRE_TIMEOUT):
+        """A recognizer for one session; give it back with release()."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.waits += 1
+            if not self._slots.acquire(timeout=timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise ASRUnavailable("All speech recognizers are busy")
+
+        try:
+            recognizer = self._take(timeout)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_use += 1
+        return recognizer
+
+    def release(self, recognizer):
+        recognizer.Reset()
+        with self._lock:
+            self.in_use -= 1
+            self._idle.append(recognizer)
+        self._slots.release()
+
+    @contextmanager
+    def session(self, timeout: float = ASR_ACQUIRE_TIMEOUT):
+        recognizer = self.acquire(timeout)
+        try:
+            yield recognizer
+        finally:
+            self.release(recognizer)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": self.size,
+                "in_use": self.in_use,
+                "idle": len(self._idle),
+                "created": self.created,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "session_mb": round(self.session_bytes / MB, 2),
+            }
+
+
+ASR_MODEL = SharedModel(VOSK_MODEL_PATH)
+ASR_POOL = RecognizerPool(ASR_MODEL)
+
+
+def asr_stats() -> dict:
+    memory = psutil.Process().memory_info()
+    return {
+        "pid": os.getpid(),
+        "model_loaded": ASR_MODEL.loaded,
+        "preloaded": ASR_MODEL.loaded and ASR_MODEL.loaded_by != os.getpid(),
+        "load_ms": round(ASR_MODEL.load_ms, 1) if ASR_MODEL.load_ms else None,
+        "model_mb": round(ASR_MODEL.model_bytes / MB, 1) if ASR_MODEL.model_bytes else None,
+        "last_error": ASR_MODEL.last_error,
+        "worker_rss_mb": round(memory.rss / MB, 1),
+        # on Linux: pages shared with the master / other workers
+        "worker_shared_mb": round(getattr(memory, "shared", 0) / MB, 1),
+        "pool": ASR_POOL.stats(),
+    }
+
+
+register("asr", asr_stats)
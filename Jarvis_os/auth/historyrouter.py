@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import jwt
 import os
@@ -7,7 +7,9 @@ from dotenv import load_dotenv
 from chatHistory.chathistory import (
     load,
     start_new_conversation,
-    delete_conversation
+    delete_conversation,
+    list_summaries,
+    get_messages
 )
 
 load_dotenv()
@@ -41,6 +43,75 @@ def get_chat_history(
         return []
 
 
+def _get_user_name(credentials):
+    payload = jwt.decode(
+        credentials.credentials,
+        JWT_SECRET,
+        algorithms=[JWT_ALGORITHM]
+    )
+    return payload.get("name")
+
+
+# ==============================
+# 📋 CONVERSATION LIST (SUMMARIES ONLY)
+# ==============================
+@router.get("/history/summaries")
+def get_chat_summaries(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: int = Query(0, ge=0),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    if not credentials:
+        return {"items": [], "next_cursor": None}
+
+    try:
+        user_name = _get_user_name(credentials)
+        if not user_name:
+            return {"items": [], "next_cursor": None}
+
+        items, next_cursor = list_summaries(user_name, limit, cursor)
+        return {"items": items, "next_cursor": next_cursor}
+
+    except Exception as e:
+        print("JWT ERROR:", e)
+        return {"items": [], "next_cursor": None}
+
+
+# ==============================
+# 💬 CONVERSATION MESSAGES (CURSOR PAGING)
+# ==============================
+@router.get("/history/{chat_id}/messages")
+def get_chat_messages(
+    chat_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    before: int | None = Query(None, ge=0),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    if not credentials:
+        return {"error": "unauthorized"}
+
+    try:
+        user_name = _get_user_name(credentials)
+        if not user_name:
+            return {"error": "invalid user"}
+
+        page = get_messages(user_name, chat_id, limit, before)
+        if page is None:
+            return {"error": "chat not found"}
+
+        messages, next_cursor, total = page
+        return {
+            "chat_id": chat_id,
+            "messages": messages,
+            "next_cursor": next_cursor,
+            "total": total
+        }
+
+    except Exception as e:
+        print("HISTORY PAGE ERROR:", e)
+        return {"error": "failed"}
+
+
 @router.post("/new-chat")
 def new_chat(
     credentials: HTTPAuthorizationCredentials = Depends(security)
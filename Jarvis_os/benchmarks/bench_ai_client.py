@@ -0,0 +1,137 @@
+# benchmarks/bench_ai_client.py
+"""
+Connection reuse savings of the pooled OpenRouter clients.
+
+Starts a local fake OpenRouter server that charges HANDSHAKE_MS once per
+new TCP connection (standing in for DNS + TCP + TLS setup) and THINK_MS
+per completion, then times:
+
+  legacy        requests.post per call (old get_ai_response)
+  pooled sync   get_ai_response over a keep-alive requests.Session
+  async seq     get_ai_response_async, one call after another
+  async x8      get_ai_response_async, CALLS calls gathered concurrently
+
+Run from Jarvis_os/:
+    python -m benchmarks.bench_ai_client
+"""
+import asyncio
+import json
+import os
+import threading
+import time
+
+HOST, PORT = "127.0.0.1", 8765
+HANDSHAKE_MS = 60
+THINK_MS = 20
+CALLS = 24
+
+os.environ["OPENROUTER_URL"] = f"http://{HOST}:{PORT}/api/v1/chat/completions"
+os.environ["OPENROUTER_API_KEY"] = "bench"
+os.environ["AI_CACHE_ENABLED"] = "0"   # measure the network path only
+
+import requests  # noqa: E402
+
+import ai_fallback  # noqa: E402
+
+REPLY = json.dumps({
+    "choices": [{"message": {"content": "Recursion is a function calling itself."}}]
+}).encode()
+
+connections = 0
+
+
+async def handle(reader, writer):
+    global connections
+    connections += 1
+    await asyncio.sleep(HANDSHAKE_MS / 1000)
+
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+
+            await asyncio.sleep(THINK_MS / 1000)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Connection: keep-alive\r\n"
+                b"Content-Length: " + str(len(REPLY)).encode() + b"\r\n\r\n" + REPLY
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def run_server(ready):
+    async def main():
+        server = await asyncio.start_server(handle, HOST, PORT)
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def legacy_call():
+    payload = ai_fallback._build_payload("what is recursion")
+    res = requests.post(
+        ai_fallback.OPENROUTER_URL,
+        headers=ai_fallback._headers(),
+        json=payload,
+        timeout=10,
+    )
+    return ai_fallback._extract_content(res.status_code, res.json)
+
+
+def report(name, fn):
+    global connections
+    connections = 0
+    start = time.perf_counter()
+    fn()
+    total = (time.perf_counter() - start) * 1000
+    print(f"{name:<12} {total:>9.1f} {total / CALLS:>11.1f} {connections:>12}")
+
+
+async def async_sequential():
+    for _ in range(CALLS):
+        await ai_fallback.get_ai_response_async("what is recursion")
+
+
+async def async_concurrent():
+    await asyncio.gather(*[
+        ai_fallback.get_ai_response_async("what is recursion")
+        for _ in range(CALLS)
+    ])
+
+
+def main():
+    ready = threading.Event()
+    threading.Thread(target=run_server, args=(ready,), daemon=True).start()
+    ready.wait()
+
+    print(f"{CALLS} calls, {HANDSHAKE_MS} ms connection setup, {THINK_MS} ms per completion\n")
+    print(f"{'client':<12} {'total ms':>9} {'ms / call':>11} {'connections':>12}")
+
+    report("legacy", lambda: [legacy_call() for _ in range(CALLS)])
+    report("pooled sync", lambda: [ai_fallback.get_ai_response("what is recursion") for _ in range(CALLS)])
+
+    loop = asyncio.new_event_loop()
+    try:
+        report("async seq", lambda: loop.run_until_complete(async_sequential()))
+        report(
+            f"async x{ai_fallback.AI_MAX_CONCURRENCY}",
+            lambda: loop.run_until_complete(async_concurrent())
+        )
+        loop.run_until_complete(ai_fallback.close_ai_client())
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
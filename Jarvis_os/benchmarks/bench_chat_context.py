@@ -0,0 +1,101 @@
+# benchmarks/bench_chat_context.py
+"""
+build_chat_context latency against users with thousands of messages.
+
+"legacy" is the old implementation (parse the whole <user>.json, scan for
+the chat, slice the tail). "cold" is the first call for a chat (ring
+buffer warmed from the log store), "warm" every call after that.
+
+Run from Jarvis_os/:
+    python -m benchmarks.bench_chat_context
+"""
+import json
+import os
+import tempfile
+import time
+from uuid import uuid4
+
+from chatHistory.logstore import ChatLogStore
+from chatHistory.migrate import migrate_user
+from chatHistory.recent import RecentMessages
+
+SIZES = (1_000, 10_000, 50_000)   # messages per user
+MESSAGES_PER_CHAT = 50
+LIMIT = 6
+REPEATS = 200
+
+
+def make_history(total: int) -> list:
+    chats = []
+    for c in range(total // MESSAGES_PER_CHAT):
+        chats.append({
+            "id": str(uuid4()),
+            "started_at": "2026-01-01T00:00:00",
+            "messages": [
+                {
+                    "role": "user" if i % 2 == 0 else "jarvis",
+                    "text": f"chat {c} message {i} " + "lorem ipsum " * 8,
+                    "time": "2026-01-01T00:00:00"
+                }
+                for i in range(MESSAGES_PER_CHAT)
+            ]
+        })
+    return chats
+
+
+def legacy_context(path: str, chat_id: str, limit: int) -> str:
+    with open(path, "r") as f:
+        chats = json.load(f)
+
+    for convo in chats:
+        if convo["id"] == chat_id:
+            return "\n".join(
+                f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['text']}"
+                for m in convo["messages"][-limit:]
+            )
+    return ""
+
+
+def timed(fn, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    print(f"{'messages':>9} {'legacy ms':>10} {'cold ms':>9} {'warm us':>9}")
+
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as base:
+            chats = make_history(size)
+            chat_id = chats[len(chats) // 2]["id"]
+
+            legacy = os.path.join(base, "bench.json")
+            with open(legacy, "w") as f:
+                json.dump(chats, f, indent=2)
+
+            legacy_ms = timed(lambda: legacy_context(legacy, chat_id, LIMIT), max(3, REPEATS // (size // 1000)))
+            expected = legacy_context(legacy, chat_id, LIMIT)
+
+            store = ChatLogStore(base)
+            migrate_user(store, "bench")
+
+            recent = RecentMessages(store)
+            start = time.perf_counter()
+            messages = recent.tail("bench", chat_id, LIMIT)
+            cold_ms = (time.perf_counter() - start) * 1000
+
+            got = "\n".join(
+                f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['text']}"
+                for m in messages
+            )
+            assert got == expected
+
+            warm_us = timed(lambda: recent.tail("bench", chat_id, LIMIT), REPEATS * 10) * 1000
+
+            print(f"{size:>9} {legacy_ms:>10.2f} {cold_ms:>9.3f} {warm_us:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/bench_command_grammar.py
+"""
+Command mode: free-form decoding vs command grammar first (free-form
+only when the grammar pass returns [unk]).
+
+Fixtures are 16 kHz mono 16-bit WAVs of single commands, each with a
+sidecar JSON {"text": "open chrome"} holding what was said. The grammar
+is built from a JSON export of the commands collection
+([{"intent": ..., "patterns": [...]}, ...]) plus COMMAND_VERBS; without
+one, the fixture texts themselves are used (an upper bound — every
+command is in-grammar).
+
+Reports exact-match accuracy, word error rate, decode time per command
+and how often the grammar pass fell back.
+
+Run from Jarvis_os/:
+    python -m benchmarks.bench_command_grammar path/to/fixtures [commands.json] [model_dir]
+"""
+import json
+import os
+import sys
+import time
+
+from rapidfuzz.distance import Levenshtein
+from vosk import KaldiRecognizer, Model, SetLogLevel
+
+from benchmarks.bench_wake_word import DEFAULT_MODEL, read_frames
+from utils.metrics import counter
+from voice.capture import SAMPLE_RATE
+from voice.commands import CommandDecoder, command_phrases
+from voice.grammar import clean_phrase
+from config.wake_words import strip_wake_word
+
+
+def load_fixtures(folder):
+    fixtures = []
+    for name in sorted(os.listdir(folder)):
+        sidecar = os.path.join(folder, name[:-4] + ".json")
+        if not name.endswith(".wav") or not os.path.exists(sidecar):
+            continue
+        with open(sidecar) as f:
+            text = clean_phrase(json.load(f)["text"])
+        fixtures.append((name, read_frames(os.path.join(folder, name)), text))
+    return fixtures
+
+
+def load_patterns(path):
+    with open(path) as f:
+        return [pattern for doc in json.load(f) for pattern in doc.get("patterns", [])]
+
+
+def free_form(model):
+    recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+
+    def decode(frames):
+        recognizer.Reset()
+        words = []
+        for frame in frames:
+            if recognizer.AcceptWaveform(frame):
+                words += json.loads(recognizer.Result()).get("text", "").split()
+        words += json.loads(recognizer.FinalResult()).get("text", "").split()
+        return " ".join(words)
+
+    return decode
+
+
+def grammar_first(decoder):
+    def decode(frames):
+        decoder.start()
+        words = []
+        for frame in frames:
+            text = decoder.feed(frame)
+            if text:
+                words += text.split()
+                decoder.start()
+        words += decoder.finish().split()
+        return " ".join(words)
+
+    return decode
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    SetLogLevel(-1)
+    fixtures = load_fixtures(sys.argv[1])
+    if not fixtures:
+        print("no .wav fixtures with a .json transcript found")
+        sys.exit(1)
+
+    patterns = (
+        load_patterns(sys.argv[2]) if len(sys.argv) > 2
+        else [text for _, _, text in fixtures]
+    )
+    model = Model(sys.argv[3] if len(sys.argv) > 3 else DEFAULT_MODEL)
+
+    decoder = CommandDecoder(model, command_phrases(patterns))
+    fallbacks = counter("voice.command.fallback")
+    print(f"{len(fixtures)} fixtures, grammar of {decoder.grammar_size} phrases\n")
+
+    plain = free_form(model)
+    for label, decode in [("free-form", plain), ("grammar first", grammar_first(decoder))]:
+        fallbacks_before = fallbacks.value
+        exact = 0
+        errors = words = 0
+        timings = []
+
+        for name, frames, expected in fixtures:
+            start = time.process_time()
+            heard = strip_wake_word(decode(frames))
+            timings.append((time.process_time() - start) * 1000)
+
+            exact += heard == expected
+            errors += Levenshtein.distance(heard.split(), expected.split())
+            words += len(expected.split())
+
+        timings.sort()
+        print(f"{label}:")
+        print(f"  exact match  {exact}/{len(fixtures)}")
+        print(f"  WER          {errors / max(words, 1) * 100:.1f} %")
+        print(f"  decode       p50 {timings[len(timings) // 2]:.1f} ms, max {timings[-1]:.1f} ms cpu")
+        if decode is not plain:
+            print(f"  fallbacks    {fallbacks.value - fallbacks_before}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
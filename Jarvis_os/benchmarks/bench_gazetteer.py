@@ -0,0 +1,80 @@
+# benchmarks/bench_gazetteer.py
+"""
+Offline gazetteer: lookup latency and memory footprint.
+
+Times the first (cold, maps the files) lookup, then LOOKUPS lookups over
+a mix of exact names, aliases, typos and misses, and reports resident
+memory (RSS) and Python heap before/after — the mmapped arrays only
+count towards RSS for the pages lookups actually touch.
+
+Run from Jarvis_os/:
+    python -m benchmarks.bench_gazetteer
+"""
+import os
+import random
+import time
+import tracemalloc
+
+from gazetteer.index import DATA_DIR, Gazetteer
+
+LOOKUPS = 2000
+
+QUERIES = [
+    "paris", "tokyo", "hyderabad", "hyderbad", "banglore", "bombay",
+    "new york", "los angles", "san fransisco", "sao paulo", "london, canada",
+    "vijaywada", "warangal", "gurgaon", "springfield", "kyoto usa",
+    "munich", "calcutta", "chenai", "asdfgh", "middle of nowhere",
+]
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+def data_mb():
+    return sum(
+        os.path.getsize(os.path.join(DATA_DIR, name)) for name in os.listdir(DATA_DIR)
+    ) / 2 ** 20
+
+
+def main():
+    gazetteer = Gazetteer()
+    rng = random.Random(0)
+    queries = [rng.choice(QUERIES) for _ in range(LOOKUPS)]
+
+    rss_before = rss_mb()
+
+    start = time.perf_counter()
+    gazetteer.resolve("paris")
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        gazetteer.resolve(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    rss_growth = rss_mb() - rss_before
+
+    # Python-level allocations of a fresh instance (mmaps aren't traced)
+    tracemalloc.start()
+    fresh = Gazetteer()
+    for query in queries[:200]:
+        fresh.resolve(query)
+    heap_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+
+    print(f"places             {len(gazetteer.places):>10}")
+    print(f"search names       {len(gazetteer.names):>10}")
+    print(f"data on disk       {data_mb():>9.1f} MB")
+    print(f"first lookup       {cold_ms:>9.2f} ms   (maps the files)")
+    print(f"lookup p50         {timings[len(timings) // 2]:>9.3f} ms")
+    print(f"lookup p95         {timings[int(len(timings) * 0.95)]:>9.3f} ms")
+    print(f"RSS growth         {rss_growth:>9.1f} MB")
+    print(f"Python heap peak   {heap_mb:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
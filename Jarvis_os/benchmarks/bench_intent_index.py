@@ -0,0 +1,121 @@
+# benchmarks/bench_intent_index.py
+"""
+Per-command latency of intent matching as the pattern count grows.
+
+Compares the old nested-loop `find_intent` against `IntentIndex` on the
+seeded patterns (~100) padded with synthetic ones up to 10k, and checks
+that both return the same intent and score.
+
+Run from Jarvis_os/:
+    python -m benchmarks.bench_intent_index
+"""
+import ast
+import random
+import time
+
+from rapidfuzz import fuzz
+
+from intent_index import IntentIndex
+from utils.text_utils import normalize_text
+
+SIZES = (100, 1_000, 10_000)
+REPEATS = 20
+
+QUERIES = [
+    "open chrome",
+    "please open google crome",
+    "volume up by 20",
+    "take a screenshot",
+    "what is the cpu usage",
+    "how much battery do i have",
+    "tell me a joke about java",
+    "play lofi music on youtube",
+]
+
+VOCAB = (
+    "open launch start show check increase decrease set find tell play "
+    "chrome browser volume sound screen shot cpu ram memory disk battery "
+    "network wifi settings explorer folder music video system status usage"
+).split()
+
+
+def load_seed_commands():
+    """Read COMMANDS from seed_commands.py without connecting to Mongo."""
+    with open("seed_commands.py", "r") as f:
+        tree = ast.parse(f.read())
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and node.targets[0].id == "COMMANDS":
+            return [c for c in ast.literal_eval(node.value) if c]
+
+    return []
+
+
+def build_docs(size: int, seed_docs, rng):
+    docs = [dict(d, patterns=list(d["patterns"])) for d in seed_docs]
+    count = sum(len(d["patterns"]) for d in docs)
+
+    n = 0
+    while count < size:
+        words = rng.sample(VOCAB, rng.randint(2, 4))
+        docs.append({"intent": f"synthetic_{n}", "patterns": [" ".join(words)]})
+        count += 1
+        n += 1
+
+    return docs
+
+
+def legacy_find_intent(docs, command):
+    best_intent, best_score = None, 0
+
+    for doc in docs:
+        for pattern in doc.get("patterns", []):
+            score = (
+                fuzz.token_set_ratio(command, pattern) * 0.5 +
+                fuzz.partial_ratio(command, pattern) * 0.3 +
+                fuzz.ratio(command, pattern) * 0.2
+            )
+            if score > best_score:
+                best_score = score
+                best_intent = doc["intent"]
+
+    return best_intent, best_score
+
+
+def time_per_command(fn, queries, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - start) / (repeats * len(queries)) * 1000
+
+
+def main():
+    rng = random.Random(42)
+    seed_docs = load_seed_commands()
+    queries = [normalize_text(q) for q in QUERIES]
+
+    print(f"{'patterns':>9} {'build ms':>9} {'loop ms/cmd':>12} {'index ms/cmd':>13} {'speedup':>8}")
+
+    for size in SIZES:
+        docs = build_docs(size, seed_docs, rng)
+
+        start = time.perf_counter()
+        index = IntentIndex(docs, cache_size=0)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for q in queries:
+            assert legacy_find_intent(docs, q) == index.match(q), q
+
+        repeats = max(1, REPEATS * 100 // size)
+        loop_ms = time_per_command(lambda q: legacy_find_intent(docs, q), queries, repeats)
+        index_ms = time_per_command(index.match, queries, REPEATS)
+
+        print(
+            f"{index.pattern_count:>9} {build_ms:>9.2f} {loop_ms:>12.3f} "
+            f"{index_ms:>13.3f} {loop_ms / index_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
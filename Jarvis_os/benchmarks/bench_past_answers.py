@@ -0,0 +1,93 @@
+# benchmarks/bench_past_answers.py
+"""
+Past-answer lookup latency: linear find_past_answer scan vs PastAnswerIndex.
+
+Builds synthetic histories of N user→jarvis pairs and times QUERIES
+lookups (half near-duplicates of stored questions, half unseen), then
+checks how often both paths return an answer of the same score.
+
+Run from Jarvis_os/:
+    python -m benchmarks.bench_past_answers
+"""
+import random
+import time
+
+from memory_reader import PastAnswerIndex, find_past_answer
+
+SIZES = [100, 10_000, 100_000]
+QUERIES = 40
+PAIRS_PER_CHAT = 20
+
+MIN_SCORE = 92   # jarvis_core.PAST_ANSWER_MIN_SCORE default
+
+COMMON = "what is how do i the a in for of to explain write code".split()
+_syllables = random.Random(0)
+TOPICS = [
+    "".join(_syllables.choice("bcdfgklmnprstvz") + _syllables.choice("aeiou") for _ in range(3))
+    for _ in range(3000)
+]
+
+
+def make_question(rng):
+    words = [rng.choice(COMMON) for _ in range(rng.randint(2, 4))]
+    words += [rng.choice(TOPICS) for _ in range(rng.randint(2, 4))]
+    return " ".join(words)
+
+
+def make_chats(rng, n):
+    chats, messages = [], []
+    for i in range(n):
+        messages.append({"role": "user", "text": make_question(rng)})
+        messages.append({"role": "jarvis", "text": f"answer {i}"})
+        if len(messages) >= PAIRS_PER_CHAT * 2:
+            chats.append({"messages": messages})
+            messages = []
+    if messages:
+        chats.append({"messages": messages})
+    return chats
+
+
+def make_queries(rng, chats):
+    stored = [m["text"] for c in chats for m in c["messages"] if m["role"] == "user"]
+    queries = []
+    for i in range(QUERIES):
+        if i % 2:
+            queries.append(make_question(rng))
+        else:
+            words = rng.choice(stored).split()
+            rng.shuffle(words)
+            queries.append(" ".join(words))
+    return queries
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(q) for q in queries]
+    return (time.perf_counter() - start) * 1000 / len(queries), results
+
+
+def main():
+    print(f"{'pairs':>8} {'build ms':>9} {'scan ms':>9} {'index ms':>9} {'speedup':>8} {'agree':>8}")
+
+    for n in SIZES:
+        rng = random.Random(n)
+        chats = make_chats(rng, n)
+        queries = make_queries(rng, chats)
+
+        start = time.perf_counter()
+        index = PastAnswerIndex()
+        index.add_chats(chats)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        scan_ms, scan = timed(lambda q: find_past_answer(chats, q, MIN_SCORE), queries)
+        index_ms, indexed = timed(lambda q: index.find(q, MIN_SCORE), queries)
+
+        same = sum(a[1] == b[1] for a, b in zip(scan, indexed))
+        print(
+            f"{n:>8} {build_ms:>9.1f} {scan_ms:>9.3f} {index_ms:>9.3f} "
+            f"{scan_ms / index_ms:>7.1f}x {same:>3}/{len(queries)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
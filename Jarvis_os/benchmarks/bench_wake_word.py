@@ -0,0 +1,134 @@
+# benchmarks/bench_wake_word.py
+"""
+Always-on listening: full recognizer on every frame vs VAD + wake-word
+grammar spotter.
+
+Each fixture is a 16 kHz mono 16-bit WAV, streamed frame by frame as the
+microphone would deliver it. A fixture may have a sidecar JSON
+(same name, .json) with {"wake_end": seconds} — where the spoken
+"jarvis" ends — so detection latency can be measured; fixtures without
+one are treated as idle audio (room noise, TV, other talk) and count
+false wakes.
+
+Reports CPU time per second of audio (% of one core) and, per pipeline,
+how far after the end of the wake word it fired.
+
+Run from Jarvis_os/:
+    python -m benchmarks.bench_wake_word path/to/fixtures [model_dir]
+"""
+import json
+import os
+import sys
+import time
+import wave
+
+from vosk import KaldiRecognizer, Model, SetLogLevel
+
+from voice.capture import EnergyVAD, FRAME_MS, FRAME_SAMPLES, SAMPLE_RATE
+from voice.grammar import partial_text, result_text
+from voice.wake import WakeWordSpotter
+
+DEFAULT_MODEL = "vosk-model-small-en-us-0.15"
+
+
+def read_frames(path):
+    with wave.open(path, "rb") as wav:
+        if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (SAMPLE_RATE, 1, 2):
+            raise ValueError(f"{path}: expected {SAMPLE_RATE} Hz mono 16-bit")
+        frames = []
+        while chunk := wav.readframes(FRAME_SAMPLES):
+            frames.append(chunk)
+    return frames
+
+
+def load_fixtures(folder):
+    fixtures = []
+    for name in sorted(os.listdir(folder)):
+        if not name.endswith(".wav"):
+            continue
+        path = os.path.join(folder, name)
+        wake_end = None
+        sidecar = path[:-4] + ".json"
+        if os.path.exists(sidecar):
+            with open(sidecar) as f:
+                wake_end = json.load(f).get("wake_end")
+        fixtures.append((name, read_frames(path), wake_end))
+    return fixtures
+
+
+def run_full(model, frames):
+    """Before: every frame through the full-vocabulary recognizer."""
+    recognizer = KaldiRecognizer(model, SAMPLE_RATE)
+    fired = None
+    for index, frame in enumerate(frames):
+        if recognizer.AcceptWaveform(frame):
+            text = result_text(recognizer.Result())
+        else:
+            text = partial_text(recognizer.PartialResult())
+        if fired is None and "jarvis" in text:
+            fired = index
+    return fired
+
+
+def run_spotter(model, frames):
+    """After: energy VAD, then the wake-word grammar only on speech."""
+    vad = EnergyVAD()
+    spotter = WakeWordSpotter(model)
+    fired = None
+    for index, frame in enumerate(frames):
+        chunks, ended = vad.feed(frame)
+        for chunk in chunks:
+            if spotter.feed(chunk) and fired is None:
+                fired = index
+        if ended:
+            spotter.end_of_speech()
+    return fired
+
+
+PIPELINES = [("full recognizer", run_full), ("vad + wake grammar", run_spotter)]
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    SetLogLevel(-1)
+    model = Model(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_MODEL)
+    fixtures = load_fixtures(sys.argv[1])
+    if not fixtures:
+        print("no .wav fixtures found")
+        sys.exit(1)
+
+    audio_s = sum(len(frames) for _, frames, _ in fixtures) * FRAME_MS / 1000
+    print(f"{len(fixtures)} fixtures, {audio_s:.1f} s of audio\n")
+
+    for label, run in PIPELINES:
+        cpu = 0.0
+        latencies = []
+        missed = false_wakes = 0
+
+        for name, frames, wake_end in fixtures:
+            start = time.process_time()
+            fired = run(model, frames)
+            cpu += time.process_time() - start
+
+            if wake_end is None:
+                false_wakes += fired is not None
+            elif fired is None:
+                missed += 1
+            else:
+                # the frame that fired ends at (index + 1) * FRAME_MS
+                latencies.append((fired + 1) * FRAME_MS - wake_end * 1000)
+
+        latencies.sort()
+        print(f"{label}:")
+        print(f"  cpu          {cpu / audio_s * 100:6.1f} % of a core")
+        if latencies:
+            print(f"  wake latency p50 {latencies[len(latencies) // 2]:.0f} ms, "
+                  f"max {latencies[-1]:.0f} ms")
+        print(f"  missed {missed}, false wakes {false_wakes}\n")
+
+
+if __name__ == "__main__":
+    main()
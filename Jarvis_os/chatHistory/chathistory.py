@@ -1,100 +1,101 @@
-import json
 import os
 from datetime import datetime
-from uuid import uuid4
+
+from chatHistory.logstore import ChatLogStore
+from chatHistory.recent import RecentMessages
 
 BASE_DIR = "chatHistory/data"
 os.makedirs(BASE_DIR, exist_ok=True)
 
+# append-only per-conversation logs (see logstore.py)
+STORE = ChatLogStore(BASE_DIR)
+
+# newest messages per chat, kept warm for build_chat_context
+RECENT = RecentMessages(STORE)
+
+# callback(user_id) when stored chats change other than by appending
+# (a chat deleted, the history rewritten), e.g. to drop derived indexes
+HISTORY_LISTENERS = []
+
+
+def on_history_changed(callback):
+    HISTORY_LISTENERS.append(callback)
+
 
-def _get_file(user_id: str):
-    return os.path.join(BASE_DIR, f"{user_id}.json")
+def _history_changed(user_id: str):
+    for callback in HISTORY_LISTENERS:
+        try:
+            callback(user_id)
+        except Exception as e:
+            print("⚠️ History listener failed:", e)
 
 
 # ==============================
 # LOAD ALL CHATS
 # ==============================
 def load(user_id: str):
-    path = _get_file(user_id)
-
-    if not os.path.exists(path):
-        return []
-
-    try:
-        with open(path, "r") as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        return []
+    return STORE.load_all(user_id)
 
 
 # ==============================
 # SAVE ALL CHATS
 # ==============================
 def save(user_id: str, chats):
-    with open(_get_file(user_id), "w") as f:
-        json.dump(chats, f, indent=2)
+    STORE.replace_all(user_id, chats)
+    RECENT.drop(user_id)
+    _history_changed(user_id)
 
 
 # ==============================
 # START NEW CHAT
 # ==============================
 def start_new_conversation(user_id: str):
-    chats = load(user_id)
-
-    convo = {
-        "id": str(uuid4()),
-        "started_at": datetime.utcnow().isoformat(),
-        "messages": []
-    }
-
-    chats.append(convo)
-    save(user_id, chats)
-
-    return convo["id"]
+    return STORE.create_conversation(user_id)
 
 
 # ==============================
 # DELETE CONVERSATION
 # ==============================
 def delete_conversation(user_id: str, chat_id: str) -> bool:
-    chats = load(user_id)
-    new_chats = [c for c in chats if c["id"] != chat_id]
-
-    if len(new_chats) == len(chats):
-        return False  # chat not found
-
-    save(user_id, new_chats)
-    return True
+    RECENT.drop(user_id, chat_id)
+    deleted = STORE.delete_conversation(user_id, chat_id)  # False: chat not found
+    if deleted:
+        _history_changed(user_id)
+    return deleted
 
 
 # ==============================
 # ADD MESSAGE
 # ==============================
 def add_message(chat_id: str, user_id: str, role: str, text: str):
-    chats = load(user_id)
-
-    for convo in chats:
-        if convo["id"] == chat_id:
-            convo["messages"].append({
-                "role": role,
-                "text": text,
-                "time": datetime.utcnow().isoformat()
-            })
-            save(user_id, chats)
+    message = {
+        "role": role,
+        "text": text,
+        "time": datetime.utcnow().isoformat()
+    }
+
+    with STORE.lock(user_id):
+        if STORE.append(user_id, chat_id, message):
+            RECENT.push(user_id, chat_id, message)
             return chat_id
 
-    # fallback: create new chat
-    new_convo = {
-        "id": str(uuid4()),
-        "started_at": datetime.utcnow().isoformat(),
-        "messages": [{
-            "role": role,
-            "text": text,
-            "time": datetime.utcnow().isoformat()
-        }]
-    }
+        # fallback: create new chat
+        new_id = STORE.create_conversation(user_id, started_at=message["time"])
+        STORE.append(user_id, new_id, message)
+        RECENT.push(user_id, new_id, message)
+
+    return new_id
 
-    chats.append(new_convo)
-    save(user_id, chats)
 
-    return new_convo["id"]
+# ==============================
+# CONVERSATION SUMMARIES (SIDEBAR)
+# ==============================
+def list_summaries(user_id: str, limit: int = 20, cursor: int = 0):
+    return STORE.summaries(user_id, limit, cursor)
+
+
+# ==============================
+# MESSAGE PAGE (NEWEST FIRST PAGING)
+# ==============================
+def get_messages(user_id: str, chat_id: str, limit: int = 50, before: int = None):
+    return STORE.read_page(user_id, chat_id, limit, before)
@@ -1,15 +1,11 @@
-from chatHistory.chathistory import load
+from chatHistory.chathistory import RECENT
 
 def build_chat_context(user_id: str, chat_id: str, limit: int = 6) -> str:
-    chats = load(user_id)
+    # served from the per-chat ring buffer, not the whole history file
+    messages = RECENT.tail(user_id, chat_id, limit)
 
-    for convo in chats:
-        if convo["id"] == chat_id:
-            messages = convo["messages"][-limit:]
-            lines = []
-            for m in messages:
-                role = "User" if m["role"] == "user" else "Assistant"
-                lines.append(f"{role}: {m['text']}")
-            return "\n".join(lines)
-
-    return ""
+    lines = []
+    for m in messages:
+        role = "User" if m["role"] == "user" else "Assistant"
+        lines.append(f"{role}: {m['text']}")
+    return "\n".join(lines)
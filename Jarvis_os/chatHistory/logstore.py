@@ -0,0 +1,497 @@
+# chatHistory/logstore.py
+"""
+Append-only chat history storage.
+
+Layout (one directory per user):
+
+    chatHistory/data/<user>/index.json          small conversation index
+    chatHistory/data/<user>/<chat_id>.<n>.jsonl  message log segments
+
+Appending a message writes one line to the conversation's newest segment,
+so the cost of a turn no longer grows with the user's total history. The
+index is written immediately only when a conversation is created, deleted
+or rolls over to a new segment. Deletes are tombstones in the index; the segment
+files are removed later by background compaction.
+
+Each index entry also carries the conversation summary (title, per-segment
+message counts, last activity). Appends update it in memory only; the
+background maintainer flushes it every INDEX_FLUSH_INTERVAL seconds (and
+flush() runs on shutdown), never on the request thread. On load, anything
+written after the last flush is recovered by reading only the unflushed
+tail of the newest segment.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from uuid import uuid4
+
+SEGMENT_MAX_BYTES = 256 * 1024
+INDEX_FLUSH_INTERVAL = 2   # seconds (background index flush + compaction)
+TITLE_CHARS = 60
+
+INDEX_FILE = "index.json"
+
+# index entry fields that are storage details, not conversation data
+INTERNAL_KEYS = {"segments", "counts", "tail_bytes", "deleted", "deleted_at"}
+
+# summary fields kept in the index but not part of the legacy shape
+SUMMARY_KEYS = {"title", "last_activity"}
+
+
+def _now():
+    return datetime.utcnow().isoformat()
+
+
+def _write_json_atomic(path: str, data):
+    tmp = f"{path}.{uuid4().hex}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _track(entry: dict, message: dict, size: int):
+    """Fold one appended message into the entry's summary."""
+    entry["counts"][-1] += 1
+    entry["tail_bytes"] = size
+    entry["last_activity"] = message.get("time") or entry.get("last_activity")
+
+    if not entry.get("title") and message.get("role") == "user":
+        entry["title"] = (message.get("text") or "")[:TITLE_CHARS]
+
+
+def _new_entry(chat_id: str, started_at: str, extra: dict = None) -> dict:
+    entry = dict(extra or {})
+    entry.update({
+        "id": chat_id,
+        "started_at": started_at,
+        "title": entry.get("title"),
+        "last_activity": started_at,
+        "segments": [f"{chat_id}.0.jsonl"],
+        "counts": [0],
+        "tail_bytes": 0,
+    })
+    return entry
+
+
+def summary_of(entry: dict) -> dict:
+    return {
+        "id": entry["id"],
+        "started_at": entry.get("started_at"),
+        "title": entry.get("title"),
+        "message_count": sum(entry.get("counts", [])),
+        "last_activity": entry.get("last_activity"),
+    }
+
+
+class ChatLogStore:
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+        self._indexes = {}       # user -> (mtime_ns, index)
+        self._pending = set()    # users with tombstones to compact
+        self._dirty = set()      # users whose cached index is ahead of disk
+        self._maintainer = None
+
+        atexit.register(self.flush)
+
+    # ==============================
+    # PATHS / LOCKS
+    # ==============================
+    def user_dir(self, user_id: str) -> str:
+        return os.path.join(self.base_dir, user_id)
+
+    def legacy_file(self, user_id: str) -> str:
+        return os.path.join(self.base_dir, f"{user_id}.json")
+
+    def _index_path(self, user_id: str) -> str:
+        return os.path.join(self.user_dir(user_id), INDEX_FILE)
+
+    def _segment_path(self, user_id: str, name: str) -> str:
+        return os.path.join(self.user_dir(user_id), name)
+
+    def lock(self, user_id: str) -> threading.RLock:
+        with self._locks_guard:
+            return self._locks.setdefault(user_id, threading.RLock())
+
+    # ==============================
+    # INDEX
+    # ==============================
+    def _index(self, user_id: str, migrate: bool = True) -> dict:
+        """Cached index, re-read only when the file changed on disk."""
+        path = self._index_path(user_id)
+
+        if not os.path.exists(path):
+            if migrate and os.path.exists(self.legacy_file(user_id)):
+                from chatHistory.migrate import migrate_user
+                migrate_user(self, user_id)
+            if not os.path.exists(path):
+                return {"conversations": []}
+
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._indexes.get(user_id)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(path, "r") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            index = {"conversations": []}
+
+        self._indexes[user_id] = (mtime, index)
+        if self._reconcile(user_id, index):
+            self._mark_dirty(user_id)
+        return index
+
+    def _save_index(self, user_id: str, index: dict):
+        os.makedirs(self.user_dir(user_id), exist_ok=True)
+        path = self._index_path(user_id)
+        _write_json_atomic(path, index)
+        self._indexes[user_id] = (os.stat(path).st_mtime_ns, index)
+        self._dirty.discard(user_id)
+
+    def _mark_dirty(self, user_id: str):
+        """The cached index is ahead of disk; the maintainer writes it."""
+        self._dirty.add(user_id)
+        self._ensure_maintainer()
+
+    def _reconcile(self, user_id: str, index: dict) -> bool:
+        """
+        Bring summaries up to date with appends made after the last
+        index flush. Only the unflushed tail of each log is read.
+        """
+        changed = False
+
+        for entry in index["conversations"]:
+            if entry.get("deleted"):
+                continue
+
+            if "counts" not in entry:
+                # written before summaries existed: count everything once
+                segments = entry["segments"]
+                entry.update(segments=[], counts=[])
+                for name in segments:
+                    entry["segments"].append(name)
+                    entry["counts"].append(0)
+                    entry["tail_bytes"] = 0
+                    self._scan_tail(user_id, entry)
+                changed = True
+                continue
+
+            path = self._segment_path(user_id, entry["segments"][-1])
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+
+            if size != entry.get("tail_bytes", 0):
+                if size < entry.get("tail_bytes", 0):
+                    entry["counts"][-1] = 0
+                    entry["tail_bytes"] = 0
+                self._scan_tail(user_id, entry)
+                changed = True
+
+        return changed
+
+    def _scan_tail(self, user_id: str, entry: dict):
+        path = self._segment_path(user_id, entry["segments"][-1])
+        if not os.path.exists(path):
+            return
+
+        with open(path, "rb") as f:
+            f.seek(entry.get("tail_bytes", 0))
+            for line in f:
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                _track(entry, message, entry["tail_bytes"])
+            entry["tail_bytes"] = f.tell()
+
+    def _find(self, index: dict, chat_id: str):
+        for entry in index["conversations"]:
+            if entry["id"] == chat_id and not entry.get("deleted"):
+                return entry
+        return None
+
+    def conversations(self, user_id: str) -> list:
+        """Live index entries (no messages), oldest first."""
+        with self.lock(user_id):
+            return [
+                e for e in self._index(user_id)["conversations"]
+                if not e.get("deleted")
+            ]
+
+    # ==============================
+    # WRITES
+    # ==============================
+    def create_conversation(self, user_id: str, chat_id: str = None,
+                            started_at: str = None, extra: dict = None) -> str:
+        with self.lock(user_id):
+            index = self._index(user_id)
+            chat_id = chat_id or str(uuid4())
+
+            entry = _new_entry(chat_id, started_at or _now(), extra)
+
+            index["conversations"].append(entry)
+            self._save_index(user_id, index)
+            return chat_id
+
+    def append(self, user_id: str, chat_id: str, message: dict) -> bool:
+        """
+        Append one message to a conversation log.
+        Returns False when the conversation does not exist.
+        """
+        line = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+        with self.lock(user_id):
+            index = self._index(user_id)
+            entry = self._find(index, chat_id)
+            if not entry:
+                return False
+
+            path = self._segment_path(user_id, entry["segments"][-1])
+            with open(path, "ab+") as f:
+                # never glue a new message onto a torn last line
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        line = b"\n" + line
+                f.write(line)
+                size = f.tell()
+
+            _track(entry, message, size)
+
+            if size >= SEGMENT_MAX_BYTES:
+                entry["segments"].append(f"{chat_id}.{len(entry['segments'])}.jsonl")
+                entry["counts"].append(0)
+                entry["tail_bytes"] = 0
+                self._save_index(user_id, index)
+            else:
+                self._mark_dirty(user_id)
+
+            return True
+
+    def delete_conversation(self, user_id: str, chat_id: str) -> bool:
+        with self.lock(user_id):
+            index = self._index(user_id)
+            entry = self._find(index, chat_id)
+            if not entry:
+                return False
+
+            entry["deleted"] = True
+            entry["deleted_at"] = _now()
+            self._save_index(user_id, index)
+
+        self._schedule_compaction(user_id)
+        return True
+
+    # ==============================
+    # READS
+    # ==============================
+    def _iter_segment(self, user_id: str, name: str):
+        path = self._segment_path(user_id, name)
+        if not os.path.exists(path):
+            return
+
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn line after a crash
+
+    def _read_segment(self, user_id: str, name: str) -> list:
+        return list(self._iter_segment(user_id, name))
+
+    def read_messages(self, user_id: str, chat_id: str) -> list:
+        with self.lock(user_id):
+            entry = self._find(self._index(user_id), chat_id)
+            if not entry:
+                return []
+
+            messages = []
+            for name in entry["segments"]:
+                messages.extend(self._read_segment(user_id, name))
+            return messages
+
+    def summaries(self, user_id: str, limit: int = 20, cursor: int = 0):
+        """
+        Conversation summaries, most recently active first.
+        Returns (items, next_cursor); next_cursor is None on the last page.
+        """
+        entries = sorted(
+            self.conversations(user_id),
+            key=lambda e: e.get("last_activity") or e.get("started_at") or "",
+            reverse=True
+        )
+        page = entries[cursor:cursor + limit]
+        next_cursor = cursor + limit if cursor + limit < len(entries) else None
+        return [summary_of(e) for e in page], next_cursor
+
+    def read_page(self, user_id: str, chat_id: str, limit: int = 50, before: int = None):
+        """
+        Up to `limit` messages with sequence numbers below `before`
+        (newest page when None), oldest first. Only segments that overlap
+        the page are read and only the page is kept in memory.
+
+        Returns (messages, next_cursor, total) or None if the chat is
+        unknown; next_cursor is the `before` value for the older page.
+        """
+        with self.lock(user_id):
+            entry = self._find(self._index(user_id), chat_id)
+            if not entry:
+                return None
+
+            total = sum(entry["counts"])
+            end = total if before is None else max(0, min(before, total))
+            start = max(0, end - limit)
+
+            messages = []
+            first = 0
+            for name, count in zip(entry["segments"], entry["counts"]):
+                last = first + count
+                if last > start and first < end:
+                    seq = first
+                    for message in self._iter_segment(user_id, name):
+                        if start <= seq < end:
+                            messages.append(dict(message, seq=seq))
+                        seq += 1
+                        if seq >= end:
+                            break
+                first = last
+                if first >= end:
+                    break
+
+            return messages, (start if start > 0 else None), total
+
+    def load_all(self, user_id: str) -> list:
+        """Full history in the legacy list-of-conversations shape."""
+        chats = []
+        for entry in self.conversations(user_id):
+            convo = {
+                k: v for k, v in entry.items()
+                if k not in INTERNAL_KEYS and k not in SUMMARY_KEYS
+            }
+            convo["messages"] = self.read_messages(user_id, entry["id"])
+            chats.append(convo)
+        return chats
+
+    def replace_all(self, user_id: str, chats: list):
+        """Rewrite a user's whole history (legacy `save`, migration)."""
+        with self.lock(user_id):
+            old = self._index(user_id, migrate=False)
+            os.makedirs(self.user_dir(user_id), exist_ok=True)
+
+            index = {"conversations": []}
+            for convo in chats:
+                chat_id = convo.get("id") or str(uuid4())
+                entry = _new_entry(
+                    chat_id,
+                    convo.get("started_at") or _now(),
+                    {k: v for k, v in convo.items() if k != "messages"}
+                )
+                name = entry["segments"][0]
+
+                with open(self._segment_path(user_id, f"{name}.tmp"), "wb") as f:
+                    for m in convo.get("messages", []):
+                        f.write((json.dumps(m, ensure_ascii=False) + "\n").encode("utf-8"))
+                        _track(entry, m, f.tell())
+                os.replace(
+                    self._segment_path(user_id, f"{name}.tmp"),
+                    self._segment_path(user_id, name)
+                )
+
+                index["conversations"].append(entry)
+
+            self._save_index(user_id, index)
+
+            # drop segments the new index no longer references
+            live = {n for e in index["conversations"] for n in e["segments"]}
+            for entry in old["conversations"]:
+                for name in entry.get("segments", []):
+                    if name not in live:
+                        self._remove(user_id, name)
+
+    # ==============================
+    # COMPACTION
+    # ==============================
+    def _remove(self, user_id: str, name: str):
+        try:
+            os.remove(self._segment_path(user_id, name))
+        except FileNotFoundError:
+            pass
+
+    def compact(self, user_id: str) -> int:
+        """Drop tombstoned conversations and their segments."""
+        with self.lock(user_id):
+            index = self._index(user_id)
+            dead = [e for e in index["conversations"] if e.get("deleted")]
+            if not dead:
+                return 0
+
+            index["conversations"] = [
+                e for e in index["conversations"] if not e.get("deleted")
+            ]
+            self._save_index(user_id, index)
+
+            for entry in dead:
+                for name in entry["segments"]:
+                    self._remove(user_id, name)
+
+            return len(dead)
+
+    def _schedule_compaction(self, user_id: str):
+        self._pending.add(user_id)
+        self._ensure_maintainer()
+
+    def flush(self):
+        """Write every index that is ahead of disk."""
+        for user_id in list(self._dirty):
+            with self.lock(user_id):
+                if user_id not in self._dirty:
+                    continue
+
+                mtime, index = self._indexes[user_id]
+                try:
+                    on_disk = os.stat(self._index_path(user_id)).st_mtime_ns
+                except FileNotFoundError:
+                    on_disk = None
+
+                if on_disk != mtime:
+                    # rewritten (or removed) by another process since it was
+                    # read: don't clobber it; the next read reloads it and
+                    # recovers the appends from the log tails
+                    self._dirty.discard(user_id)
+                    self._indexes.pop(user_id, None)
+                    continue
+
+                self._save_index(user_id, index)
+
+    def _ensure_maintainer(self):
+        if self._maintainer is None or not self._maintainer.is_alive():
+            self._maintainer = threading.Thread(
+                target=self._maintenance_loop, name="chat-maintenance", daemon=True
+            )
+            self._maintainer.start()
+
+    def _maintenance_loop(self):
+        while True:
+            time.sleep(INDEX_FLUSH_INTERVAL)
+
+            try:
+                self.flush()
+            except Exception as e:
+                print("⚠️ Chat index flush failed:", e)
+
+            while self._pending:
+                user_id = self._pending.pop()
+                try:
+                    self.compact(user_id)
+                except Exception as e:
+                    print("⚠️ Chat compaction failed:", e)
@@ -0,0 +1,56 @@
+# chatHistory/migrate.py
+"""
+One-shot migration from the old single-file history
+(chatHistory/data/<user>.json) to the append-only log store.
+
+Run from Jarvis_os/:
+    python -m chatHistory.migrate            # every user
+    python -m chatHistory.migrate chetan     # selected users
+
+Migrated files are renamed to <user>.json.migrated, so running it again
+is a no-op. The store also migrates a user lazily on first access.
+"""
+import json
+import os
+import sys
+
+
+def read_legacy(path: str) -> list:
+    try:
+        with open(path, "r") as f:
+            chats = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []   # empty / truncated legacy files hold nothing usable
+
+    return chats if isinstance(chats, list) else []
+
+
+def migrate_user(store, user_id: str) -> int:
+    legacy = store.legacy_file(user_id)
+    if not os.path.exists(legacy):
+        return 0
+
+    with store.lock(user_id):
+        chats = read_legacy(legacy)
+        store.replace_all(user_id, chats)
+        os.replace(legacy, f"{legacy}.migrated")
+
+    return len(chats)
+
+
+def migrate_all(store, users=None) -> dict:
+    if not users:
+        users = [
+            name[:-len(".json")]
+            for name in sorted(os.listdir(store.base_dir))
+            if name.endswith(".json")
+        ]
+
+    return {user: migrate_user(store, user) for user in users}
+
+
+if __name__ == "__main__":
+    from chatHistory.chathistory import STORE
+
+    for user, count in migrate_all(STORE, sys.argv[1:]).items():
+        print(f"✅ {user}: {count} conversations migrated")
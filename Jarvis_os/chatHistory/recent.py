@@ -0,0 +1,71 @@
+# chatHistory/recent.py
+"""
+In-process ring buffers of the newest messages per conversation.
+
+A buffer is warmed from the log store the first time a chat is asked for
+and then kept current by add_message, so reading the last N messages
+does not touch disk or depend on how long the history is.
+"""
+import threading
+from collections import OrderedDict, deque
+
+RECENT_MESSAGES = 20    # per conversation
+MAX_CONVERSATIONS = 512
+
+
+class RecentMessages:
+    def __init__(self, store, size: int = RECENT_MESSAGES, max_chats: int = MAX_CONVERSATIONS):
+        self.store = store
+        self.size = size
+        self.max_chats = max_chats
+        self._buffers = OrderedDict()   # (user, chat) -> deque
+        self._lock = threading.Lock()
+
+    def _read(self, user_id: str, chat_id: str, limit: int) -> list:
+        """Newest `limit` messages from the store, without the paging `seq`."""
+        page = self.store.read_page(user_id, chat_id, limit)
+        messages = page[0] if page else []
+        return [{k: v for k, v in m.items() if k != "seq"} for m in messages]
+
+    def _warm(self, user_id: str, chat_id: str):
+        return deque(self._read(user_id, chat_id, self.size), maxlen=self.size)
+
+    def tail(self, user_id: str, chat_id: str, limit: int) -> list:
+        # more than a buffer holds: always from the store
+        if limit > self.size:
+            return self._read(user_id, chat_id, limit)
+
+        key = (user_id, chat_id)
+
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is not None:
+                self._buffers.move_to_end(key)
+                return list(buffer)[-limit:]
+
+        # add_message pushes under the same user lock, so no message can
+        # land between the warm read and the buffer becoming visible
+        with self.store.lock(user_id):
+            buffer = self._warm(user_id, chat_id)
+
+            with self._lock:
+                buffer = self._buffers.setdefault(key, buffer)
+                self._buffers.move_to_end(key)
+                while len(self._buffers) > self.max_chats:
+                    self._buffers.popitem(last=False)
+                return list(buffer)[-limit:]
+
+    def push(self, user_id: str, chat_id: str, message: dict):
+        """Record a new message; chats that are not cached stay cold."""
+        with self._lock:
+            buffer = self._buffers.get((user_id, chat_id))
+            if buffer is not None:
+                buffer.append(message)
+
+    def drop(self, user_id: str, chat_id: str = None):
+        with self._lock:
+            if chat_id is not None:
+                self._buffers.pop((user_id, chat_id), None)
+                return
+            for key in [k for k in self._buffers if k[0] == user_id]:
+                del self._buffers[key]
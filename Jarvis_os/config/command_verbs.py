@@ -0,0 +1,26 @@
+# config/command_verbs.py
+
+# words a command starts with (also entries of the voice command grammar)
+COMMAND_VERBS = {
+    "open",
+    "play",
+    "start",
+    "stop",
+    "search",
+    "find",
+    "go",
+    "navigate",
+    "set",
+    "increase",
+    "decrease",
+    "mute",
+    "unmute",
+    "shutdown",
+    "restart",
+    "show",
+    "tell",
+    "what",
+    "who",
+    "where",
+    "when"
+}
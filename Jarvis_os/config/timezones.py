@@ -0,0 +1,59 @@
+# config/timezones.py
+# Offline "time in X" data; cities (and their zones) come from the
+# bundled gazetteer, this only adds what it doesn't know.
+
+# nicknames → a name the gazetteer resolves
+CITY_ALIASES = {
+    "nyc": "New York City",
+    "la": "Los Angeles",
+    "sf": "San Francisco",
+    "washington dc": "Washington",
+    "dc": "Washington",
+    "vegas": "Las Vegas",
+}
+
+# countries that use a single zone: "time in japan" (and regions people
+# ask about that aren't cities)
+COUNTRY_TIMEZONES = {
+    "goa": "Asia/Kolkata",
+    "bali": "Asia/Makassar",
+    "india": "Asia/Kolkata",
+    "japan": "Asia/Tokyo",
+    "china": "Asia/Shanghai",
+    "south korea": "Asia/Seoul",
+    "korea": "Asia/Seoul",
+    "singapore": "Asia/Singapore",
+    "malaysia": "Asia/Kuala_Lumpur",
+    "thailand": "Asia/Bangkok",
+    "philippines": "Asia/Manila",
+    "vietnam": "Asia/Ho_Chi_Minh",
+    "bangladesh": "Asia/Dhaka",
+    "nepal": "Asia/Kathmandu",
+    "sri lanka": "Asia/Colombo",
+    "pakistan": "Asia/Karachi",
+    "uae": "Asia/Dubai",
+    "dubai": "Asia/Dubai",
+    "qatar": "Asia/Qatar",
+    "saudi arabia": "Asia/Riyadh",
+    "israel": "Asia/Jerusalem",
+    "turkey": "Europe/Istanbul",
+    "uk": "Europe/London",
+    "england": "Europe/London",
+    "united kingdom": "Europe/London",
+    "ireland": "Europe/Dublin",
+    "france": "Europe/Paris",
+    "germany": "Europe/Berlin",
+    "netherlands": "Europe/Amsterdam",
+    "italy": "Europe/Rome",
+    "spain": "Europe/Madrid",
+    "switzerland": "Europe/Zurich",
+    "sweden": "Europe/Stockholm",
+    "norway": "Europe/Oslo",
+    "poland": "Europe/Warsaw",
+    "greece": "Europe/Athens",
+    "egypt": "Africa/Cairo",
+    "nigeria": "Africa/Lagos",
+    "kenya": "Africa/Nairobi",
+    "south africa": "Africa/Johannesburg",
+    "new zealand": "Pacific/Auckland",
+}
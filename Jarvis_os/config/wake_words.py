@@ -0,0 +1,16 @@
+# config/wake_words.py
+# no speech-engine imports: wake_router.py and the server use these
+# without loading vosk
+
+WAKE_WORDS = ("hey jarvis", "hello jarvis", "jarvis")
+
+
+def strip_wake_word(text: str, words=WAKE_WORDS) -> str:
+    """"hey jarvis open chrome" → "open chrome"."""
+    text = text.strip()
+    for word in sorted(words, key=len, reverse=True):
+        if text == word:
+            return ""
+        if text.startswith(word + " "):
+            return text[len(word):].strip()
+    return text
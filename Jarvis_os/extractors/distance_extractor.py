@@ -0,0 +1,34 @@
+import re
+
+# "how far are you / is it" — not places
+NOT_PLACES = {"you", "we", "i", "it", "that", "this", "he", "she", "they", "away"}
+
+def extract_distance_places(text: str):
+    """
+    "distance from delhi to agra"          → ("delhi", ["agra"])
+    "how far is agra, jaipur and pune"     → (None, ["agra", "jaipur", "pune"])
+    "how far is agra from delhi"           → ("delhi", ["agra"])
+
+    The source is None for "my location". Returns None if the text
+    isn't a distance question.
+    """
+    patterns = [
+        r"distance (?:from|between) (?P<src>.+?) (?:to|and) (?P<dst>.+)",
+        r"distance to (?P<dst>.+?)(?: from (?P<src>.+))?$",
+        r"how far (?:is it )?(?:from (?P<src>.+?) )?to (?P<dst>.+)",
+        r"how far (?:is|are|away is) (?P<dst>.+?)(?: from (?P<src>.+))?$",
+    ]
+
+    text = text.lower().strip().rstrip("?.!")
+
+    for p in patterns:
+        m = re.search(p, text)
+        if m:
+            src = m.group("src")
+            dst = re.split(r"\s*,\s*(?:and\s+)?|\s+and\s+", m.group("dst"))
+            dst = [d.strip() for d in dst if d.strip() and d.strip() not in NOT_PLACES]
+            if not dst:
+                return None
+            return (src.strip() if src else None), dst
+
+    return None
@@ -0,0 +1,172 @@
+# gazetteer/build.py
+"""
+Build the bundled gazetteer (gazetteer/data/) from a GeoNames dump.
+
+    python -m gazetteer.build cities15000.txt countryInfo.txt [admin1CodesASCII.txt]
+
+The files come from https://download.geonames.org/export/dump/
+(CC BY 4.0). Every city becomes one place; its name and ASCII name are
+searchable, and big cities also get their Latin-script alternate names
+("Bombay", "New York", "Sao Paulo") — see ALIAS_TIERS. Aliases that are
+short or shared by several cities are dropped. Admin-1 names (states, provinces) go to regions.json,
+so index.py can refuse to turn "kerala" into a city.
+Everything is written as flat .npy arrays / byte blobs so index.py can
+memory-map them instead of parsing anything at startup.
+"""
+import json
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+
+from gazetteer.index import DATA_DIR, MIN_ALIAS_LENGTH, gram_keys, normalize_name
+
+# (minimum population, max alternate names kept)
+ALIAS_TIERS = [(1_000_000, 40), (250_000, 12), (50_000, 3)]
+
+
+def read_countries(path):
+    countries = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            cols = line.rstrip("\n").split("\t")
+            countries[cols[0]] = cols[4]
+    return countries
+
+
+def read_regions(path):
+    """admin1CodesASCII.txt: "US.FL<tab>Florida<tab>Florida<tab>4155751" → [code, name]."""
+    regions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) >= 3:
+                regions.append([cols[0].split(".")[0], cols[2]])
+    return regions
+
+
+def read_cities(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            yield {
+                "name": cols[1],
+                "ascii": cols[2],
+                "alternates": [a for a in cols[3].split(",") if a],
+                "lat": float(cols[4]),
+                "lon": float(cols[5]),
+                "country": cols[8],
+                "population": int(cols[14] or 0),
+                "zone": cols[17],
+            }
+
+
+def alias_limit(population):
+    for min_population, limit in ALIAS_TIERS:
+        if population >= min_population:
+            return limit
+    return 0
+
+
+def search_names(city):
+    """(own names, alternate names) of a city, normalized."""
+    names = []
+    for name in [city["name"], city["ascii"]]:
+        key = normalize_name(name)
+        if key and key not in names:
+            names.append(key)
+
+    aliases = []
+    for name in city["alternates"]:
+        # Latin-script proper names only: "Bombay", not "BOM" or "mumbai-shi"
+        if len(aliases) >= alias_limit(city["population"]):
+            break
+        if not name.isascii() or not name[:1].isupper() or name.isupper():
+            continue
+        key = normalize_name(name)
+        if (
+            len(key) >= MIN_ALIAS_LENGTH and len(key.split()) <= 3
+            and key not in names and key not in aliases
+        ):
+            aliases.append(key)
+    return names, aliases
+
+
+def write_strings(name, strings):
+    blob = "".join(strings).encode("utf-8")
+    offsets = np.zeros(len(strings) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(s.encode("utf-8")) for s in strings])
+
+    with open(os.path.join(DATA_DIR, f"{name}.bin"), "wb") as f:
+        f.write(blob)
+    np.save(os.path.join(DATA_DIR, f"{name}_offsets.npy"), offsets)
+
+
+def build(cities_path, countries_path, regions_path=None):
+    countries = read_countries(countries_path)
+    regions = read_regions(regions_path) if regions_path else []
+    cities = sorted(read_cities(cities_path), key=lambda c: -c["population"])
+
+    searchable = [search_names(city) for city in cities]
+    alias_owners = Counter(key for _, aliases in searchable for key in aliases)
+
+    country_codes = sorted({c["country"] for c in cities})
+    zones = sorted({c["zone"] for c in cities})
+    country_ids = {code: i for i, code in enumerate(country_codes)}
+    zone_ids = {zone: i for i, zone in enumerate(zones)}
+
+    places = np.zeros(len(cities), dtype=[
+        ("lat", "f4"), ("lon", "f4"), ("population", "i4"),
+        ("country", "u2"), ("zone", "u2"),
+    ])
+    names, owners = [], []
+
+    for i, city in enumerate(cities):
+        places[i] = (
+            city["lat"], city["lon"], city["population"],
+            country_ids[city["country"]], zone_ids[city["zone"]],
+        )
+        own, aliases = searchable[i]
+        for key in own + [a for a in aliases if alias_owners[a] == 1]:
+            names.append(key)
+            owners.append(i)
+
+    # trigram → name ids, CSR layout sorted by gram key
+    pairs = [(gram, name_id) for name_id, key in enumerate(names) for gram in gram_keys(key)]
+    pairs.sort()
+    keys = np.array([g for g, _ in pairs], dtype=np.uint32)
+    unique, starts = np.unique(keys, return_index=True)
+    offsets = np.append(starts, len(keys)).astype(np.int32)
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    np.save(os.path.join(DATA_DIR, "places.npy"), places)
+    np.save(os.path.join(DATA_DIR, "name_owner.npy"), np.array(owners, dtype=np.int32))
+    np.save(os.path.join(DATA_DIR, "gram_keys.npy"), unique.astype(np.uint32))
+    np.save(os.path.join(DATA_DIR, "gram_offsets.npy"), offsets)
+    np.save(os.path.join(DATA_DIR, "gram_postings.npy"), np.array([n for _, n in pairs], dtype=np.int32))
+    write_strings("names", names)
+    write_strings("display", [c["name"] for c in cities])
+
+    if regions:
+        with open(os.path.join(DATA_DIR, "regions.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "source": "GeoNames admin1CodesASCII (CC BY 4.0), https://www.geonames.org/",
+                "regions": regions,
+            }, f, ensure_ascii=False)
+
+    with open(os.path.join(DATA_DIR, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "source": "GeoNames (CC BY 4.0), https://www.geonames.org/",
+            "countries": [[code, countries.get(code, code)] for code in country_codes],
+            "zones": zones,
+        }, f, ensure_ascii=False)
+
+    return len(cities), len(names), len(unique)
+
+
+if __name__ == "__main__":
+    places, names, grams = build(*sys.argv[1:4])
+    print(f"✅ {places} places, {names} names, {grams} trigrams → {DATA_DIR}")
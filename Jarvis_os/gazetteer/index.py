@@ -0,0 +1,267 @@
+# gazetteer/index.py
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+CANDIDATES = 48   # names (most shared trigrams) checked per lookup
+
+# resolve() shortcut: alternate names shorter than this never resolve
+# ("goa", "usa" are other places' aliases); one only beats a city that
+# is called that when its place is ALIAS_OVER_NAME times bigger
+# ("calcutta" → Kolkata, but "islamabad" stays Islamabad); a region's
+# name resolves only to a city of that country that is called that
+# ("zurich") or is this big ("new york" — not "bali", "bihar")
+MIN_ALIAS_LENGTH = 4
+ALIAS_OVER_NAME = 10
+REGION_CITY_MIN_POPULATION = 500_000
+
+Place = namedtuple(
+    "Place", "name country country_code lat lon zone population score"
+)
+
+# spoken country hints → ISO code (GeoNames names are added on load)
+COUNTRY_ALIASES = {
+    "usa": "US", "us": "US", "america": "US", "united states of america": "US",
+    "uk": "GB", "england": "GB", "britain": "GB", "great britain": "GB",
+    "scotland": "GB", "wales": "GB", "uae": "AE", "emirates": "AE",
+    "korea": "KR", "russia": "RU", "vietnam": "VN",
+}
+
+
+def normalize_name(text: str) -> str:
+    """"São Paulo" / "sao-paulo" → "sao paulo" (ASCII, lowercase)."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+
+def gram_keys(key: str) -> set:
+    """Character trigrams of a normalized name, packed into ints."""
+    padded = f" {key} ".encode("ascii")
+    return {
+        (padded[i] << 16) | (padded[i + 1] << 8) | padded[i + 2]
+        for i in range(len(padded) - 2)
+    }
+
+
+class _Strings:
+    """Strings stored as one memory-mapped UTF-8 blob plus offsets."""
+
+    def __init__(self, data_dir, name):
+        self.blob = np.memmap(os.path.join(data_dir, f"{name}.bin"), dtype=np.uint8, mode="r")
+        self.offsets = np.load(os.path.join(data_dir, f"{name}_offsets.npy"), mmap_mode="r")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+
+class Gazetteer:
+    """
+    Offline city lookup over the bundled GeoNames extract (plus the
+    admin-1 region names in regions.json, when present).
+
+    Nothing is read until the first lookup; the arrays are then
+    memory-mapped, so the OS pages in only what lookups touch. A query's
+    trigrams pick candidate names from the CSR posting lists, the best
+    CANDIDATES by shared trigrams are checked for an exact match, and
+    several matches go to the more populous city ("Paris" → France).
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR):
+        self.data_dir = data_dir
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return os.path.exists(os.path.join(self.data_dir, "places.npy"))
+
+    def _load(self):
+        with self._lock:
+            if self._loaded:
+                return
+
+            def array(name):
+                return np.load(os.path.join(self.data_dir, f"{name}.npy"), mmap_mode="r")
+
+            self.places = array("places")
+            self.name_owner = array("name_owner")
+            self.gram_keys = array("gram_keys")
+            self.gram_offsets = array("gram_offsets")
+            self.gram_postings = array("gram_postings")
+            self.names = _Strings(self.data_dir, "names")
+            self.display = _Strings(self.data_dir, "display")
+
+            with open(os.path.join(self.data_dir, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+
+            self.zones = meta["zones"]
+            self.countries = [tuple(c) for c in meta["countries"]]
+            self.country_codes = {
+                normalize_name(name): code for code, name in self.countries
+            }
+            self.country_codes.update({code.lower(): code for code, _ in self.countries})
+            self.country_codes.update(COUNTRY_ALIASES)
+            self.country_ids = {code: i for i, (code, _) in enumerate(self.countries)}
+
+            # admin-1 names (states, provinces) → ISO codes of their countries
+            self.regions = {}
+            regions_path = os.path.join(self.data_dir, "regions.json")
+            if os.path.exists(regions_path):
+                with open(regions_path, encoding="utf-8") as f:
+                    for code, name in json.load(f)["regions"]:
+                        self.regions.setdefault(normalize_name(name), set()).add(code)
+            self._loaded = True
+
+    def country_code(self, hint: str):
+        self._load()
+        return self.country_codes.get(normalize_name(hint or ""))
+
+    def _candidates(self, key: str) -> np.ndarray:
+        grams = np.fromiter(gram_keys(key), dtype=np.uint32)
+        slots = np.searchsorted(self.gram_keys, grams)
+        inside = slots < len(self.gram_keys)
+        slots, grams = slots[inside], grams[inside]
+        slots = slots[self.gram_keys[slots] == grams]
+        if not len(slots):
+            return slots
+
+        ids = np.concatenate([
+            self.gram_postings[self.gram_offsets[s]:self.gram_offsets[s + 1]] for s in slots
+        ])
+        counts = np.bincount(ids)
+        hit = np.flatnonzero(counts)
+        # most shared trigrams first; ties → lower id = more populous city
+        return hit[np.lexsort((hit, -counts[hit]))[:CANDIDATES]]
+
+    def _place(self, place_id: int, score: float) -> Place:
+        row = self.places[place_id]
+        code, country = self.countries[row["country"]]
+        return Place(
+            self.display[place_id], country, code,
+            float(row["lat"]), float(row["lon"]),
+            self.zones[row["zone"]], int(row["population"]), round(score, 1),
+        )
+
+    def exact(self, key: str, country: str = None) -> list:
+        """(place id, via an alternate name?) for every place named exactly `key`."""
+        self._load()
+        hits = {}
+        for name_id in self._candidates(key):
+            if self.names[name_id] != key:
+                continue
+            place_id = int(self.name_owner[name_id])
+            if country and self.countries[self.places[place_id]["country"]][0] != country:
+                continue
+            alias = normalize_name(self.display[place_id]) != key
+            hits[place_id] = hits.get(place_id, True) and alias
+        return sorted(hits.items())   # lower id = more populous
+
+    def nearest(self, lat: float, lon: float, country: str, max_km: float):
+        """Closest place in `country` (ISO code) within max_km, or None."""
+        self._load()
+        if country not in self.country_ids:
+            return None
+
+        ids = np.flatnonzero(self.places["country"] == self.country_ids[country])
+        rows = self.places[ids]
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(rows["lat"]), np.radians(rows["lon"])
+        h = (
+            np.sin((lat2 - lat1) / 2) ** 2
+            + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        )
+        km = 12742 * np.arcsin(np.sqrt(h))
+
+        best = int(np.argmin(km)) if len(km) else None
+        if best is None or km[best] > max_km:
+            return None
+        return self._place(int(ids[best]), 100)
+
+    def resolve(self, text: str):
+        """
+        "paris" / "Paris, France" / "new york usa" → Place, or None.
+        A trailing country (after a comma or as the last words) narrows the
+        search. Exact names only, so a near miss goes to the geocoder, and
+        country or region names don't become unrelated cities ("usa",
+        "kerala", "bali"); see MIN_ALIAS_LENGTH and below it.
+        """
+        name, country = text, None
+
+        if "," in text:
+            name, hint = text.rsplit(",", 1)
+            country = self.country_code(hint)
+            if not country:
+                name = text
+        else:
+            words = text.split()
+            for n in (3, 2, 1):
+                if len(words) > n:
+                    code = self.country_code(" ".join(words[-n:]))
+                    if code:
+                        name, country = " ".join(words[:-n]), code
+                        break
+
+        key = normalize_name(name)
+        if not key:
+            return None
+
+        hits = self.exact(key, country)
+        named = [self._place(p, 100) for p, alias in hits if not alias]
+        aliased = [self._place(p, 100) for p, alias in hits if alias]
+        if len(aliased) > 1 or len(key) < MIN_ALIAS_LENGTH:
+            aliased = []   # ambiguous / too short to trust
+
+        place = named[0] if named else None
+        if aliased and (not place or aliased[0].population >= ALIAS_OVER_NAME * place.population):
+            place = aliased[0]
+        if not place:
+            return None
+
+        own_name = place in named
+
+        # "usa", "india": countries aren't cities, unless a city-state's
+        if self.country_code(key) not in (None, place.country_code if own_name else None):
+            return None
+
+        regions = self.regions.get(key, ())
+        if regions and (not country or country in regions):
+            if place.country_code not in regions or not (
+                own_name or place.population >= REGION_CITY_MIN_POPULATION
+            ):
+                return None
+
+        return place
+
+
+GAZETTEER = Gazetteer()
+
+
+def find_place(text: str):
+    """Module-level helper: None when the data isn't bundled or nothing matches."""
+    if not text or not GAZETTEER.available():
+        return None
+    try:
+        return GAZETTEER.resolve(text)
+    except Exception as e:
+        print("⚠️ Gazetteer lookup failed:", e)
+        return None
+
+
+def nearest_place(lat: float, lon: float, country: str, max_km: float):
+    """Module-level helper for Gazetteer.nearest: None when not bundled / too far."""
+    if not country or not GAZETTEER.available():
+        return None
+    try:
+        return GAZETTEER.nearest(lat, lon, country, max_km)
+    except Exception as e:
+        print("⚠️ Gazetteer lookup failed:", e)
+        return None
@@ -0,0 +1,167 @@
+# geocode_cache.py
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+MISS = object()   # get(): nothing cached (None means "known not to exist")
+
+
+def normalize_place(place: str) -> str:
+    """"New  Delhi!" / "new delhi" → "new delhi"."""
+    place = re.sub(r"[^\w\s,]", " ", place.lower())
+    place = re.sub(r"\s*,\s*", ", ", place)
+    return re.sub(r"\s+", " ", place).strip(" ,")
+
+
+class GeocodeCache:
+    """
+    Persistent place → (name, (lat, lon)) cache.
+
+    SQLite keeps results across restarts with a long TTL; misses
+    (OpenCage found nothing) are stored as negative entries with a short
+    TTL so a typo isn't looked up again on every request. A small
+    in-memory LRU sits in front so repeated cities never touch the disk.
+    """
+
+    def __init__(self, path: str, ttl: float = 30 * 86400,
+                 negative_ttl: float = 3600, memory_size: int = 1024):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_size = memory_size
+
+        self._memory = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def _conn(self):
+        if self._db is None:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " place TEXT PRIMARY KEY,"
+                " name TEXT,"            # NULL → negative entry
+                " lat REAL,"
+                " lon REAL,"
+                " expires_at REAL NOT NULL)"
+            )
+        return self._db
+
+    def _remember(self, key, expires_at, value):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, place: str):
+        """Cached value, None for a cached miss, or MISS."""
+        key = normalize_place(place)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                if entry[1] is None:
+                    self.negative_hits += 1
+                return entry[1]
+
+            row = self._conn().execute(
+                "SELECT name, lat, lon, expires_at FROM geocode WHERE place = ?",
+                (key,)
+            ).fetchone()
+
+            if not row or row[3] <= now:
+                self._memory.pop(key, None)
+                self.misses += 1
+                return MISS
+
+            name, lat, lon, expires_at = row
+            value = (name, (lat, lon)) if name is not None else None
+            self._remember(key, expires_at, value)
+            self.disk_hits += 1
+            if value is None:
+                self.negative_hits += 1
+            return value
+
+    def put(self, place: str, value):
+        """Store a result; value None records a (short-lived) miss."""
+        key = normalize_place(place)
+        ttl = self.ttl if value is not None else self.negative_ttl
+        expires_at = time.time() + ttl
+        name, (lat, lon) = value if value is not None else (None, (None, None))
+
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)",
+                (key, name, lat, lon, expires_at)
+            )
+            db.commit()
+            self._remember(key, expires_at, value)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            db = self._conn()
+            removed = db.execute(
+                "DELETE FROM geocode WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            db.commit()
+            return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# ==============================
+# PRE-WARM CLI
+#   python -m geocode_cache places.txt   (one place per line)
+#   python -m geocode_cache Tokyo "New York"
+# ==============================
+def read_places(args):
+    for arg in args:
+        if os.path.isfile(arg):
+            with open(arg, encoding="utf-8") as f:
+                yield from (line.strip() for line in f if line.strip())
+        else:
+            yield arg
+
+
+if __name__ == "__main__":
+    from location_service import GEOCODE_CACHE, geocode
+
+    GEOCODE_CACHE.purge_expired()
+
+    for place in read_places(sys.argv[1:]):
+        cached = GEOCODE_CACHE.get(place) is not MISS
+        result = geocode(place)
+        if result:
+            name, (lat, lon) = result
+            print(f"{'✔' if cached else '✅'} {place} → {name} ({lat:.4f}, {lon:.4f})")
+        else:
+            print(f"❌ {place}: not found")
@@ -0,0 +1,32 @@
+# gunicorn.conf.py
+# Several workers sharing one copy of the speech model (Linux/macOS):
+#     pip install gunicorn
+#     gunicorn main:app -c gunicorn.conf.py
+import os
+
+bind = os.getenv("JARVIS_BIND", "127.0.0.1:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# the app itself is imported in each worker, after fork: jarvis_core's
+# MongoClient must not be created before fork
+preload_app = False
+
+# 1 until the in-process state is shared between workers: chat log index
+# cache (ChatLogStore), RecentMessages, PastAnswers, the AI cache and
+# TAB_MEMORY each live per process, and workers would overwrite each
+# other's index.json
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+def on_starting(server):
+    """
+    Master only, before any worker forks: load just the Vosk model. The
+    workers inherit the loaded asr_service module and share the model's
+    pages copy-on-write instead of each loading a copy.
+    """
+    from asr_service import ASR_MODEL, ASRUnavailable
+
+    try:
+        ASR_MODEL.get()
+    except ASRUnavailable as e:
+        server.log.warning("Speech model preload failed: %s", e)
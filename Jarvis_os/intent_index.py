@@ -0,0 +1,301 @@
+# intent_index.py
+import os
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# ==============================
+# ⚖️ SCORER WEIGHTS (SAME AS find_intent)
+# ==============================
+TOKEN_SET_WEIGHT = 0.5
+PARTIAL_WEIGHT = 0.3
+RATIO_WEIGHT = 0.2
+
+# upper bounds used to skip patterns that cannot beat the current best
+TOKEN_SET_MAX = 100 * TOKEN_SET_WEIGHT
+PARTIAL_MAX = 100 * PARTIAL_WEIGHT
+BOUND_EPSILON = 1e-9
+
+# patterns fully scored up front to get an early lower bound
+SEED_CANDIDATES = 16
+
+# below this size pruning costs more than it saves
+PRUNE_MIN_PATTERNS = 256
+
+
+class IntentIndex:
+    """
+    Precompiled intent matcher built once from the command documents.
+
+    Every pattern is flattened into one list (with a parallel array of
+    intent ids) so a command is scored against all patterns in bulk with
+    rapidfuzz `cdist` instead of a Python loop over pairs.
+
+    Scoring is identical to the old nested loop:
+        token_set_ratio * 0.5 + partial_ratio * 0.3 + ratio * 0.2
+    and ties go to the first pattern in collection order.
+    """
+
+    def __init__(self, docs, cache_size: int = 256, version: int = 0, stamp=None):
+        started = time.perf_counter()
+
+        intents = []
+        patterns = []
+        owners = []
+
+        for doc in docs:
+            intent = doc.get("intent")
+            doc_patterns = doc.get("patterns", [])
+            if not intent or not doc_patterns:
+                continue
+
+            intents.append(intent)
+            for pattern in doc_patterns:
+                patterns.append(pattern)
+                owners.append(len(intents) - 1)
+
+        self.intents = intents
+        self.patterns = patterns
+        self.owners = np.asarray(owners, dtype=np.int32)
+
+        # handle_command can ask for the same command several times
+        self._cached_match = lru_cache(maxsize=cache_size)(self._match)
+
+        self.version = version
+        self.stamp = stamp
+        self.built_at = datetime.utcnow().isoformat()
+        self.build_ms = (time.perf_counter() - started) * 1000
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self.patterns)
+
+    def match(self, command: str):
+        """
+        Return (best_intent, best_weighted_score) for an already
+        normalized command, or (None, 0) when there are no patterns.
+        """
+        return self._cached_match(command)
+
+    def _scores(self, scorer, command, indices=None, score_cutoff=None):
+        patterns = (
+            self.patterns if indices is None
+            else [self.patterns[i] for i in indices]
+        )
+        return process.cdist(
+            [command],
+            patterns,
+            scorer=scorer,
+            dtype=np.float64,
+            score_cutoff=score_cutoff
+        )[0]
+
+    def _weighted(self, command, indices, ratio):
+        # same operation order as the original expression
+        return (
+            self._scores(fuzz.token_set_ratio, command, indices) * TOKEN_SET_WEIGHT +
+            self._scores(fuzz.partial_ratio, command, indices) * PARTIAL_WEIGHT +
+            ratio * RATIO_WEIGHT
+        )
+
+    def _match(self, command: str):
+        if not self.patterns:
+            return None, 0
+
+        # stage 1: plain ratio is cheap, score every pattern with it
+        ratio = self._scores(fuzz.ratio, command)
+
+        if self.pattern_count < PRUNE_MIN_PATTERNS:
+            return self._best(self._weighted(command, None, ratio), None)
+
+        ratio_part = ratio * RATIO_WEIGHT
+
+        # stage 2: fully score the closest few to get a lower bound
+        seeds = np.sort(np.argsort(-ratio, kind="stable")[:SEED_CANDIDATES])
+        floor = float(np.max(self._weighted(command, seeds, ratio[seeds])))
+
+        # stage 3: token_set_ratio only where the pattern can still win;
+        # below the cutoff a pattern cannot reach the floor anyway
+        candidates = np.flatnonzero(
+            ratio_part + TOKEN_SET_MAX + PARTIAL_MAX + BOUND_EPSILON >= floor
+        )
+        token_set = self._scores(
+            fuzz.token_set_ratio,
+            command,
+            candidates,
+            score_cutoff=max(
+                0.0,
+                (floor - PARTIAL_MAX - 100 * RATIO_WEIGHT) / TOKEN_SET_WEIGHT - BOUND_EPSILON
+            )
+        )
+        lower = token_set * TOKEN_SET_WEIGHT + ratio_part[candidates]
+        floor = max(floor, float(np.max(lower)))
+
+        # stage 4: partial_ratio (the slowest scorer) on the survivors
+        keep = lower + PARTIAL_MAX + BOUND_EPSILON >= floor
+        candidates = candidates[keep]
+        partial = self._scores(fuzz.partial_ratio, command, candidates)
+
+        weighted = (
+            token_set[keep] * TOKEN_SET_WEIGHT +
+            partial * PARTIAL_WEIGHT +
+            ratio[candidates] * RATIO_WEIGHT
+        )
+
+        return self._best(weighted, candidates)
+
+    def _best(self, weighted, candidates):
+        # argmax keeps the first of equal scores, like the old loop
+        best = int(np.argmax(weighted))
+        best_score = float(weighted[best])
+
+        if best_score <= 0:
+            return None, 0
+
+        pattern = best if candidates is None else candidates[best]
+        return self.intents[self.owners[pattern]], best_score
+
+
+# ==============================
+# 🔄 HOT-RELOADING INDEX
+# ==============================
+RELOAD_MODE = os.getenv("INTENT_RELOAD_MODE", "poll")      # poll | watch | off
+RELOAD_INTERVAL = float(os.getenv("INTENT_RELOAD_INTERVAL", "30"))
+
+
+class IntentIndexReloader:
+    """
+    Keeps a versioned IntentIndex in sync with the commands collection.
+
+    A background thread notices changes (Mongo change stream in "watch"
+    mode, otherwise a cheap count + newest updatedAt fingerprint), builds
+    the new index off the request path and swaps it in with one reference
+    assignment. Readers always see a complete index.
+    """
+
+    def __init__(self, collection, mode: str = RELOAD_MODE, interval: float = RELOAD_INTERVAL):
+        self.collection = collection
+        self.mode = mode
+        self.interval = interval
+        self.index = IntentIndex([])
+        self.last_check = None
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+
+    # ---------- reads ----------
+    def match(self, command: str):
+        return self.index.match(command)
+
+    def status(self) -> dict:
+        index = self.index
+        return {
+            "version": index.version,
+            "stamp": index.stamp,
+            "intent_count": len(index.intents),
+            "pattern_count": index.pattern_count,
+            "build_ms": round(index.build_ms, 3),
+            "built_at": index.built_at,
+            "mode": self.mode,
+            "last_check": self.last_check,
+            "last_error": self.last_error,
+        }
+
+    # ---------- builds ----------
+    def _fingerprint(self):
+        newest = self.collection.find_one(
+            {}, {"updatedAt": 1}, sort=[("updatedAt", -1)]
+        )
+        updated = newest.get("updatedAt") if newest else None
+        return (
+            f"{self.collection.count_documents({})}:"
+            f"{updated.isoformat() if hasattr(updated, 'isoformat') else updated}"
+        )
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild if the collection changed (or always when forced).
+        Returns True when a new index was swapped in.
+        """
+        with self._lock:
+            stamp = self._fingerprint()
+            self.last_check = datetime.utcnow().isoformat()
+
+            if not force and stamp == self.index.stamp:
+                return False
+
+            index = IntentIndex(
+                list(self.collection.find({}, {"intent": 1, "patterns": 1})),
+                version=self.index.version + 1,
+                stamp=stamp
+            )
+            self.index = index   # atomic swap
+            print(f"🔄 Intent index v{index.version}: {index.pattern_count} patterns")
+
+        self._notify(index)
+        return True
+
+    def on_reload(self, callback):
+        """
+        Call callback(index) with the current index and again after every
+        swap (e.g. to regenerate a speech grammar from the patterns).
+        """
+        self._listeners.append(callback)
+        callback(self.index)
+
+    def _notify(self, index):
+        for callback in list(self._listeners):
+            try:
+                callback(index)
+            except Exception as e:
+                print("⚠️ Intent reload listener failed:", e)
+
+    def load(self):
+        """Initial synchronous build (import time)."""
+        self.reload(force=True)
+        return self
+
+    # ---------- background ----------
+    def start(self):
+        if self.mode == "off" or (self._thread and self._thread.is_alive()):
+            return
+
+        self._stop.clear()
+        target = self._watch_loop if self.mode == "watch" else self._poll_loop
+        self._thread = threading.Thread(target=target, name="intent-reloader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _safe_reload(self, force: bool = False):
+        try:
+            self.reload(force)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            print("⚠️ Intent index reload failed:", e)
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.interval):
+            self._safe_reload()
+
+    def _watch_loop(self):
+        try:
+            with self.collection.watch(max_await_time_ms=int(self.interval * 1000)) as stream:
+                while not self._stop.is_set():
+                    if stream.try_next() is not None:
+                        self._safe_reload(force=True)
+        except Exception as e:
+            # change streams need a replica set; fall back to polling
+            self.last_error = str(e)
+            self.mode = "poll"
+            print("⚠️ Change stream unavailable, polling instead:", e)
+            self._poll_loop()
@@ -1,10 +1,10 @@
 # jarvis_core.py
 import os
 import re
-import threading
 import platform
 
 from datetime import datetime
+from functools import partial
 from pymongo import MongoClient
 from dotenv import load_dotenv
 from rapidfuzz import fuzz
@@ -12,21 +12,27 @@ from rapidfuzz import fuzz
 from ai_fallback import get_ai_response
 from weather_service import get_weather
 from time_service import get_time_from_timezone_db
-from maps_service import get_distance
+from maps_service import get_distance, get_distance_matrix, describe_matrix
 from location_service import get_current_location
-from memory_reader import find_past_answer
+from memory_reader import PastAnswers
 from systems.system_router import execute_system_intent
 from memory.memory_facts import detect_explicit_update
 
-from chatHistory.chathistory import load, save, add_message
+from chatHistory.chathistory import load, add_message, on_history_changed
 from memory.memory_facts import get_memory_summary
+from memory.fact_session import FactSession
+from memory.user_facts import track_fact_io
 from utils.text_utils import normalize_text
 from extractors.search_query_extractor import extract_search_query
 from systems.system_actions import play_video, search_web, set_location_route
 from config.location_keywords import LOCATION_KEYWORDS
+from config.command_verbs import COMMAND_VERBS
 from extractors.location_set_extractor import extract_location_set
 from extractors.time_place_extractor import extract_time_place
+from extractors.distance_extractor import extract_distance_places
 from chatHistory.context_builder import build_chat_context
+from intent_index import IntentIndexReloader
+from speech_service import SPEECH
 
 # ==============================
 # 🧠 PER-TAB MEMORY (IN-RAM)
@@ -66,10 +72,22 @@ commands_col = db[COLLECTION_NAME]
 
 OS_NAME = platform.system()
 
+# log per-request fact file reads/writes (set JARVIS_FACT_IO_LOG=1)
+FACT_IO_LOG = os.getenv("JARVIS_FACT_IO_LOG") == "1"
+
+# ==============================
+# 🔒 INTENT INDEX (HOT-RELOADED)
+# ==============================
+INTENT_INDEX = IntentIndexReloader(commands_col).load()
+
 # ==============================
-# 🔒 INTENT CACHE (LOAD ONCE)
+# 🔎 PAST ANSWERS (INDEXED CHAT HISTORY)
 # ==============================
-COMMAND_CACHE = list(commands_col.find())
+# a past reply this close to the new question is returned without an AI call
+PAST_ANSWER_MIN_SCORE = int(os.getenv("PAST_ANSWER_MIN_SCORE", "92"))
+PAST_ANSWER_USERS = int(os.getenv("PAST_ANSWER_USERS", "64"))   # indexes kept in memory
+PAST_ANSWERS = PastAnswers(load, PAST_ANSWER_USERS)
+on_history_changed(PAST_ANSWERS.drop)   # deleted chats stop answering
 
 # ==============================
 # 🔐 GUEST RESTRICTION
@@ -118,33 +136,6 @@ MEDIA_INTENTS = {
     "search_web",
     "search_maps",   # 👈 NEW
 }
-# ==============================
-# 🧠 COMMAND VERBS (ENTRY WORDS)
-# ==============================
-COMMAND_VERBS = {
-    "open",
-    "play",
-    "start",
-    "stop",
-    "search",
-    "find",
-    "go",
-    "navigate",
-    "set",
-    "increase",
-    "decrease",
-    "mute",
-    "unmute",
-    "shutdown",
-    "restart",
-    "show",
-    "tell",
-    "what",
-    "who",
-    "where",
-    "when"
-}
-
 # ==============================
 # 🧠 SHORT-LIVED INTENT CONTEXT
 # ==============================
@@ -165,65 +156,92 @@ CPU_KEYWORDS = {"slow", "lag", "loud", "fan", "noise", "hang", "performance"}
 # ==============================
 def speak(text: str):
     print("🤖 Jarvis:", text)
-    safe_text = text.replace('"', "'")
-
-    if OS_NAME == "Windows":
-        ps_script = f'''
-        Add-Type -AssemblyName System.Speech
-        $synth = New-Object System.Speech.Synthesis.SpeechSynthesizer
-        $synth.Rate = 0
-        $synth.Volume = 100
-        $synth.Speak("{safe_text}")
-        '''
-        import subprocess
-        subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
-        )
-    else:
-        import subprocess
-        subprocess.run([
-            "espeak",
-            "-v", "en-us",
-            "-s", "145",
-            "-a", "180",
-            safe_text
-        ])
+    SPEECH.say(text)
 
 def speak_async(text: str):
-    threading.Thread(target=speak, args=(text,), daemon=True).start()
+    # the speech worker queues it; nothing here blocks
+    speak(text)
+
 # ==============================
 # 💾 CHAT PERSISTENCE (FILE SAVE)
 # ==============================
-def persist_chat(user_id, chat_id, user_text, jarvis_text):
+def persist_chat(user_id, chat_id, user_text, jarvis_text, remember=True):
     try:
         if not user_id or not chat_id:
             return
 
         add_message(chat_id, user_id, "user", user_text)
         add_message(chat_id, user_id, "jarvis", jarvis_text)
+        if remember:
+            PAST_ANSWERS.record(user_id, user_text, jarvis_text)
 
     except Exception as e:
         print("⚠️ Chat persistence failed:", e)
 
+# ==============================
+# 🤖 AI TURNS (SYNC OR DEFERRED)
+# ==============================
+class PendingAIReply:
+    """
+    An AI turn whose model call is left to the caller.
+
+    handle_command(..., defer_ai=True) returns this instead of calling
+    get_ai_response, so an async route can await get_ai_response_async
+    with `request` and then call finish(response) to get the usual
+    reply dict (tab memory, persistence and speech included).
+    """
+
+    def __init__(self, request: dict, finish):
+        self.request = request
+        self.finish = finish
+
+
+def ai_turn(defer_ai: bool, finish, **request):
+    if defer_ai:
+        return PendingAIReply(request, finish)
+    return finish(get_ai_response(**request))
+
+
+def finish_chat_turn(user_name, chat_id, raw, intent, confidence, silent, response):
+    TAB_MEMORY[chat_id]["messages"].append({
+        "role": "user",
+        "text": raw
+    })
+    TAB_MEMORY[chat_id]["messages"].append({
+        "role": "jarvis",
+        "text": response
+    })
+
+    # 💾 Persist to file-based chat history (a reused past answer is
+    # already in the index: don't add it again)
+    persist_chat(user_name, chat_id, raw, response, remember=intent != "past_answer")
+
+    if not silent:
+        speak_async(response)
+
+    return {
+        "reply": response,
+        "intent": intent,
+        "confidence": confidence
+    }
+
+
+def finish_travel_turn(silent, response):
+    if not silent:
+        speak_async(response)
+
+    return {
+        "reply": response,
+        "intent": "travel_continuation",
+        "confidence": 100
+    }
+
 # ==============================
 # FUZZY MATCH (CACHED)
 # ==============================
 def find_intent(command: str):
     command = normalize_text(command)
-    best_intent, best_score = None, 0
-
-    for doc in COMMAND_CACHE:
-        for pattern in doc.get("patterns", []):
-            score = (
-                fuzz.token_set_ratio(command, pattern) * 0.5 +
-                fuzz.partial_ratio(command, pattern) * 0.3 +
-                fuzz.ratio(command, pattern) * 0.2
-            )
-            if score > best_score:
-                best_score = score
-                best_intent = doc["intent"]
+    best_intent, best_score = INTENT_INDEX.match(command)
 
     return (best_intent, int(best_score)) if best_score >= 70 else (None, int(best_score))
 
@@ -263,13 +281,15 @@ def force_language_guard(raw: str, chat_id: str) -> bool:
 # ==============================
 # CHEAP REASONING
 # ==============================
-def cheap_reasoning(raw: str):
+def cheap_reasoning(raw: str, default_location: str = None):
     response_parts = []
 
     if any(word in raw for word in WEATHER_KEYWORDS):
         try:
-            location = get_current_location()
-            weather = get_weather(location)
+            city, _ = get_current_location(default_location)
+            if not city:
+                return None
+            weather = get_weather(city)
             response_parts.append(weather)
         except:
             pass
@@ -354,7 +374,36 @@ def handle_command(
     user_role="guest",
     user_name=None,
     chat_id=None,
-    silent: bool = False
+    silent: bool = False,
+    defer_ai: bool = False
+):
+    # 🧠 user facts are read once per request and written once at the end
+    with track_fact_io() as fact_io:
+        with FactSession(user_name) as facts:
+            result = _handle_command(
+                command,
+                user_role=user_role,
+                user_name=user_name,
+                chat_id=chat_id,
+                silent=silent,
+                facts=facts,
+                defer_ai=defer_ai
+            )
+
+    if FACT_IO_LOG:
+        print(f"🧠 Fact file I/O: {fact_io['reads']} reads, {fact_io['writes']} writes")
+
+    return result
+
+
+def _handle_command(
+    command,
+    user_role="guest",
+    user_name=None,
+    chat_id=None,
+    silent: bool = False,
+    facts: FactSession = None,
+    defer_ai: bool = False
 ):
 
     # ==============================
@@ -443,14 +492,15 @@ def handle_command(
             f"Travel destination: {ctx['focus']}"
         )
 
-        response = get_ai_response(
+        return ai_turn(
+            defer_ai,
+            partial(finish_travel_turn, silent),
             user_command=raw,
             memory_summary=full_memory,
-            intent_context=intent_context
+            intent_context=intent_context,
+            user_id=user_name
         )
 
-        return {...}
-
     # ==============================
     # 🔇 WINDOW TAB RESTRICTIONS
     # ==============================
@@ -487,7 +537,7 @@ def handle_command(
         match = re.search(r"my name is (.+)", raw)
         if match:
             new_name = match.group(1).strip().title()
-            set_fact(user_name, "name", new_name)
+            set_fact(user_name, "name", new_name, session=facts)
 
             response = f"Nice to meet you, {new_name} 😊"
 
@@ -504,7 +554,7 @@ def handle_command(
     # 0️⃣ IDENTITY QUERY (who am I?)
     # ==============================
     if user_name and is_identity_query(raw):
-        name = get_fact(user_name, "name")
+        name = get_fact(user_name, "name", session=facts)
         response = f"You are {name}." if name else "I don’t know your name yet."
         if not silent:
             speak_async(response)
@@ -518,7 +568,7 @@ def handle_command(
     # 1️⃣ EXPLICIT FACT UPDATE
     # ==============================
     if user_name:
-        explicit = detect_explicit_update(user_name, raw)
+        explicit = detect_explicit_update(user_name, raw, session=facts)
         if explicit:
             response = f"Okay 👍 I updated your {explicit['key']}."
             if not silent:
@@ -533,7 +583,7 @@ def handle_command(
     # 🔁 ONLY LIKE (replace list)
     # ==============================
     if user_name:
-        only = detect_only_like(user_name, raw)
+        only = detect_only_like(user_name, raw, session=facts)
         if only:
             response = f"Got it 👍 I’ll remember that you only like {only}."
             if not silent:
@@ -548,7 +598,7 @@ def handle_command(
     # 🗑️ FACT REMOVAL
     # ==============================
     if user_name:
-        removal = detect_fact_removal(user_name, raw)
+        removal = detect_fact_removal(user_name, raw, session=facts)
         if removal:
             response = f"Okay 👍 I removed {removal['value']} from your {removal['key']}."
             if not silent:
@@ -596,7 +646,7 @@ def handle_command(
     if user_name:
         fact_key = detect_fact_query(raw)
         if fact_key:
-            value = get_fact(user_name, fact_key)
+            value = get_fact(user_name, fact_key, session=facts)
             if value:
                 response = f"Your {fact_key} is {value}."
                 if not silent:
@@ -623,7 +673,7 @@ def handle_command(
                 "confidence": 100
             }
 
-        set_fact(user_name, "default_location", location_value)
+        set_fact(user_name, "default_location", location_value, session=facts)
         set_location_route(location_value)
 
         response = f"Okay 👍 I’ve set your location to {location_value.title()}."
@@ -650,6 +700,32 @@ def handle_command(
             "intent": "time_place",
             "confidence": 100
         }
+
+    # ==============================
+    # 📏 DISTANCE (ONE OR MANY PLACES)
+    # ==============================
+    distance = extract_distance_places(raw)
+
+    if distance:
+        source, destinations = distance
+        default_location = get_fact(user_name, "default_location", session=facts) if user_name else None
+
+        if len(destinations) == 1:
+            response = get_distance(source, destinations[0], default_location)
+        else:
+            try:
+                results = get_distance_matrix(source, destinations, default_location)
+                response = describe_matrix(source.title() if source else "your location", results)
+            except Exception:
+                response = "I was unable to calculate the distances right now."
+
+        if not silent:
+            speak_async(response)
+        return {
+            "reply": response,
+            "intent": "distance",
+            "confidence": 100
+        }
 # ==============================
 # 🎥 MEDIA COMMAND HANDLER
 # ==============================
@@ -664,7 +740,7 @@ def handle_command(
     # ✅ LOCATION keywords should ALSO respect command intent
     if is_command(raw) and (raw_words & LOCATION_KEYWORDS):
         media_intent = "search_maps"
-        saved_location = get_fact(user_name, "default_location") if user_name else None
+        saved_location = get_fact(user_name, "default_location", session=facts) if user_name else None
         clean_query = raw.replace("search", "").strip()
         query = f"{clean_query} near {saved_location}" if saved_location else clean_query
 
@@ -744,7 +820,10 @@ def handle_command(
    # ==============================
 # ⚡ CHEAP REASONING (BEFORE AI)
 # ==============================
-    cheap = cheap_reasoning(raw)
+    cheap = cheap_reasoning(
+        raw,
+        get_fact(user_name, "default_location", session=facts) if user_name else None
+    )
     if cheap:
         if not silent:
             speak_async(cheap)
@@ -800,37 +879,19 @@ def handle_command(
 
         full_memory = (
             f"Conversation so far:\n{chat_context}\n\n"
-            f"{get_memory_summary(user_name) if user_name else ''}"
+            f"{get_memory_summary(user_name, session=facts) if user_name else ''}"
         )
 
-        response = get_ai_response(
+        # 🔒 Saved to per-tab memory + chat history once the reply is in
+        return ai_turn(
+            defer_ai,
+            partial(finish_chat_turn, user_name, chat_id, raw, "contextual_ai", 100, silent),
             user_command=raw,
             memory_summary=full_memory,
-            intent_context=intent_context
+            intent_context=intent_context,
+            user_id=user_name
         )
 
-        # 🔒 Save to per-tab memory
-        TAB_MEMORY[chat_id]["messages"].append({
-            "role": "user",
-            "text": raw
-        })
-        TAB_MEMORY[chat_id]["messages"].append({
-            "role": "jarvis",
-            "text": response
-        })
-
-        # 💾 Persist to file-based chat history
-        persist_chat(user_name, chat_id, raw, response)
-
-        if not silent:
-            speak_async(response)
-
-        return {
-            "reply": response,
-            "intent": "contextual_ai",
-            "confidence": 100
-        }
-
 # ==============================
 # 🤖 AI / MEMORY FALLBACK (CHAT HISTORY AWARE)
 # ==============================
@@ -850,33 +911,24 @@ def handle_command(
             "Provide only code unless explanation is explicitly asked."
         )
 
+    # 🔎 Already answered this (almost word for word)? Reuse it.
+    if user_name and not intent_context and not is_continuation(raw):
+        past, score = PAST_ANSWERS.find(user_name, raw, PAST_ANSWER_MIN_SCORE)
+        if past:
+            return finish_chat_turn(
+                user_name, chat_id, raw, "past_answer", score, silent, past
+            )
+
     full_memory = (
         f"Conversation so far:\n{chat_context}\n\n"
-        f"{get_memory_summary(user_name) if user_name else ''}"
+        f"{get_memory_summary(user_name, session=facts) if user_name else ''}"
     )
 
-    response = get_ai_response(
+    return ai_turn(
+        defer_ai,
+        partial(finish_chat_turn, user_name, chat_id, raw, "ai_fallback", 0, silent),
         user_command=raw,
         memory_summary=full_memory,
-        intent_context=intent_context
+        intent_context=intent_context,
+        user_id=user_name
     )
-
-    TAB_MEMORY[chat_id]["messages"].append({
-        "role": "user",
-        "text": raw
-    })
-    TAB_MEMORY[chat_id]["messages"].append({
-        "role": "jarvis",
-        "text": response
-    })
-
-    persist_chat(user_name, chat_id, raw, response)
-
-    if not silent:
-        speak_async(response)
-
-    return {
-        "reply": response,
-        "intent": "ai_fallback",
-        "confidence": 0
-    }
@@ -1,17 +1,45 @@
 # location_service.py
 import os
+import threading
 import requests
 from dotenv import load_dotenv
 
+from gazetteer.index import find_place
+from geocode_cache import GeocodeCache, MISS
+from utils.metrics import register
+from utils.swr_cache import SWRCache
+
 load_dotenv()
 
 OPENCAGE_KEY = os.getenv("OPENCAGE_API_KEY")
 
+# ==============================
+# GEOCODE CACHE (shared by time, maps and weather)
+# ==============================
+GEOCODE_CACHE = GeocodeCache(
+    os.getenv("GEOCODE_CACHE_PATH", "data/geocode_cache.sqlite3"),
+    ttl=float(os.getenv("GEOCODE_CACHE_TTL", str(30 * 86400))),
+    negative_ttl=float(os.getenv("GEOCODE_NEGATIVE_TTL", "3600")),
+    memory_size=int(os.getenv("GEOCODE_MEMORY_SIZE", "1024")),
+)
+register("geocode.cache", GEOCODE_CACHE.stats)
+
 
 def geocode(place: str):
     """
     Convert place name → (formatted name, lat, lon)
+    Results (and "not found") are cached on disk, see geocode_cache.py;
+    well-known cities come from the offline gazetteer.
     """
+    cached = GEOCODE_CACHE.get(place)
+    if cached is not MISS:
+        return cached
+
+    # common cities resolve from the bundled gazetteer, no API call
+    known = find_place(place)
+    if known:
+        return f"{known.name}, {known.country}", (known.lat, known.lon)
+
     try:
         url = "https://api.opencagedata.com/geocode/v1/json"
         res = requests.get(
@@ -22,23 +50,34 @@ def geocode(place: str):
                 "limit": 1
             },
             timeout=5
-        ).json()
+        )
+        data = res.json()
 
-        if not res.get("results"):
+        if not data.get("results"):
+            # only a real "no match" is remembered, not auth/quota errors
+            if res.status_code == 200:
+                GEOCODE_CACHE.put(place, None)
             return None
 
-        result = res["results"][0]
+        result = data["results"][0]
         name = result["formatted"]
         lat = result["geometry"]["lat"]
         lon = result["geometry"]["lng"]
 
+        GEOCODE_CACHE.put(place, (name, (lat, lon)))
         return name, (lat, lon)
 
     except Exception:
         return None
 
 
-def get_current_location():
+def cached_geocode(place: str):
+    """Geocode from the cache only (no network); None if unknown."""
+    cached = GEOCODE_CACHE.get(place)
+    return None if cached is MISS else cached
+
+
+def lookup_ip_location(_key=None):
     """
     Detect current city using IP (FREE)
     """
@@ -57,3 +96,67 @@ def get_current_location():
 
     except Exception:
         return None, None
+
+
+# ==============================
+# CURRENT LOCATION (CACHED)
+# ==============================
+# the server's public IP rarely moves: keep the ipinfo answer for
+# CURRENT_LOCATION_TTL, then keep serving it while it refreshes behind
+CURRENT_LOCATION_TTL = float(os.getenv("CURRENT_LOCATION_TTL", str(6 * 3600)))
+
+# fixed location (skips ipinfo), e.g. JARVIS_LOCATION=Hyderabad
+# optionally with JARVIS_LOCATION_COORDS=17.385,78.4867
+LOCATION_OVERRIDE = os.getenv("JARVIS_LOCATION")
+LOCATION_OVERRIDE_COORDS = os.getenv("JARVIS_LOCATION_COORDS")
+
+CURRENT_LOCATION = SWRCache(
+    lookup_ip_location,
+    ttl=CURRENT_LOCATION_TTL,
+    stale_ttl=7 * 86400,
+    max_entries=1,
+    cacheable=lambda location: location[0] is not None,
+)
+register("location.current", CURRENT_LOCATION.stats)
+
+
+def _named_location(place: str, coords: str = None):
+    if coords:
+        lat, lon = coords.split(",")
+        return place.title(), (float(lat), float(lon))
+
+    # no network here: callers that need the coordinates of an uncached
+    # place geocode it themselves (maps_service.resolve_place)
+    found = cached_geocode(place)
+    if found:
+        return place.title(), found[1]
+
+    known = find_place(place)
+    return place.title(), ((known.lat, known.lon) if known else None)
+
+
+def get_current_location(override: str = None):
+    """
+    (city, (lat, lon)) for "here".
+
+    Order: `override` (the user's default_location fact), the
+    JARVIS_LOCATION setting, then the cached IP lookup. Coordinates of
+    a named place come from the geocode cache or the gazetteer (never
+    the network) and may be None.
+    """
+    if override:
+        return _named_location(override)
+
+    if LOCATION_OVERRIDE:
+        return _named_location(LOCATION_OVERRIDE, LOCATION_OVERRIDE_COORDS)
+
+    try:
+        return CURRENT_LOCATION.get("ip")
+    except Exception:
+        return None, None
+
+
+def warm_current_location():
+    """Resolve the IP location in the background (server startup)."""
+    if not LOCATION_OVERRIDE:
+        threading.Thread(target=get_current_location, daemon=True).start()
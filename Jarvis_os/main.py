@@ -1,20 +1,41 @@
+import asyncio
 import threading
 import uvicorn
 import os
+import json
+import time
 import jwt
 from dotenv import load_dotenv
 
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from jarvis_core import handle_command   # 🔥 speak_async REMOVED
+from jarvis_core import handle_command, INTENT_INDEX, PendingAIReply   # 🔥 speak_async REMOVED
+from location_service import warm_current_location
+from speech_service import SPEECH
+from asr_service import ASR_MODEL, ASR_POOL, ASRUnavailable
+from transcribe_service import TRANSCRIBE_POOL
+from chatHistory.chathistory import STORE as CHAT_STORE
+from voice.resample import Resampler
+from config.wake_words import strip_wake_word
+from ai_fallback import (
+    get_ai_response_async,
+    stream_ai_response,
+    validate_ai_content,
+    close_ai_client
+)
 
 from auth.router import router as auth_router
 from auth.historyrouter import router as history_router
 from chat.chatrouter import router as chat_router
+from admin.adminrouter import router as admin_router
+from tts.ttsrouter import router as tts_router
+from transcribe.transcriberouter import router as transcribe_router
 
 # ==============================
 # LOAD ENV
@@ -29,6 +50,17 @@ if not JWT_SECRET:
 
 security = HTTPBearer(auto_error=False)
 
+# /voice accepts PCM at these rates and resamples to 16 kHz
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 96000
+
+# per-session reply tasks (the event loop only keeps weak references)
+VOICE_TASKS = set()
+# streamed AI replies, which finish even if the client disconnects
+STREAM_TASKS = set()
+
+STREAM_ERROR_MSG = "The AI answer was interrupted. Please try again."
+
 # ==============================
 # FASTAPI APP
 # ==============================
@@ -48,6 +80,9 @@ app.add_middleware(
 app.include_router(auth_router)
 app.include_router(history_router)
 app.include_router(chat_router)
+app.include_router(admin_router)
+app.include_router(tts_router)
+app.include_router(transcribe_router)
 
 # ==============================
 # STATIC FILES
@@ -59,8 +94,18 @@ app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 # ==============================
 @app.on_event("startup")
 def startup_event():
+    INTENT_INDEX.start()   # 🔄 picks up seed_commands.py changes live
+    warm_current_location()   # 📍 ipinfo lookup off the first request
+    SPEECH.start()            # 🔊 one warm speech worker for all replies
+    ASR_MODEL.start()         # 🎙️ Vosk model loads in the background (once per process)
     print("Jarvis backend online")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_ai_client()
+    TRANSCRIBE_POOL.shutdown()
+    CHAT_STORE.flush()   # 💾 chat summaries still only in memory
+
 # ==============================
 # MODELS
 # ==============================
@@ -76,11 +121,7 @@ class CommandRequest(BaseModel):
 def root():
     return {"status": "Jarvis is running"}
 
-@app.post("/command")
-def execute_command(
-    req: CommandRequest,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-):
+def resolve_user(credentials: HTTPAuthorizationCredentials):
     user_role = "guest"
     user_name = None
 
@@ -102,15 +143,226 @@ def execute_command(
         except jwt.InvalidTokenError:
             pass
 
+    return user_role, user_name
+
+
+@app.post("/speech/cancel")
+def cancel_speech():
+    """Stop the reply being spoken and drop queued ones."""
+    SPEECH.cancel()
+    return {"status": "cancelled"}
+
+
+async def run_command(command, user_role, user_name, chat_id=None, silent=False):
+    # routing runs in the threadpool; the AI call is awaited without a thread
+    result = await run_in_threadpool(
+        handle_command,
+        command=command,
+        user_role=user_role,
+        user_name=user_name,
+        chat_id=chat_id,
+        silent=silent,
+        defer_ai=True
+    )
+
+    if isinstance(result, PendingAIReply):
+        response = await get_ai_response_async(**result.request)
+        result = await run_in_threadpool(result.finish, response)
+
+    return result
+
+@app.post("/command")
+async def execute_command(
+    req: CommandRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    user_role, user_name = resolve_user(credentials)
+
     # ✅ SILENT FLAG PASSED TO CORE
-    return handle_command(
+    return await run_command(req.command, user_role, user_name, req.chat_id, req.silent)
+
+# ==============================
+# 📡 STREAMING COMMAND (SSE)
+# ==============================
+def sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def stream_reply(pending, events):
+    """
+    Streams the AI answer onto `events` and saves the turn. Runs as its
+    own task, so a client that disconnects mid-answer still gets the
+    turn saved; an answer cut off by an error is not saved at all.
+    """
+    parts = []
+    try:
+        async for delta in stream_ai_response(**pending.request):
+            parts.append(delta)
+            events.put_nowait(("delta", delta))
+
+        response = validate_ai_content("".join(parts))
+        result = await run_in_threadpool(pending.finish, response)   # 💾 persist_chat
+        events.put_nowait(("final", result))
+    except Exception as e:
+        print("⚠️ Streamed AI reply failed:", e)
+        events.put_nowait(("error", None))
+
+async def command_events(result):
+    """
+    `delta` events carry AI text as it arrives; the closing `final` event
+    is the usual reply/intent/confidence envelope. Its reply is the
+    validated text, which can differ from the deltas if the model's
+    answer was rejected. If the answer breaks off, an `error` event
+    closes the stream instead and the partial text is discarded.
+    """
+    if isinstance(result, PendingAIReply):
+        started = time.perf_counter()
+        ttft_ms = None
+
+        events = asyncio.Queue()
+        streamer = asyncio.create_task(stream_reply(result, events))
+        STREAM_TASKS.add(streamer)
+        streamer.add_done_callback(STREAM_TASKS.discard)
+
+        while True:
+            kind, data = await events.get()
+            if kind == "error":
+                yield sse("error", {"detail": STREAM_ERROR_MSG})
+                return
+            if kind == "final":
+                break
+            if ttft_ms is None:
+                ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+            yield sse("delta", {"text": data})
+
+        result = {**data, "ttft_ms": ttft_ms}
+
+    yield sse("final", result)
+
+@app.post("/command/stream")
+async def execute_command_stream(
+    req: CommandRequest,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
+    user_role, user_name = resolve_user(credentials)
+
+    result = await run_in_threadpool(
+        handle_command,
         command=req.command,
         user_role=user_role,
         user_name=user_name,
         chat_id=req.chat_id,
-        silent=req.silent
+        silent=req.silent,
+        defer_ai=True
+    )
+
+    return StreamingResponse(
+        command_events(result),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
+# ==============================
+# 🎙️ VOICE OVER WEBSOCKET
+# ==============================
+@app.websocket("/voice")
+async def voice_socket(
+    websocket: WebSocket,
+    sample_rate: int = 16000,
+    chat_id: str | None = None,
+    token: str | None = None,
+    silent: bool = True
+):
+    """
+    Binary messages: 16-bit little-endian mono PCM at `sample_rate`.
+    Text message {"type": "end"}: the user stopped talking, finalize.
+
+    Sent back: {"type": "partial"|"final", "text"} while decoding, then
+    {"type": "reply", ...} with the handle_command result for each final
+    transcript, or {"type": "error", "detail"}.
+    Browsers can't set headers on a WebSocket, so the JWT is `token`.
+    """
+    await websocket.accept()
+
+    if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+        await websocket.send_json({"type": "error", "detail": "Unsupported sample_rate"})
+        await websocket.close(code=1003)
+        return
+
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token) if token else None
+    user_role, user_name = resolve_user(credentials)
+
+    try:
+        recognizer = await run_in_threadpool(ASR_POOL.acquire)
+    except ASRUnavailable as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1013)   # try again later
+        return
+
+    resampler = Resampler(sample_rate)
+    last_partial = ""
+    commands = asyncio.Queue()
+
+    async def reply_loop():
+        # one command at a time, in the order they were said, while the
+        # receive loop keeps decoding audio
+        while (text := await commands.get()) is not None:
+            try:
+                reply = {**await run_command(text, user_role, user_name, chat_id, silent), "type": "reply"}
+            except Exception as e:
+                print("⚠️ Voice command failed:", e)
+                reply = {"type": "error", "detail": "Command failed"}
+            try:
+                await websocket.send_json(reply)
+            except Exception:
+                pass   # client went away; the turn itself was still handled
+
+    replier = asyncio.create_task(reply_loop())
+    VOICE_TASKS.add(replier)
+    replier.add_done_callback(VOICE_TASKS.discard)
+
+    async def final(result_json):
+        text = strip_wake_word(json.loads(result_json).get("text", ""))
+        if not text:
+            return
+        await websocket.send_json({"type": "final", "text": text})
+        commands.put_nowait(text)
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes"):
+                pcm = resampler.process(message["bytes"])
+                if not pcm:
+                    continue
+
+                if await run_in_threadpool(recognizer.AcceptWaveform, pcm):
+                    last_partial = ""
+                    await final(recognizer.Result())
+                    continue
+
+                partial = json.loads(recognizer.PartialResult()).get("partial", "")
+                if partial != last_partial:
+                    last_partial = partial
+                    await websocket.send_json({"type": "partial", "text": partial})
+
+            elif message.get("text"):
+                try:
+                    control = json.loads(message["text"])
+                except ValueError:
+                    continue
+                if control.get("type") == "end":
+                    last_partial = ""
+                    await final(await run_in_threadpool(recognizer.FinalResult))
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        ASR_POOL.release(recognizer)
+        commands.put_nowait(None)   # commands already heard still run
+
 # ==============================
 # ENTRY
 # ==============================
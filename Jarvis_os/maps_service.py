@@ -1,7 +1,144 @@
+# maps_service.py
+import os
+import math
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
 from location_service import geocode, get_current_location
 from nlp_utils import extract_places
+from utils.metrics import register
+from utils.swr_cache import SWRCache
+
+load_dotenv()
+
+ORS_KEY = os.getenv("ORS_API_KEY")
+ORS_URL = "https://api.openrouteservice.org/v2"
+
+# per-call timeout for the route API; in "auto" mode calls run in the
+# background while the answer uses an estimate, so this never delays it
+ROUTE_TIMEOUT = float(os.getenv("ROUTE_TIMEOUT", "2.5"))
+
+# routes between the same (rounded) points are reused for a day;
+# 3 decimals ≈ 100 m, so two lookups of one city share an entry
+ROUTE_CACHE_TTL = float(os.getenv("ROUTE_CACHE_TTL", "86400"))
+COORD_PRECISION = 3
+
+# straight line → rough road distance / average speed for estimates
+ROAD_FACTOR = 1.3
+ESTIMATE_KMH = 50
+
+MY_LOCATION = (None, "", "my location", "current location", "here")
+
+
+# ==============================
+# 📐 GREAT-CIRCLE ESTIMATE
+# ==============================
+def haversine_km(a, b) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 12742 * math.asin(math.sqrt(h))
+
+
+def estimate_route(a, b) -> dict:
+    km = haversine_km(a, b) * ROAD_FACTOR
+    return {
+        "km": round(km, 1),
+        "mins": round(km / ESTIMATE_KMH * 60),
+        "approximate": True,
+    }
+
+
+# ==============================
+# 🚗 ROUTES (CACHED)
+# ==============================
+def route_key(a, b):
+    return (
+        round(a[0], COORD_PRECISION), round(a[1], COORD_PRECISION),
+        round(b[0], COORD_PRECISION), round(b[1], COORD_PRECISION),
+    )
+
+
+def fetch_route(key) -> dict:
+    """One OpenRouteService directions call for a route_key."""
+    src_lat, src_lon, dst_lat, dst_lon = key
+    res = requests.get(
+        f"{ORS_URL}/directions/driving-car",
+        params={
+            "api_key": ORS_KEY,
+            "start": f"{src_lon},{src_lat}",
+            "end": f"{dst_lon},{dst_lat}"
+        },
+        timeout=ROUTE_TIMEOUT
+    ).json()
+
+    summary = res["features"][0]["properties"]["summary"]
+    return {
+        "km": round(summary["distance"] / 1000, 2),
+        "mins": round(summary["duration"] / 60),
+        "approximate": False,
+    }
 
-def get_distance(query_or_source, destination=None) -> str:
+
+ROUTE_CACHE = SWRCache(fetch_route, ttl=ROUTE_CACHE_TTL, max_entries=1024)
+register("route.cache", ROUTE_CACHE.stats)
+
+
+def get_route(a, b, mode: str = "auto") -> dict:
+    """
+    mode "auto":   cached route, else an estimate right away while the
+                   route is fetched in the background for the next ask
+    mode "route":  cached / live route only (raises on failure)
+    mode "approx": great-circle estimate, no network
+    """
+    if mode == "approx" or (mode == "auto" and not ORS_KEY):
+        return estimate_route(a, b)
+
+    key = route_key(a, b)
+    if mode == "route":
+        return ROUTE_CACHE.get(key)
+
+    route = ROUTE_CACHE.peek(key)
+    if route:
+        return route
+    ROUTE_CACHE.refresh(key)
+    return estimate_route(a, b)
+
+
+def resolve_place(place, default_location=None):
+    if place in MY_LOCATION:
+        current = get_current_location(default_location)
+        if not current or not current[0]:
+            return None
+        if current[1]:
+            return current
+        # a named location without cached coordinates: geocode it now
+        found = geocode(current[0])
+        return (current[0], found[1]) if found else None
+    return geocode(place)
+
+
+def describe_route(source_name, dest_name, route) -> str:
+    if route["approximate"]:
+        return (
+            f"The distance from {source_name} to {dest_name} "
+            f"is roughly {route['km']} kilometers "
+            f"(approximate, based on straight-line distance). "
+            f"Estimated travel time is around {route['mins']} minutes."
+        )
+
+    return (
+        f"The distance from {source_name} to {dest_name} "
+        f"is about {route['km']} kilometers. "
+        f"Estimated travel time is {route['mins']} minutes."
+    )
+
+
+def get_distance(query_or_source, destination=None, default_location=None, mode="auto") -> str:
     try:
         # 🔥 Natural language mode
         if destination is None:
@@ -13,16 +150,12 @@ def get_distance(query_or_source, destination=None) -> str:
             return "Please tell me the destination."
 
         # 🔥 Handle 'my location'
-        if source in (None, "", "my location", "current location", "here"):
-            current = get_current_location()
-            if not current or not current[1]:
+        src = resolve_place(source, default_location)
+        if not src:
+            if source in MY_LOCATION:
                 return "I couldn't detect your current location."
-            source_name, source_coords = current
-        else:
-            src = geocode(source)
-            if not src:
-                return f"I couldn't find {source}."
-            source_name, source_coords = src
+            return f"I couldn't find {source}."
+        source_name, source_coords = src
 
         dst = geocode(destination)
         if not dst:
@@ -30,26 +163,124 @@ def get_distance(query_or_source, destination=None) -> str:
 
         dest_name, dest_coords = dst
 
-        # OpenRouteService
-        res = requests.get(
-            "https://api.openrouteservice.org/v2/directions/driving-car",
-            params={
-                "api_key": ORS_KEY,
-                "start": f"{source_coords[1]},{source_coords[0]}",
-                "end": f"{dest_coords[1]},{dest_coords[0]}"
-            },
-            timeout=5
-        ).json()
-
-        route = res["features"][0]["properties"]["summary"]
-        km = round(route["distance"] / 1000, 2)
-        mins = round(route["duration"] / 60)
-
-        return (
-            f"The distance from {source_name} to {dest_name} "
-            f"is about {km} kilometers. "
-            f"Estimated travel time is {mins} minutes."
-        )
+        route = get_route(source_coords, dest_coords, mode)
+        return describe_route(source_name, dest_name, route)
 
     except Exception:
         return "I was unable to calculate the distance right now."
+
+
+# ==============================
+# 🧮 DISTANCE MATRIX (ONE ORIGIN → MANY)
+# ==============================
+def fetch_matrix(origin, destinations) -> list:
+    """One OpenRouteService matrix call: origin → every destination."""
+    res = requests.post(
+        f"{ORS_URL}/matrix/driving-car",
+        headers={"Authorization": ORS_KEY},
+        json={
+            "locations": [[lon, lat] for lat, lon in [origin] + list(destinations)],
+            "sources": [0],
+            "destinations": list(range(1, len(destinations) + 1)),
+            "metrics": ["distance", "duration"],
+        },
+        timeout=ROUTE_TIMEOUT
+    ).json()
+
+    return [
+        {
+            "km": round(meters / 1000, 2),
+            "mins": round(seconds / 60),
+            "approximate": False,
+        } if meters is not None else None
+        for meters, seconds in zip(res["distances"][0], res["durations"][0])
+    ]
+
+
+def cache_matrix(origin, destinations) -> list:
+    """fetch_matrix, storing every route found in ROUTE_CACHE."""
+    routes = fetch_matrix(origin, destinations)
+    for dest, route in zip(destinations, routes):
+        if route:
+            ROUTE_CACHE.put(route_key(origin, dest), route)
+    return routes
+
+
+def refresh_matrix(origin, destinations):
+    """Background cache_matrix; a failure just leaves the estimates."""
+    try:
+        cache_matrix(origin, destinations)
+    except Exception:
+        pass
+
+
+def get_distance_matrix(origin, destinations, default_location=None, mode="auto") -> list:
+    """
+    Distances from one origin to many destinations (place names).
+
+    Cached routes are reused; the rest come from a single ORS matrix
+    call — in "auto" mode that call runs in the background and the
+    answer uses estimates until its routes are cached.
+    Returns one dict per destination: name, km, mins, approximate —
+    or name + error when a place can't be found or, in "route" mode,
+    has no road route (never an estimate, as with get_route).
+    """
+    src = resolve_place(origin, default_location)
+    if not src:
+        return [{"name": d, "error": f"I couldn't find {origin}."} for d in destinations]
+    _, origin_coords = src
+
+    with ThreadPoolExecutor(max_workers=min(8, len(destinations) or 1)) as pool:
+        places = list(pool.map(geocode, destinations))
+
+    results = [None] * len(destinations)
+    missing = []
+
+    for i, (query, place) in enumerate(zip(destinations, places)):
+        if not place:
+            results[i] = {"name": query, "error": f"I couldn't find {query}."}
+            continue
+
+        if mode == "approx" or (mode == "auto" and not ORS_KEY):
+            route = estimate_route(origin_coords, place[1])
+        else:
+            route = ROUTE_CACHE.peek(route_key(origin_coords, place[1]))
+
+        if route:
+            results[i] = {"name": place[0], **route}
+        else:
+            missing.append(i)
+
+    if not missing:
+        return results
+
+    coords = [places[i][1] for i in missing]
+
+    if mode == "auto":
+        threading.Thread(
+            target=refresh_matrix, args=(origin_coords, coords), daemon=True
+        ).start()
+        for i, dest in zip(missing, coords):
+            results[i] = {"name": places[i][0], **estimate_route(origin_coords, dest)}
+        return results
+
+    for i, route in zip(missing, cache_matrix(origin_coords, coords)):
+        name = places[i][0]
+        if route:
+            results[i] = {"name": name, **route}
+        else:
+            results[i] = {"name": name, "error": f"I couldn't find a route to {name}."}
+
+    return results
+
+
+def describe_matrix(origin_name, results) -> str:
+    parts = []
+    for r in results:
+        if "error" in r:
+            parts.append(r["error"])
+        elif r["approximate"]:
+            parts.append(f"{r['name']} is roughly {r['km']} km, around {r['mins']} minutes (approximate).")
+        else:
+            parts.append(f"{r['name']} is about {r['km']} km, {r['mins']} minutes.")
+    return f"From {origin_name}: " + " ".join(parts)
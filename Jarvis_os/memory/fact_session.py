@@ -0,0 +1,60 @@
+# memory/fact_session.py
+import json
+
+from memory.user_facts import load_user_facts, save_user_facts
+
+
+class FactSession:
+    """
+    One user's facts for the length of a request.
+
+    The fact file is read at most once (on first use). memory_facts
+    functions given `session=` work on the shared dict and only mark it
+    dirty; flush() writes once at the end, and skips the write when the
+    facts ended up unchanged.
+
+        with FactSession(user_name) as facts:
+            get_fact(user_name, "name", session=facts)
+            set_fact(user_name, "location", "Pune", session=facts)
+    """
+
+    def __init__(self, user_name):
+        self.user_name = user_name
+        self.dirty = False
+        self._facts = None
+        self._loaded_snapshot = None
+
+    @property
+    def facts(self) -> dict:
+        if self._facts is None:
+            self._facts = load_user_facts(self.user_name) if self.user_name else {}
+            self._loaded_snapshot = self._snapshot(self._facts)
+        return self._facts
+
+    @staticmethod
+    def _snapshot(facts) -> str:
+        return json.dumps(facts, sort_keys=True)
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def flush(self) -> bool:
+        """Write pending changes; returns True if the file was written."""
+        if not self.dirty or not self.user_name:
+            return False
+
+        self.dirty = False
+        snapshot = self._snapshot(self._facts)
+        if snapshot == self._loaded_snapshot:
+            return False   # changes cancelled out
+
+        save_user_facts(self.user_name, self._facts)
+        self._loaded_snapshot = snapshot
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
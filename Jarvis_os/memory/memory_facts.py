@@ -6,6 +6,21 @@ from memory.fact_patterns import FACT_QUERY_PATTERNS
 from memory.LEARN_RULES import LEARN_RULES
 from memory.CASUAL_WORDS import CASUAL_WORDS
 from memory.user_facts import load_user_facts, save_user_facts
+from memory.fact_session import FactSession
+
+
+# ==============================
+# 📂 FACT ACCESS (SESSION-AWARE)
+# ==============================
+def _load(user: str, session=None) -> dict:
+    return session.facts if session is not None else load_user_facts(user)
+
+
+def _save(user: str, facts: dict, session=None):
+    if session is not None:
+        session.mark_dirty()   # written once by session.flush()
+    else:
+        save_user_facts(user, facts)
 
 
 # ==============================
@@ -75,14 +90,13 @@ def split_preferences(text: str) -> list:
 # ==============================
 # 🔁 UPSERT FACT (GLOBAL)
 # ==============================
-def upsert_fact(user: str, key: str, value: str):
-    facts = load_user_facts(user)
+def upsert_fact(user: str, key: str, value: str, session=None):
+    facts = _load(user, session)
 
     if key in {"likes", "dislikes", "skills", "tools"}:
-        facts.setdefault(key, [])
-        if value not in facts[key]:
-            facts[key].append(value)
-            save_user_facts(user, facts)
+        if value not in facts.get(key, []):
+            facts.setdefault(key, []).append(value)
+            _save(user, facts, session)
             return "added"
         return "unchanged"
 
@@ -90,14 +104,14 @@ def upsert_fact(user: str, key: str, value: str):
         return "unchanged"
 
     facts[key] = value
-    save_user_facts(user, facts)
+    _save(user, facts, session)
     return "updated"
 
 
 # ==============================
 # 🧠 LEARN FACT (SAFE)
 # ==============================
-def learn_fact(user_name: str, text: str):
+def learn_fact(user_name: str, text: str, session=None):
     text = text.lower().strip()
 
     for pattern, key in LEARN_RULES:
@@ -107,12 +121,17 @@ def learn_fact(user_name: str, text: str):
 
             if key in {"likes", "dislikes", "skills", "tools"}:
                 items = split_preferences(raw_value)
+
+                # one write for the whole list, not one per item
+                batch = session or FactSession(user_name)
                 for item in items:
-                    upsert_fact(user_name, key, item)
+                    upsert_fact(user_name, key, item, batch)
+                if session is None:
+                    batch.flush()
                 return {"key": key, "value": items, "action": "added"}
 
             clean_value = normalize_value(raw_value)
-            action = upsert_fact(user_name, key, clean_value)
+            action = upsert_fact(user_name, key, clean_value, session)
             return {"key": key, "value": clean_value, "action": action}
 
     return None
@@ -120,8 +139,8 @@ def learn_fact(user_name: str, text: str):
 # ==============================
 # 🗑️ REMOVE FROM LIST FACT
 # ==============================
-def remove_from_fact(user: str, key: str, value: str):
-    facts = load_user_facts(user)
+def remove_from_fact(user: str, key: str, value: str, session=None):
+    facts = _load(user, session)
 
     if key not in facts or not isinstance(facts[key], list):
         return "not_found"
@@ -133,7 +152,7 @@ def remove_from_fact(user: str, key: str, value: str):
         if not facts[key]:
             del facts[key]
 
-        save_user_facts(user, facts)
+        _save(user, facts, session)
         return "removed"
 
     return "not_found"
@@ -142,7 +161,7 @@ def remove_from_fact(user: str, key: str, value: str):
 # ==============================
 # 🧠 DETECT FACT REMOVAL
 # ==============================
-def detect_fact_removal(user_name: str, text: str):
+def detect_fact_removal(user_name: str, text: str, session=None):
     text = text.lower().strip()
 
     patterns = [
@@ -158,11 +177,11 @@ def detect_fact_removal(user_name: str, text: str):
             value = normalize_value(match.group(1))
 
             # try likes first
-            if remove_from_fact(user_name, "likes", value) == "removed":
+            if remove_from_fact(user_name, "likes", value, session) == "removed":
                 return {"key": "likes", "value": value}
 
             # then dislikes
-            if remove_from_fact(user_name, "dislikes", value) == "removed":
+            if remove_from_fact(user_name, "dislikes", value, session) == "removed":
                 return {"key": "dislikes", "value": value}
 
     return None
@@ -171,16 +190,17 @@ def detect_fact_removal(user_name: str, text: str):
 # ==============================
 # 🔁 ONLY LIKE (REPLACE LIST)
 # ==============================
-def detect_only_like(user_name: str, text: str):
+def detect_only_like(user_name: str, text: str, session=None):
     match = re.search(r"i only like (.+)", text.lower())
     if not match:
         return None
 
     value = normalize_value(match.group(1))
-    facts = load_user_facts(user_name)
+    facts = _load(user_name, session)
 
-    facts["likes"] = [value]
-    save_user_facts(user_name, facts)
+    if facts.get("likes") != [value]:
+        facts["likes"] = [value]
+        _save(user_name, facts, session)
 
     return value
 
@@ -223,14 +243,14 @@ def detect_fact_query(text: str):
 # ==============================
 # 📤 GET FACT (GLOBAL)
 # ==============================
-def get_fact(user_name: str, key: str):
-    return load_user_facts(user_name).get(key)
+def get_fact(user_name: str, key: str, session=None):
+    return _load(user_name, session).get(key)
 
 
 # ==============================
 # 🔁 EXPLICIT FACT UPDATE
 # ==============================
-def detect_explicit_update(user_name: str, text: str):
+def detect_explicit_update(user_name: str, text: str, session=None):
     text = text.lower().strip()
 
     for pattern in (
@@ -241,7 +261,7 @@ def detect_explicit_update(user_name: str, text: str):
         if match:
             key = match.group(1)
             value = normalize_value(match.group(2))
-            action = upsert_fact(user_name, key, value)
+            action = upsert_fact(user_name, key, value, session)
             return {
                 "key": key,
                 "value": value,
@@ -254,8 +274,8 @@ def detect_explicit_update(user_name: str, text: str):
 # ==============================
 # 📘 MEMORY SUMMARY (GLOBAL, READ-ONLY)
 # ==============================
-def get_memory_summary(user_name: str) -> str:
-    facts = load_user_facts(user_name)
+def get_memory_summary(user_name: str, session=None) -> str:
+    facts = _load(user_name, session)
     if not facts:
         return ""
 
@@ -264,6 +284,6 @@ def get_memory_summary(user_name: str) -> str:
 # ==============================
 # 📍 SET FACT EXPLICITLY (SAFE)
 # ==============================
-def set_fact(user_name: str, key: str, value: str):
+def set_fact(user_name: str, key: str, value: str, session=None):
     clean_value = normalize_value(value)
-    return upsert_fact(user_name, key, clean_value)
+    return upsert_fact(user_name, key, clean_value, session)
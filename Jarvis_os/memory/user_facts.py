@@ -1,18 +1,120 @@
+import atexit
+import copy
 import json
 import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from uuid import uuid4
 
 BASE_DIR = "memory/user_data"
 
+# parsed facts kept in memory, validated against the file's mtime/size
+FACT_CACHE_SIZE = int(os.getenv("FACT_CACHE_SIZE", "128"))
+
+# opt-in: > 0 delays writes by this many seconds and coalesces bursts
+WRITE_BEHIND_DELAY = float(os.getenv("FACT_WRITE_BEHIND_DELAY", "0"))
+
+_cache = OrderedDict()   # user -> (mtime_ns, size, facts)
+_pending = {}            # user -> facts waiting for a write-behind flush
+_timers = {}
+_lock = threading.RLock()
+
+# per-request fact file I/O counters (see track_fact_io)
+_FACT_IO = ContextVar("fact_io", default=None)
+
+def _count(kind):
+    stats = _FACT_IO.get()
+    if stats is not None:
+        stats[kind] += 1
+
+@contextmanager
+def track_fact_io():
+    """Count fact-file reads/writes made inside the block."""
+    stats = {"reads": 0, "writes": 0}
+    token = _FACT_IO.set(stats)
+    try:
+        yield stats
+    finally:
+        _FACT_IO.reset(token)
+
 def _path(user):
     return os.path.join(BASE_DIR, f"{user}_facts.json")
 
+def _remember(user, stat, facts):
+    _cache[user] = (stat.st_mtime_ns, stat.st_size, facts)
+    _cache.move_to_end(user)
+    while len(_cache) > FACT_CACHE_SIZE:
+        _cache.popitem(last=False)
+
 def load_user_facts(user):
-    if not os.path.exists(_path(user)):
-        return {}
-    with open(_path(user), "r") as f:
-        return json.load(f)
+    """
+    Return a private copy of the user's facts. The file is only parsed
+    again when its mtime or size changed since the cached read.
+    """
+    with _lock:
+        if user in _pending:
+            return copy.deepcopy(_pending[user])
 
-def save_user_facts(user, facts):
+        path = _path(user)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            _cache.pop(user, None)
+            return {}
+
+        cached = _cache.get(user)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _cache.move_to_end(user)
+            return copy.deepcopy(cached[2])
+
+        _count("reads")
+        with open(path, "r") as f:
+            facts = json.load(f)
+
+        _remember(user, stat, facts)
+        return copy.deepcopy(facts)
+
+def _write(user, facts):
+    """Durable write: temp file, fsync, rename over the old file."""
+    _count("writes")
     os.makedirs(BASE_DIR, exist_ok=True)
-    with open(_path(user), "w") as f:
+
+    path = _path(user)
+    tmp = f"{path}.{uuid4().hex}.tmp"
+    with open(tmp, "w") as f:
         json.dump(facts, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+    _remember(user, os.stat(path), facts)
+
+def save_user_facts(user, facts):
+    facts = copy.deepcopy(facts)
+
+    with _lock:
+        if WRITE_BEHIND_DELAY <= 0:
+            _write(user, facts)
+            return
+
+        _pending[user] = facts
+        if user not in _timers:
+            timer = threading.Timer(WRITE_BEHIND_DELAY, flush_user_facts, args=(user,))
+            timer.daemon = True
+            _timers[user] = timer
+            timer.start()
+
+def flush_user_facts(user=None):
+    """Write pending write-behind updates now (one user or all)."""
+    with _lock:
+        users = [user] if user is not None else list(_pending)
+        for u in users:
+            timer = _timers.pop(u, None)
+            if timer:
+                timer.cancel()
+            if u in _pending:
+                _write(u, _pending.pop(u))
+
+atexit.register(flush_user_facts)
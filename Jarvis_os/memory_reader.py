@@ -1,16 +1,62 @@
-from rapidfuzz import fuzz
+import heapq
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
 
+from rapidfuzz import fuzz, process
+
+from ai_fallback import BAD_AI_PATTERNS, CONFIG_ERROR_MSG, EMPTY_RESPONSE_MSG, NETWORK_ERROR_MSG
+
+# never reused as a past answer: the AI fallback / error replies and
+# whatever the AI cache refuses to store
 BAD_RESPONSES = {
-    "something went wrong",
-    "i encountered an issue accessing my ai intelligence"
+    *(msg.lower().rstrip(".") for msg in (CONFIG_ERROR_MSG, NETWORK_ERROR_MSG, EMPTY_RESPONSE_MSG)),
+    *BAD_AI_PATTERNS,
 }
 
 def is_bad_response(text: str) -> bool:
     t = text.lower().strip()
     return any(bad in t for bad in BAD_RESPONSES)
 
+# ==============================
+# ⚖️ "SAME QUESTION" SCORING
+# ==============================
+# token_set_ratio scores 100 when one question's words are a subset of the
+# other's ("what is recursion" vs "what is recursion in python with
+# examples"), so questions are compared whole, in sorted word order, and
+# must have about the same number of words
+#
+# fuzzy scores stay high when one number or name differs ("25 plus 38" /
+# "25 plus 37", "australia" / "austria"), so a candidate must also have
+# exactly the query's content words: everything but STOPWORDS
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+MAX_LENGTH_DIFF = 0.2   # word counts may differ by 20% (at least one word)
+
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "am", "do", "does", "did",
+    "what", "whats", "what's", "who", "whos", "how", "why", "when", "where", "which",
+    "can", "could", "would", "will", "should", "you", "your", "i", "me", "my",
+    "please", "tell", "explain", "give", "show", "about", "of", "to", "for",
+    "in", "on", "at", "and", "or", "it", "this", "that", "s",
+}
+
+
+def word_count(text: str) -> int:
+    return len(TOKEN_RE.findall(text))
+
+
+def content_words(text: str) -> frozenset:
+    return frozenset(t for t in TOKEN_RE.findall(text) if t not in STOPWORDS)
+
+
+def similar_length(a: int, b: int) -> bool:
+    return abs(a - b) <= max(1, int(max(a, b) * MAX_LENGTH_DIFF))
+
+
 def find_past_answer(chats, user_text, min_score=80):
     user_text = user_text.lower()
+    words = word_count(user_text)
+    content = content_words(user_text)
     best_answer = None
     best_score = 0
 
@@ -27,9 +73,13 @@ def find_past_answer(chats, user_text, min_score=80):
             if is_bad_response(j["text"]):
                 continue  # 🚫 skip garbage memory
 
-            score = fuzz.token_set_ratio(
-                user_text, u["text"].lower()
-            )
+            question = u["text"].lower()
+            if not similar_length(words, word_count(question)):
+                continue
+            if content_words(question) != content:
+                continue
+
+            score = fuzz.token_sort_ratio(user_text, question)
 
             if score > best_score:
                 best_score = score
@@ -39,3 +89,190 @@ def find_past_answer(chats, user_text, min_score=80):
         return best_answer, best_score
 
     return None, 0
+
+
+# ==============================
+# 🔎 INDEXED PAST-ANSWER LOOKUP
+# ==============================
+NGRAM = 3
+SHORTLIST = 64        # candidates rescored with token_sort_ratio
+MAX_GRAMS = 16        # rarest query grams used for candidate generation
+MAX_DF_RATIO = 0.05   # grams in more than 5% of pairs barely discriminate
+
+
+def _grams(text: str) -> set:
+    tokens = TOKEN_RE.findall(text)
+    grams = {f"w:{t}" for t in tokens}
+    for t in tokens:
+        padded = f" {t} "
+        grams.update(f"c:{padded[i:i + NGRAM]}" for i in range(len(padded) - NGRAM + 1))
+    return grams
+
+
+class PastAnswerIndex:
+    """
+    Incremental inverted index over one user's user→jarvis pairs.
+
+    Postings map word tokens and character trigrams to pair ids. A query
+    collects candidates from its rarest grams, keeps a short list by
+    overlap and only rescores that list with token_sort_ratio — so lookup
+    cost follows the query, not the length of the history. Only pairs
+    with the query's exact content words are scored at all.
+    """
+
+    def __init__(self):
+        self.questions = []
+        self.answers = []
+        self.word_counts = []
+        self.contents = []
+        self.postings = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.questions)
+
+    def add(self, user_text: str, jarvis_text: str):
+        if not user_text or not jarvis_text or is_bad_response(jarvis_text):
+            return
+
+        question = user_text.lower()
+        with self._lock:
+            pair_id = len(self.questions)
+            self.questions.append(question)
+            self.answers.append(jarvis_text)
+            self.word_counts.append(word_count(question))
+            self.contents.append(content_words(question))
+            for gram in _grams(question):
+                self.postings[gram].append(pair_id)
+
+    def add_chats(self, chats):
+        for convo in chats:
+            messages = convo.get("messages", [])
+            for u, j in zip(messages, messages[1:]):
+                if u["role"] == "user" and j["role"] == "jarvis":
+                    self.add(u["text"], j["text"])
+
+    def shortlist(self, query: str, size: int = SHORTLIST) -> list:
+        with self._lock:
+            total = len(self.questions)
+            grams = [g for g in _grams(query) if g in self.postings]
+            if not grams:
+                return []
+
+            grams.sort(key=lambda g: len(self.postings[g]))
+            limit = max(1, int(total * MAX_DF_RATIO))
+            useful = [g for g in grams if len(self.postings[g]) <= limit]
+            chosen = (useful or grams)[:MAX_GRAMS]
+
+            overlap = Counter()
+            for gram in chosen:
+                # whole words count more than trigrams
+                weight = 3 if gram.startswith("w:") else 1
+                for pair_id in self.postings[gram]:
+                    overlap[pair_id] += weight
+
+        # ties → newer pairs first, like the old newest-first scan
+        ranked = heapq.nlargest(size, overlap.items(), key=lambda item: (item[1], item[0]))
+        return [pair_id for pair_id, _ in ranked]
+
+    def find(self, user_text: str, min_score: int = 80):
+        query = user_text.lower()
+        words = word_count(query)
+        content = content_words(query)
+        candidates = [
+            pair_id for pair_id in self.shortlist(query)
+            if similar_length(words, self.word_counts[pair_id])
+            and self.contents[pair_id] == content
+        ]
+        if not candidates:
+            return None, 0
+
+        best = process.extractOne(
+            query,
+            [self.questions[i] for i in candidates],
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=min_score,
+        )
+        if not best:
+            return None, 0
+
+        _, score, position = best
+        return self.answers[candidates[position]], score
+
+
+class PastAnswers:
+    """
+    Per-user PastAnswerIndex, least recently used users evicted past
+    max_users. An index is built from chat history on a background
+    thread; until it is ready, find() reports no match (the question
+    simply goes to the AI). drop() forgets a user after their history
+    was rewritten or a chat deleted; the next lookup rebuilds it.
+    """
+
+    def __init__(self, loader, max_users: int = 64):
+        self.loader = loader
+        self.max_users = max_users
+        self._indexes = OrderedDict()
+        self._building = {}       # user_id -> turns recorded while building
+        self._generation = Counter()
+        self._lock = threading.Lock()
+
+    def _build(self, user_id: str, generation: int):
+        index = PastAnswerIndex()
+        try:
+            index.add_chats(self.loader(user_id))
+        except Exception as e:
+            print("⚠️ Past answer index build failed:", e)
+            with self._lock:
+                self._building.pop(user_id, None)
+            return
+
+        with self._lock:
+            pending = self._building.pop(user_id, [])
+            if self._generation[user_id] != generation:
+                return   # dropped while building: the history changed
+
+            for user_text, jarvis_text in pending:
+                index.add(user_text, jarvis_text)
+            self._indexes[user_id] = index
+            while len(self._indexes) > self.max_users:
+                self._indexes.popitem(last=False)
+
+    def index(self, user_id: str):
+        """The user's index, or None while it is being built."""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is not None:
+                self._indexes.move_to_end(user_id)
+                return index
+
+            if user_id not in self._building:
+                self._building[user_id] = []
+                threading.Thread(
+                    target=self._build,
+                    args=(user_id, self._generation[user_id]),
+                    name="past-answers-build",
+                    daemon=True
+                ).start()
+        return None
+
+    def find(self, user_id: str, user_text: str, min_score: int = 80):
+        index = self.index(user_id)
+        if index is None:
+            return None, 0
+        return index.find(user_text, min_score)
+
+    def record(self, user_id: str, user_text: str, jarvis_text: str):
+        """Add a persisted turn; users not loaded yet pick it up on first use."""
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                if user_id in self._building:
+                    self._building[user_id].append((user_text, jarvis_text))
+                return
+        index.add(user_text, jarvis_text)
+
+    def drop(self, user_id: str):
+        with self._lock:
+            self._indexes.pop(user_id, None)
+            self._generation[user_id] += 1
@@ -0,0 +1,197 @@
+# speech_service.py
+import os
+import platform
+import subprocess
+import threading
+import time
+from collections import deque
+
+from utils.metrics import latency, counter
+
+# replies waiting to be spoken; the oldest is dropped when full
+SPEECH_QUEUE_SIZE = int(os.getenv("SPEECH_QUEUE_SIZE", "4"))
+
+# a reply that waited longer than this is no longer worth saying
+SPEECH_MAX_AGE = float(os.getenv("SPEECH_MAX_AGE", "15"))
+
+ESPEAK_ARGS = ["-v", "en-us", "-s", "145", "-a", "180"]
+
+START_LATENCY = latency("speech.start_ms")   # enqueue → handed to the synthesizer
+DROPPED = counter("speech.dropped")          # pushed out of a full queue
+STALE = counter("speech.stale")              # older than SPEECH_MAX_AGE
+COALESCED = counter("speech.coalesced")      # same text already queued
+CANCELLED = counter("speech.cancelled")
+
+
+# ==============================
+# 🔊 SYNTHESIZERS (KEPT WARM)
+# ==============================
+class EspeakSynth:
+    """
+    espeak reading from stdin. A spare process is started while the
+    previous utterance plays, so the fork/exec and voice load are off the
+    path of the next reply; the text is written to it when needed.
+    """
+
+    def __init__(self):
+        self._spare = None
+        self._current = None
+
+    def _spawn(self):
+        return subprocess.Popen(
+            ["espeak", *ESPEAK_ARGS],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+    def prepare(self):
+        if self._spare is None or self._spare.poll() is not None:
+            self._spare = self._spawn()
+
+    def start(self, text: str):
+        self.prepare()
+        self._current, self._spare = self._spare, None
+        self._current.stdin.write(text.encode("utf-8") + b"\n")
+        self._current.stdin.close()
+
+    def wait(self):
+        if self._current:
+            self._current.wait()
+            self._current = None
+        self.prepare()
+
+    def cancel(self):
+        current = self._current
+        if current and current.poll() is None:
+            current.kill()
+
+
+class PowerShellSynth:
+    """
+    One long-lived PowerShell + System.Speech process. Each stdin line is
+    spoken and acknowledged with "done"; cancel kills it and the next
+    utterance starts a fresh one.
+    """
+
+    SCRIPT = (
+        "Add-Type -AssemblyName System.Speech;"
+        "$synth = New-Object System.Speech.Synthesis.SpeechSynthesizer;"
+        "$synth.Rate = 0; $synth.Volume = 100;"
+        "while (($line = [Console]::In.ReadLine()) -ne $null) {"
+        " $synth.Speak($line); [Console]::Out.WriteLine('done'); [Console]::Out.Flush() }"
+    )
+
+    def __init__(self):
+        self._proc = None
+
+    def prepare(self):
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                ["powershell", "-NoProfile", "-Command", self.SCRIPT],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+
+    def start(self, text: str):
+        self.prepare()
+        self._proc.stdin.write(text.replace("\n", " ") + "\n")
+        self._proc.stdin.flush()
+
+    def wait(self):
+        # returns "" when the process was killed by cancel()
+        self._proc.stdout.readline()
+        self.prepare()
+
+    def cancel(self):
+        if self._proc and self._proc.poll() is None:
+            self._proc.kill()
+
+
+# ==============================
+# 🗣️ SPEECH WORKER
+# ==============================
+class SpeechWorker:
+    """
+    Single long-lived speaker: replies are queued (bounded, newest wins),
+    identical queued texts are coalesced, stale ones skipped, and
+    cancel() silences the current utterance and clears the queue.
+    """
+
+    def __init__(self, synth=None, queue_size: int = SPEECH_QUEUE_SIZE,
+                 max_age: float = SPEECH_MAX_AGE):
+        self.synth = synth or (PowerShellSynth() if platform.system() == "Windows" else EspeakSynth())
+        self.max_age = max_age
+        self.enabled = True
+
+        self._queue = deque(maxlen=queue_size)   # (enqueued_at, text)
+        self._ready = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        with self._ready:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def say(self, text: str, interrupt: bool = False):
+        if not self.enabled or not text:
+            return
+
+        self.start()
+        if interrupt:
+            self.cancel()
+
+        with self._ready:
+            if any(queued == text for _, queued in self._queue):
+                COALESCED.inc()
+                return
+            if len(self._queue) == self._queue.maxlen:
+                DROPPED.inc()
+            self._queue.append((time.perf_counter(), text))
+            self._ready.notify()
+
+    def cancel(self):
+        with self._ready:
+            self._queue.clear()
+        CANCELLED.inc()
+        self.synth.cancel()
+
+    def _next(self):
+        with self._ready:
+            while True:
+                while not self._queue:
+                    self._ready.wait()
+
+                enqueued_at, text = self._queue.popleft()
+                if time.perf_counter() - enqueued_at <= self.max_age:
+                    return enqueued_at, text
+                STALE.inc()
+
+    def _run(self):
+        try:
+            self.synth.prepare()
+        except FileNotFoundError:
+            self._disable()
+            return
+
+        while True:
+            enqueued_at, text = self._next()
+            try:
+                self.synth.start(text)
+                START_LATENCY.observe((time.perf_counter() - enqueued_at) * 1000)
+                self.synth.wait()
+            except FileNotFoundError:
+                self._disable()
+                return
+            except Exception as e:
+                print("⚠️ Speech failed:", e)
+
+    def _disable(self):
+        self.enabled = False
+        print("⚠️ No speech synthesizer found (espeak / PowerShell); replies will not be spoken")
+
+
+SPEECH = SpeechWorker()
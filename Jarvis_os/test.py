@@ -1,6 +1,5 @@
 import sounddevice as sd
 import queue
-import json
 import psutil
 import time
 import threading
@@ -9,29 +8,25 @@ import os
 import socket
 import shutil
 import pyautogui
-from vosk import Model, KaldiRecognizer
+from dotenv import load_dotenv
+
+from speech_service import SPEECH
+from asr_service import ASR_MODEL
+from voice.capture import FrameRing, EnergyVAD, SAMPLE_RATE, FRAME_SAMPLES
+from voice.commands import CommandDecoder, command_phrases
+from config.wake_words import strip_wake_word
+from voice.wake import WakeWordSpotter
+
+load_dotenv()
+
+STOP = threading.Event()
 
 # ======================================
-# WINDOWS NATIVE SPEECH (100% RELIABLE)
+# SPEECH (ONE WARM WORKER, NON-BLOCKING)
 # ======================================
 def speak(text):
     print("🤖 Jarvis:", text)
-
-    safe_text = text.replace('"', "'")
-
-    ps_script = f'''
-    Add-Type -AssemblyName System.Speech
-    $synth = New-Object System.Speech.Synthesis.SpeechSynthesizer
-    $synth.Rate = 0
-    $synth.Volume = 100
-    $synth.Speak("{safe_text}")
-    '''
-
-    subprocess.run(
-        ["powershell", "-NoProfile", "-Command", ps_script],
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.DEVNULL
-    )
+    SPEECH.say(text)
 
 # ======================================
 # SYSTEM CONTROL FUNCTIONS
@@ -141,7 +136,7 @@ def handle_command(command):
     elif "exit" in command or "stop" in command:
         speak("Shutting down. Goodbye.")
         time.sleep(1)
-        exit(0)
+        STOP.set()
 
     else:
         speak("I did not understand that command.")
@@ -157,41 +152,134 @@ def text_input_loop():
 threading.Thread(target=text_input_loop, daemon=True).start()
 
 # ======================================
-# VOICE INPUT (VOSK)
+# VOICE INPUT (VOSK, CONTINUOUS)
 # ======================================
-audio_queue = queue.Queue()
+# mic callback → FrameRing → VAD → wake-word spotter → full recognizer
+#                                                    → command worker
+AWAKE_SECONDS = 6   # after "jarvis", how long to wait for the command
+
+ring = FrameRing(seconds=10)
+commands = queue.Queue(maxsize=8)
 
 def callback(indata, frames, time_info, status):
-    audio_queue.put(bytes(indata))
+    ring.put(bytes(indata))   # never blocks the audio thread
+
+model = ASR_MODEL.get()
+spotter = WakeWordSpotter(model)
+
+# ======================================
+# COMMAND GRAMMAR (INTENT PATTERNS + VERBS)
+# ======================================
+# what handle_command understands, so these decode without Mongo too
+LOCAL_COMMANDS = [
+    "hello", "open chrome", "open vs code", "shutdown", "restart",
+    "increase volume", "take screenshot", "cpu usage", "battery status",
+    "disk space", "network status", "ram usage", "memory usage", "exit", "stop",
+]
+
+def load_intents():
+    """Intent patterns from the commands collection (hot-reloaded), or None."""
+    if not os.getenv("MONGO_URL"):
+        return None
+    try:
+        from pymongo import MongoClient
+        from intent_index import IntentIndexReloader
+
+        client = MongoClient(os.getenv("MONGO_URL"), serverSelectionTimeoutMS=3000)
+        collection = client[os.getenv("MONGO_DB")][os.getenv("MONGO_COLLECTION")]
+        return IntentIndexReloader(collection).load()
+    except Exception as e:
+        print("⚠️ Intent patterns unavailable, using built-in commands:", e)
+        return None
+
+decoder = CommandDecoder(model, command_phrases(extra=LOCAL_COMMANDS))
+
+intents = load_intents()
+if intents:
+    intents.on_reload(
+        lambda index: decoder.set_phrases(command_phrases(index.patterns, extra=LOCAL_COMMANDS))
+    )
+    intents.start()
+
+def submit(text) -> bool:
+    text = strip_wake_word(text)
+    if not text:
+        return False
+    try:
+        commands.put_nowait(text)
+    except queue.Full:
+        print("⚠️ Busy, dropped:", text)
+    return True
+
+def recognizer_loop():
+    vad = EnergyVAD()
+    awake_until = 0.0
+
+    def decode(chunk) -> bool:
+        text = decoder.feed(chunk)
+        if not text:
+            return False
+        decoder.start()
+        return submit(text)
+
+    for frame in ring:
+        chunks, ended = vad.feed(frame)
+        awake = time.monotonic() < awake_until
+
+        for chunk in chunks:
+            if not awake:
+                # 💤 cheap grammar pass until the wake word
+                if spotter.feed(chunk):
+                    print("👂 Wake word")
+                    awake = True
+                    awake_until = time.monotonic() + AWAKE_SECONDS
+                    decoder.start()
+                    for buffered in spotter.preroll():
+                        if decode(buffered):
+                            awake = False
+                continue
+
+            # ⚡ command grammar first, free-form only on [unk]
+            if decode(chunk):
+                awake = False
+
+        if ended:
+            if awake:
+                text = decoder.finish()
+                decoder.start()
+                if submit(text):
+                    awake = False
+            spotter.end_of_speech()
+
+        if not awake:
+            awake_until = 0.0
+
+def command_loop():
+    while not STOP.is_set():
+        try:
+            text = commands.get(timeout=0.5)
+        except queue.Empty:
+            continue
+        handle_command(text)
 
-model = Model("vosk-model-small-en-us-0.15")
-recognizer = KaldiRecognizer(model, 16000)
+threading.Thread(target=recognizer_loop, daemon=True).start()
+threading.Thread(target=command_loop, daemon=True).start()
 
 print("🎙️ Jarvis is listening (voice + text)...")
 speak("Hello. I am Jarvis. System is online.")
 
 # ======================================
-# VOICE LOOP
+# VOICE LOOP (STREAM OPENED ONCE)
 # ======================================
-while True:
-    stream = sd.RawInputStream(
-        samplerate=16000,
-        blocksize=8000,
-        dtype="int16",
-        channels=1,
-        callback=callback
-    )
-    stream.start()
-
-    while True:
-        data = audio_queue.get()
-        if recognizer.AcceptWaveform(data):
-            result = json.loads(recognizer.Result())
-            text = result.get("text", "").strip()
-
-            if text:
-                stream.stop()
-                stream.close()
-                handle_command(text)
-                time.sleep(0.3)
-                break
+with sd.RawInputStream(
+    samplerate=SAMPLE_RATE,
+    blocksize=FRAME_SAMPLES,
+    dtype="int16",
+    channels=1,
+    callback=callback
+):
+    STOP.wait()
+
+ring.close()
+if ring.overruns:
+    print(f"⚠️ {ring.overruns} audio frames dropped (recognizer fell behind)")
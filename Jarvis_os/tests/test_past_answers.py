@@ -0,0 +1,105 @@
+# tests/test_past_answers.py
+# run from Jarvis_os/: python -m pytest -q tests
+import time
+
+import pytest
+
+from memory_reader import PastAnswerIndex, PastAnswers, find_past_answer
+
+MIN_SCORE = 92   # jarvis_core.PAST_ANSWER_MIN_SCORE default
+
+STORED = [
+    ("what is recursion", "Recursion is a function calling itself."),
+    ("write a binary search in java", "public static int binarySearch(...)"),
+    ("what is recursion in python with examples", "def fact(n): ..."),
+]
+
+# (asked, stored question it must NOT be answered from)
+DIFFERENT_QUESTIONS = [
+    ("what is recursion in python with examples", "what is recursion"),   # superset
+    ("what is recursion", "what is recursion in python with examples"),   # subset
+    ("write a binary search in c", "write a binary search in java"),      # one word swapped
+]
+
+# (asked, stored question, its answer): one number or name differs
+ONE_DETAIL_APART = [
+    ("what is 25 plus 38", "what is 25 plus 37", "62"),
+    ("what is the capital of australia", "what is the capital of austria", "Vienna"),
+    ("convert 200 usd to inr", "convert 100 usd to inr", "8300"),
+    ("who won the 2011 world cup", "who won the 2019 world cup", "England"),
+    ("how many days until 24 december", "how many days until 25 december", "31 days"),
+]
+
+
+def chats(pairs):
+    messages = []
+    for question, answer in pairs:
+        messages += [{"role": "user", "text": question}, {"role": "jarvis", "text": answer}]
+    return [{"messages": messages}]
+
+
+@pytest.mark.parametrize("asked, stored", DIFFERENT_QUESTIONS)
+def test_subset_and_superset_questions_do_not_reuse_answers(asked, stored):
+    pairs = [pair for pair in STORED if pair[0] == stored]
+    index = PastAnswerIndex()
+    index.add_chats(chats(pairs))
+
+    assert index.find(asked, MIN_SCORE) == (None, 0)
+    assert find_past_answer(chats(pairs), asked, MIN_SCORE) == (None, 0)
+
+
+@pytest.mark.parametrize("asked, stored, answer", ONE_DETAIL_APART)
+def test_questions_one_detail_apart_do_not_reuse_answers(asked, stored, answer):
+    pairs = [(stored, answer)]
+    index = PastAnswerIndex()
+    index.add_chats(chats(pairs))
+
+    assert index.find(asked, MIN_SCORE) == (None, 0)
+    assert find_past_answer(chats(pairs), asked, MIN_SCORE) == (None, 0)
+
+
+def test_fallback_replies_are_never_reused():
+    index = PastAnswerIndex()
+    index.add_chats(chats([
+        ("what is recursion", "I need a moment to think."),
+        ("what is a closure", "My AI brain is not configured."),
+    ]))
+
+    assert len(index) == 0
+
+
+def test_each_question_gets_its_own_answer():
+    index = PastAnswerIndex()
+    index.add_chats(chats(STORED))
+
+    for question, answer in STORED:
+        assert index.find(question, MIN_SCORE)[0] == answer
+
+
+def test_rephrasing_still_matches():
+    index = PastAnswerIndex()
+    index.add_chats(chats(STORED))
+
+    answer, score = index.find("What is recursion?", MIN_SCORE)
+    assert answer == STORED[0][1] and score >= MIN_SCORE
+
+
+def wait_for_index(past, user_id):
+    for _ in range(200):
+        if past.index(user_id) is not None:
+            return
+        time.sleep(0.01)
+    raise AssertionError("index was never built")
+
+
+def test_deleted_chats_stop_answering():
+    history = {"ana": chats(STORED[:1])}
+    past = PastAnswers(lambda user_id: history[user_id])
+    wait_for_index(past, "ana")
+    assert past.find("ana", "what is recursion", MIN_SCORE)[0] == STORED[0][1]
+
+    history["ana"] = []
+    past.drop("ana")
+    assert past.find("ana", "what is recursion", MIN_SCORE) == (None, 0)
+    wait_for_index(past, "ana")
+    assert past.find("ana", "what is recursion", MIN_SCORE) == (None, 0)
@@ -1,21 +1,80 @@
 import os
 import requests
-from datetime import datetime
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dotenv import load_dotenv
-from location_service import geocode
+from location_service import geocode, cached_geocode
+from gazetteer.index import GAZETTEER, find_place, nearest_place
+from config.timezones import CITY_ALIASES, COUNTRY_TIMEZONES
 
 load_dotenv()
 
 TIMEZONEDB_KEY = os.getenv("TIMEZONEDB_API_KEY")
 
+# a geocoded place takes the zone of a bundled city of the same country
+# within this distance; further away, zone borders get too close
+NEAREST_CITY_KM = 25
+
+
+# ==============================
+# OFFLINE ZONE LOOKUP
+# ==============================
+def resolve_zone(place: str):
+    """
+    Known place name → (display name, IANA zone), no network.
+    Accepts "tokyo", "Bengaluru", "paris, france", "japan".
+    """
+    key = " ".join(place.lower().split())
+    if key in COUNTRY_TIMEZONES:
+        return key.title(), COUNTRY_TIMEZONES[key]
+
+    known = find_place(CITY_ALIASES.get(key, place))
+    return (known.name, known.zone) if known else None
+
+
+def zone_near(name: str, lat: float, lon: float):
+    """
+    IANA zone of the nearest bundled city, if it is in the same country
+    (the geocoded name's last part, "Kukatpally, Telangana, India") and
+    within NEAREST_CITY_KM.
+    """
+    if "," not in name:
+        return None
+    country = GAZETTEER.country_code(name.rsplit(",", 1)[1])
+    city = nearest_place(lat, lon, country, NEAREST_CITY_KM)
+    return city.zone if city else None
+
+
+def format_time(name: str, zone: str) -> str:
+    local_time = datetime.now(ZoneInfo(zone))
+    return f"The current time in {name} is {local_time.strftime('%H:%M')}."
+
+
 def get_time_from_timezone_db(place: str) -> str:
     try:
-        note = geocode(place)
+        # ⚡ Offline gazetteer / country table (no network)
+        known = resolve_zone(place)
+        if known:
+            return format_time(*known)
+
+        # ⚡ Already geocoded near a bundled city (no network)
+        note = cached_geocode(place)
+        if note:
+            zone = zone_near(note[0], *note[1])
+            if zone:
+                return format_time(note[0], zone)
+
+        # 🌐 Remote fallback: OpenCage (cached) + TimezoneDB
+        note = note or geocode(place)
         if not note:
             return f"I couldn't find the time for {place}."
 
         name, (lat, lon) = note
 
+        zone = zone_near(name, lat, lon)
+        if zone:
+            return format_time(name, zone)
+
         res = requests.get(
             "http://api.timezonedb.com/v2.1/get-time-zone",
             params={
@@ -31,7 +90,11 @@ def get_time_from_timezone_db(place: str) -> str:
         if res["status"] != "OK":
             return "I couldn't fetch the time right now."
 
-        local_time = datetime.utcfromtimestamp(res["timestamp"])
+        try:
+            return format_time(name, res["zoneName"])
+        except (KeyError, ZoneInfoNotFoundError):
+            # "timestamp" is already shifted to local time: read it as UTC
+            local_time = datetime.fromtimestamp(res["timestamp"], timezone.utc)
 
         return f"The current time in {name} is {local_time.strftime('%H:%M')}."
 
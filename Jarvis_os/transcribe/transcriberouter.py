@@ -0,0 +1,92 @@
+import asyncio
+import os
+from uuid import uuid4
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+
+from auth.security import get_current_user
+from jarvis_core import find_intent
+from transcribe_service import AUDIO_EXTENSIONS, TRANSCRIBE_POOL
+
+router = APIRouter(prefix="/transcribe", tags=["Transcribe"])
+
+UPLOAD_DIR = os.getenv("TRANSCRIBE_UPLOAD_DIR", "data/transcribe_uploads")
+MAX_FILE_BYTES = int(os.getenv("TRANSCRIBE_MAX_MB", "50")) * 1024 * 1024
+MAX_FILES = int(os.getenv("TRANSCRIBE_MAX_FILES", "32"))
+CHUNK_SIZE = 1024 * 1024
+
+
+async def _save(upload: UploadFile) -> str:
+    """Copy the upload to disk chunk by chunk (never whole in memory)."""
+    extension = os.path.splitext(upload.filename or "")[1].lower()
+    if extension not in AUDIO_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"{upload.filename}: expected one of {', '.join(AUDIO_EXTENSIONS)}"
+        )
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    path = os.path.join(UPLOAD_DIR, f"{uuid4().hex}{extension}")
+    size = 0
+    try:
+        with open(path, "wb") as out:
+            while chunk := await upload.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_FILE_BYTES:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"{upload.filename}: larger than {MAX_FILE_BYTES // (1024 * 1024)} MB"
+                    )
+                await run_in_threadpool(out.write, chunk)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+async def _transcribe(name: str, path: str) -> dict:
+    try:
+        # the first submit starts and warms the pool: keep it off the loop
+        future = await run_in_threadpool(TRANSCRIBE_POOL.submit, path)
+        result = await asyncio.wrap_future(future)
+    except Exception as e:
+        return {"file": name, "error": str(e)}
+
+    intent, confidence = await run_in_threadpool(find_intent, result["text"])
+    return {"file": name, **result, "intent": intent, "confidence": confidence}
+
+
+# ==============================
+# 🎧 AUDIO FILES → TRANSCRIPTS + INTENTS
+# ==============================
+@router.post("")
+async def transcribe_files(
+    files: list[UploadFile] = File(...),
+    _: dict = Depends(get_current_user)
+):
+    """
+    16-bit PCM WAV (any rate / channels) or raw 16 kHz mono .pcm files,
+    decoded in parallel on the worker processes. Intents are matched
+    only (find_intent); nothing is executed.
+    """
+    if len(files) > MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_FILES} files per request"
+        )
+
+    saved = []
+    try:
+        for upload in files:
+            saved.append((upload.filename, await _save(upload)))
+
+        results = await asyncio.gather(*(_transcribe(name, path) for name, path in saved))
+    finally:
+        for _, path in saved:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    return {"results": results, "workers": TRANSCRIBE_POOL.workers}
@@ -0,0 +1,300 @@
+# transcribe_service.py
+"""
+Batch transcription of audio files on a process pool: one Vosk model
+per worker process, files decoded in parallel across the cores.
+
+    python -m transcribe_service notes/*.wav fixtures/          # transcripts + throughput
+    python -m transcribe_service --intents fixtures/            # + matched intent
+
+WAV files may be any rate / channel count (16-bit PCM); .pcm/.raw files
+are 16-bit mono at TRANSCRIBE_RAW_RATE.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+
+from utils.metrics import register
+from voice.capture import SAMPLE_RATE
+from voice.resample import Resampler
+
+# every web worker (gunicorn.conf.py) has its own pool: by default they
+# split the cores between them instead of each taking all of them
+WEB_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+TRANSCRIBE_WORKERS = (
+    int(os.getenv("TRANSCRIBE_WORKERS", "0"))
+    or max(1, (os.cpu_count() or 1) // WEB_WORKERS)
+)
+TRANSCRIBE_RAW_RATE = int(os.getenv("TRANSCRIBE_RAW_RATE", str(SAMPLE_RATE)))
+# how long workers may take to start and load the model
+TRANSCRIBE_WARM_TIMEOUT = float(os.getenv("TRANSCRIBE_WARM_TIMEOUT", "300"))
+
+AUDIO_EXTENSIONS = (".wav", ".pcm", ".raw")
+CHUNK_SECONDS = 0.5
+
+
+# ==============================
+# 🧵 INSIDE A WORKER PROCESS
+# ==============================
+_model = None
+_model_error = None
+
+
+def _init_worker(model_path: str, statuses, ready):
+    """
+    Runs once per worker process: the model is loaded here, not per file.
+    Each worker reports (pid, load error) and then waits at the `ready`
+    barrier, so no worker takes a task until all of them have loaded.
+    """
+    global _model, _model_error
+    from vosk import Model, SetLogLevel
+
+    SetLogLevel(-1)
+    try:
+        _model = Model(model_path)
+    except Exception as e:
+        _model_error = f"Speech model failed to load: {e}"
+
+    statuses.put((os.getpid(), _model_error))
+    try:
+        ready.wait(TRANSCRIBE_WARM_TIMEOUT)
+    except Exception:
+        pass   # broken barrier: a sibling never started; run anyway
+
+
+def _pcm_chunks(path: str):
+    """(sample_rate, iterator of int16 mono PCM chunks) for a WAV/raw file."""
+    if not path.lower().endswith(".wav"):
+        rate = TRANSCRIBE_RAW_RATE
+
+        def raw():
+            with open(path, "rb") as f:
+                while chunk := f.read(int(rate * CHUNK_SECONDS) * 2):
+                    yield chunk
+
+        return rate, raw()
+
+    wav = wave.open(path, "rb")
+    if wav.getsampwidth() != 2:
+        wav.close()
+        raise ValueError("only 16-bit PCM WAV is supported")
+
+    def frames():
+        with wav:
+            channels = wav.getnchannels()
+            while chunk := wav.readframes(int(wav.getframerate() * CHUNK_SECONDS)):
+                if channels > 1:
+                    samples = np.frombuffer(chunk, dtype=np.int16).reshape(-1, channels)
+                    chunk = samples.mean(axis=1).astype(np.int16).tobytes()
+                yield chunk
+
+    return wav.getframerate(), frames()
+
+
+def transcribe_file(path: str) -> dict:
+    """Decode one file with this worker's model."""
+    from vosk import KaldiRecognizer
+
+    if _model is None:
+        raise RuntimeError(_model_error or "Speech model not loaded")
+
+    started = time.perf_counter()
+    rate, chunks = _pcm_chunks(path)
+    resampler = Resampler(rate)
+    recognizer = KaldiRecognizer(_model, SAMPLE_RATE)
+
+    words = []
+    samples = 0
+    for chunk in chunks:
+        samples += len(chunk) // 2
+        pcm = resampler.process(chunk)
+        if pcm and recognizer.AcceptWaveform(pcm):
+            words += json.loads(recognizer.Result()).get("text", "").split()
+    words += json.loads(recognizer.FinalResult()).get("text", "").split()
+
+    return {
+        "text": " ".join(words),
+        "audio_s": round(samples / rate, 3),
+        "decode_s": round(time.perf_counter() - started, 3),
+        "worker": os.getpid(),
+    }
+
+
+def _noop(_=None):
+    return None
+
+
+# ==============================
+# 🏭 POOL (IN THE SERVER / CLI)
+# ==============================
+class TranscribePool:
+    """
+    ProcessPoolExecutor with TRANSCRIBE_WORKERS processes, started and
+    warmed (every worker's model loaded) on first use.
+    "spawn" workers: the server process has threads, which fork would
+    copy in whatever state they were in. Workers import this module (not
+    asr_service, so no second, unused model) plus, as with any spawned
+    worker, the launching script: under `python main.py` that is the app,
+    once per worker at start-up; `uvicorn main:app` avoids it.
+    """
+
+    def __init__(self, workers: int = TRANSCRIBE_WORKERS, model_path: str = None):
+        self.workers = workers
+        self.model_path = model_path
+        self._executor = None
+        self._lock = threading.Lock()
+        self.load_errors = []
+
+        self.files = 0
+        self.audio_s = 0.0
+        self.decode_s = 0.0
+        self.errors = 0
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._start()
+            return self._executor
+
+    def _start(self) -> ProcessPoolExecutor:
+        if self.model_path is None:
+            from asr_service import VOSK_MODEL_PATH
+            self.model_path = VOSK_MODEL_PATH
+
+        context = get_context("spawn")
+        statuses = context.Queue()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.model_path, statuses, context.Barrier(self.workers))
+        )
+
+        # workers are spawned on demand, one per submit with none idle;
+        # the barrier keeps them all busy until every one has loaded
+        warmups = [executor.submit(_noop) for _ in range(self.workers)]
+        errors = set()
+        for _ in range(self.workers):
+            _, error = statuses.get(timeout=TRANSCRIBE_WARM_TIMEOUT)
+            if error:
+                errors.add(error)
+        for future in warmups:
+            future.result()
+
+        self.load_errors = sorted(errors)
+        for error in self.load_errors:
+            print("⚠️ Transcribe worker:", error)
+        return executor
+
+    def warm(self) -> list:
+        """Start every worker (each loads the model); their load errors."""
+        self.executor
+        return self.load_errors
+
+    def submit(self, path: str):
+        future = self.executor.submit(transcribe_file, path)
+        future.add_done_callback(self._record)
+        return future
+
+    def _record(self, future):
+        with self._lock:
+            if future.cancelled() or future.exception():
+                self.errors += 1
+                return
+            result = future.result()
+            self.files += 1
+            self.audio_s += result["audio_s"]
+            self.decode_s += result["decode_s"]
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "started": self._executor is not None,
+                "files": self.files,
+                "errors": self.errors,
+                "audio_s": round(self.audio_s, 1),
+                "decode_s": round(self.decode_s, 1),
+                # per worker; multiply by workers for the pool's ceiling
+                "realtime_factor": round(self.audio_s / self.decode_s, 2) if self.decode_s else None,
+            }
+
+
+TRANSCRIBE_POOL = TranscribePool()
+register("transcribe.pool", TRANSCRIBE_POOL.stats)
+
+
+# ==============================
+# 🖥️ CLI
+# ==============================
+def audio_files(args):
+    for arg in args:
+        if os.path.isdir(arg):
+            for name in sorted(os.listdir(arg)):
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    yield os.path.join(arg, name)
+        else:
+            yield arg
+
+
+def main(args):
+    with_intents = "--intents" in args
+    paths = list(audio_files(arg for arg in args if arg != "--intents"))
+    if not paths:
+        print(__doc__)
+        sys.exit(1)
+
+    find_intent = None
+    if with_intents:
+        from jarvis_core import find_intent
+
+    print(f"🎙️ {len(paths)} files on {TRANSCRIBE_POOL.workers} workers")
+
+    # worker start-up (model load) is timed separately from decoding
+    started = time.perf_counter()
+    TRANSCRIBE_POOL.warm()   # prints any model load errors
+    print(f"⏱️ pool ready in {time.perf_counter() - started:.1f} s")
+
+    started = time.perf_counter()
+    futures = [(path, TRANSCRIBE_POOL.submit(path)) for path in paths]
+    audio_s = 0.0
+
+    for path, future in futures:
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"❌ {path}: {e}")
+            continue
+
+        audio_s += result["audio_s"]
+        line = f"✅ {path} ({result['audio_s']:.1f} s): {result['text']}"
+        if find_intent:
+            intent, score = find_intent(result["text"])
+            line += f"  → {intent} ({score})"
+        print(line)
+
+    wall_s = time.perf_counter() - started
+    TRANSCRIBE_POOL.shutdown()
+
+    print(
+        f"\n📈 {audio_s:.1f} s of audio in {wall_s:.1f} s wall: "
+        f"{audio_s / wall_s if wall_s else 0:.1f} audio-s per wall-s "
+        f"({TRANSCRIBE_POOL.workers} workers)"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
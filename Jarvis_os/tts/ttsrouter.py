@@ -0,0 +1,56 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from tts_service import tts_stream
+
+router = APIRouter(prefix="/tts", tags=["TTS"])
+
+VOICE_PATTERN = r"^[A-Za-z0-9+\-]{1,32}$"   # espeak voice names: en-us, en+f3, hi
+
+
+class TTSRequest(BaseModel):
+    text: str = Field(min_length=1, max_length=1000)
+    voice: str = Field(default="en-us", pattern=VOICE_PATTERN)
+    speed: int = Field(default=145, ge=80, le=450)
+    pitch: int = Field(default=50, ge=0, le=99)
+
+
+async def _respond(req: TTSRequest):
+    try:
+        hit, chunks = await run_in_threadpool(
+            tts_stream, req.text, req.voice, req.speed, req.pitch
+        )
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Speech synthesis is not available on this server"
+        )
+
+    return StreamingResponse(
+        chunks,
+        media_type="audio/wav",
+        headers={
+            "X-TTS-Cache": "hit" if hit else "miss",
+            "Cache-Control": "public, max-age=86400",
+        }
+    )
+
+
+# ==============================
+# 🔊 TEXT → WAV (GET: usable as <audio src>)
+# ==============================
+@router.get("")
+async def tts_get(
+    text: str = Query(min_length=1, max_length=1000),
+    voice: str = Query(default="en-us", pattern=VOICE_PATTERN),
+    speed: int = Query(default=145, ge=80, le=450),
+    pitch: int = Query(default=50, ge=0, le=99),
+):
+    return await _respond(TTSRequest(text=text, voice=voice, speed=speed, pitch=pitch))
+
+
+@router.post("")
+async def tts_post(req: TTSRequest):
+    return await _respond(req)
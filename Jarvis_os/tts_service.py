@@ -0,0 +1,181 @@
+# tts_service.py
+import hashlib
+import json
+import os
+import struct
+import subprocess
+import threading
+from uuid import uuid4
+
+from utils.metrics import register
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "data/tts_cache")
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+CHUNK_SIZE = 8192
+WAV_HEADER_SIZE = 44   # espeak writes the canonical 44-byte PCM header
+
+
+class TTSCache:
+    """
+    Content-addressed WAV files: the name is the sha256 of the text and
+    voice settings, so the same phrase is synthesized once. Reads bump
+    the file's mtime; the least recently used files are deleted when the
+    directory grows past max_bytes.
+    """
+
+    def __init__(self, base_dir: str, max_bytes: int):
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str, **settings) -> str:
+        blob = json.dumps({"text": text, **settings}, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.base_dir, f"{key}.wav")
+
+    def _files(self):
+        for name in os.listdir(self.base_dir):
+            if name.endswith(".wav"):
+                path = os.path.join(self.base_dir, name)
+                yield path, os.stat(path)
+
+    def _ensure(self):
+        if self._size is None:
+            os.makedirs(self.base_dir, exist_ok=True)
+            self._size = sum(stat.st_size for _, stat in self._files())
+
+    def get(self, key: str):
+        """Path of the cached WAV (and mark it used), or None."""
+        path = self.path(key)
+        with self._lock:
+            self._ensure()
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return path
+
+    def temp_path(self) -> str:
+        with self._lock:
+            self._ensure()
+        return os.path.join(self.base_dir, f"{uuid4().hex}.tmp")
+
+    def commit(self, key: str, tmp: str):
+        final = self.path(key)
+        with self._lock:
+            self._ensure()
+            # two requests for one phrase can both synthesize it: the
+            # second replaces the first, which is already counted
+            try:
+                replaced = os.path.getsize(final)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, final)
+            self._size += os.path.getsize(final) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        files = sorted(self._files(), key=lambda item: item[1].st_mtime)
+        for path, stat in files:
+            if self._size <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self._size -= stat.st_size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "bytes": self._size or 0,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+TTS_CACHE = TTSCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES)
+register("tts.cache", TTS_CACHE.stats)
+
+
+def _fix_wav_sizes(path: str):
+    """espeak streams with placeholder sizes; write the real ones."""
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        if f.read(4) != b"RIFF":
+            return
+        f.seek(4)
+        f.write(struct.pack("<I", size - 8))
+        f.seek(WAV_HEADER_SIZE - 4)
+        f.write(struct.pack("<I", size - WAV_HEADER_SIZE))
+
+
+def _read_file(f):
+    with f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def _synthesize(key: str, proc):
+    tmp = TTS_CACHE.temp_path()
+    done = False
+    try:
+        with open(tmp, "wb") as out:
+            while chunk := proc.stdout.read1(CHUNK_SIZE):
+                out.write(chunk)
+                yield chunk
+
+        done = proc.wait() == 0
+        if done:
+            _fix_wav_sizes(tmp)
+            TTS_CACHE.commit(key, tmp)
+
+    finally:
+        # client went away or espeak failed: nothing partial is cached
+        if proc.poll() is None:
+            proc.kill()
+        if not done and os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def tts_stream(text: str, voice: str = "en-us", speed: int = 145, pitch: int = 50):
+    """
+    (cache_hit, iterator of WAV bytes). A miss streams espeak's output as
+    it is produced and stores the finished file for next time.
+    Raises FileNotFoundError when espeak is not installed.
+    """
+    key = TTS_CACHE.key(text, voice=voice, speed=speed, pitch=pitch)
+
+    path = TTS_CACHE.get(key)
+    if path:
+        try:
+            return True, _read_file(open(path, "rb"))
+        except FileNotFoundError:
+            pass   # evicted in between: synthesize again
+
+    proc = subprocess.Popen(
+        ["espeak", "--stdout", "-v", voice, "-s", str(speed), "-p", str(pitch)],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+    proc.stdin.write(text.encode("utf-8"))
+    proc.stdin.close()
+
+    return False, _synthesize(key, proc)
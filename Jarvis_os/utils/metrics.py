@@ -0,0 +1,90 @@
+# utils/metrics.py
+"""
+Tiny in-process metrics registry, exposed by GET /admin/metrics.
+
+    TTFT = latency("ai.stream.ttft_ms")
+    TTFT.observe(123.4)
+
+    register("weather.cache", weather_cache.stats)   # any dict-returning callable
+"""
+import threading
+from collections import deque
+
+_lock = threading.Lock()
+_latencies = {}
+_counters = {}
+_providers = {}
+
+
+class LatencyStat:
+    def __init__(self, window: int = 500):
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.count += 1
+            self.total += value
+            self.recent.append(value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = sorted(self.recent)
+
+        if not recent:
+            return {"count": self.count}
+
+        def pct(p):
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))], 3)
+
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3),
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "max": round(recent[-1], 3),
+        }
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+
+def latency(name: str) -> LatencyStat:
+    with _lock:
+        return _latencies.setdefault(name, LatencyStat())
+
+
+def counter(name: str) -> Counter:
+    with _lock:
+        return _counters.setdefault(name, Counter())
+
+
+def register(name: str, provider):
+    """Expose a callable returning a dict (e.g. cache stats)."""
+    with _lock:
+        _providers[name] = provider
+
+
+def snapshot() -> dict:
+    with _lock:
+        latencies = dict(_latencies)
+        counters = dict(_counters)
+        providers = dict(_providers)
+
+    data = {name: stat.snapshot() for name, stat in latencies.items()}
+    data.update({name: c.value for name, c in counters.items()})
+    for name, provider in providers.items():
+        try:
+            data[name] = provider()
+        except Exception as e:
+            data[name] = {"error": str(e)}
+    return data
@@ -0,0 +1,152 @@
+# utils/swr_cache.py
+"""
+TTL cache with request coalescing and stale-while-revalidate.
+
+    cache = SWRCache(fetch_weather, ttl=600, stale_ttl=1800)
+    data = cache.get("hyderabad")
+
+- fresh entry (age < ttl)            → returned as is
+- stale entry (ttl <= age < ttl+stale_ttl) → returned at once, refreshed
+                                       in a background thread
+- missing / too old                  → fetched; concurrent callers for the
+                                       same key wait for that one fetch
+
+Errors raised by `fetch` reach every waiting caller and are not cached,
+neither are values rejected by `cacheable`.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SWRCache:
+    def __init__(self, fetch, ttl: float, stale_ttl: float = 0,
+                 max_entries: int = 256, cacheable=None):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.cacheable = cacheable or (lambda value: value is not None)
+
+        self._entries = OrderedDict()   # key -> (fetched_at, value)
+        self._flights = {}              # key -> _Flight
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+
+    def _store(self, key, value):
+        if not self.cacheable(value):
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _run(self, key, flight):
+        with self._lock:
+            self.upstream_calls += 1
+        try:
+            flight.value = self.fetch(key)
+            self._store(key, flight.value)
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self.upstream_errors += 1
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _refresh(self, key):
+        """Start a background fetch unless one is already running."""
+        flight = _Flight()
+        self._flights[key] = flight
+        threading.Thread(target=self._run, args=(key, flight), daemon=True).start()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                age = time.monotonic() - entry[0]
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    if key not in self._flights:
+                        self._refresh(key)
+                    return entry[1]
+
+            self.misses += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+            else:
+                self.coalesced += 1
+
+        if leader:
+            self._run(key, flight)
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def peek(self, key):
+        """Cached value (fresh or stale) without fetching; None if absent."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and time.monotonic() - entry[0] < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            return None
+
+    def refresh(self, key):
+        """Fetch `key` in the background (no-op if a fetch is in flight)."""
+        with self._lock:
+            if key not in self._flights:
+                self.misses += 1
+                self._refresh(key)
+
+    def put(self, key, value):
+        """Store a value fetched elsewhere (e.g. by a batch call)."""
+        self._store(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.hits + self.stale_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "coalesced": self.coalesced,
+                "upstream_calls": self.upstream_calls,
+                "upstream_errors": self.upstream_errors,
+            }
@@ -0,0 +1,164 @@
+# voice/capture.py
+"""
+Building blocks for continuous microphone capture.
+
+    ring = FrameRing(seconds=10)          # filled by the audio callback
+    vad = EnergyVAD()
+    for frame in ring:                     # recognizer worker
+        chunks, ended = vad.feed(frame)
+        ...
+
+Frames are raw 16-bit mono PCM at SAMPLE_RATE, FRAME_MS long.
+"""
+import os
+import threading
+from collections import deque
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 100
+FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+
+# speech = this many dB above the running noise floor (and above the floor)
+VAD_MARGIN_DB = float(os.getenv("VAD_MARGIN_DB", "10"))
+VAD_MIN_DB = float(os.getenv("VAD_MIN_DB", "-50"))
+
+
+class FrameRing:
+    """
+    Bounded frame buffer between the audio callback and a consumer.
+    put() never blocks (the callback must not); when the consumer falls
+    behind, the oldest frames are overwritten and counted in `overruns`.
+    """
+
+    def __init__(self, seconds: float = 10):
+        self._frames = deque(maxlen=max(1, int(seconds * 1000 / FRAME_MS)))
+        self._ready = threading.Condition()
+        self._closed = False
+        self.overruns = 0
+
+    def put(self, frame: bytes):
+        with self._ready:
+            if len(self._frames) == self._frames.maxlen:
+                self.overruns += 1
+            self._frames.append(frame)
+            self._ready.notify()
+
+    def get(self, timeout: float = None):
+        """Next frame, or None on timeout / after close()."""
+        with self._ready:
+            if not self._frames and not self._closed:
+                self._ready.wait(timeout)
+            return self._frames.popleft() if self._frames else None
+
+    def close(self):
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+
+    def __iter__(self):
+        while True:
+            frame = self.get()
+            if frame is None:
+                if self._closed:
+                    return
+                continue
+            yield frame
+
+
+def frame_db(frame: bytes) -> float:
+    """RMS level of an int16 frame in dBFS (silence ≈ -90)."""
+    samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+    if not samples.size:
+        return -90.0
+    rms = np.sqrt(np.mean(samples * samples)) / 32768.0
+    return float(20 * np.log10(max(rms, 3e-5)))
+
+
+class EnergyVAD:
+    """
+    Energy gate in front of the recognizer.
+
+    Silence is not decoded at all. When speech starts, the last
+    `preroll_ms` of audio is replayed so the first syllable isn't lost;
+    after speech, up to `hangover_ms` of silence is still passed through
+    (word endings, recognizer endpointing) and then `ended` is reported
+    once so the caller can finalize the utterance.
+
+    The noise floor is learned from non-speech frames only, so a long
+    sentence can't raise it. Sound that stays "speech" for longer than
+    `max_utterance_ms` (a fan switched on, a noisy room at start-up) ends
+    the utterance and becomes the new floor.
+    """
+
+    def __init__(self, preroll_ms: int = 300, hangover_ms: int = 600,
+                 margin_db: float = VAD_MARGIN_DB, min_db: float = VAD_MIN_DB,
+                 max_utterance_ms: int = 15000):
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.hangover = max(1, hangover_ms // FRAME_MS)
+        self.max_frames = max(1, max_utterance_ms // FRAME_MS)
+        self.preroll = deque(maxlen=max(1, preroll_ms // FRAME_MS))
+
+        self.noise_db = min_db - margin_db
+        self.active = False
+        self._silent_run = 0
+        self._active_run = 0
+
+        self.frames_in = 0
+        self.frames_skipped = 0
+
+    def is_speech(self, level: float) -> bool:
+        return level > max(self.noise_db + self.margin_db, self.min_db)
+
+    def feed(self, frame: bytes):
+        """(frames to decode now, utterance ended)."""
+        self.frames_in += 1
+        level = frame_db(frame)
+        speech = self.is_speech(level)
+
+        if not speech:
+            # falls quickly to quiet frames, creeps up under constant noise
+            rate = 0.3 if level < self.noise_db else 0.05
+            self.noise_db += rate * (level - self.noise_db)
+
+        if not self.active:
+            if not speech:
+                self.preroll.append(frame)
+                self.frames_skipped += 1
+                return [], False
+
+            self.active = True
+            self._silent_run = 0
+            self._active_run = 1
+            chunks = list(self.preroll) + [frame]
+            self.preroll.clear()
+            return chunks, False
+
+        self._active_run += 1
+        if self._active_run > self.max_frames:
+            # nobody talks this long without a pause: it's the room
+            self.noise_db = level
+            self.active = False
+            self.frames_skipped += 1
+            return [], True
+
+        if speech:
+            self._silent_run = 0
+            return [frame], False
+
+        self._silent_run += 1
+        if self._silent_run <= self.hangover:
+            return [frame], False
+
+        self.active = False
+        self.preroll.append(frame)
+        self.frames_skipped += 1
+        return [], True
+
+    def reset(self):
+        self.active = False
+        self._silent_run = 0
+        self._active_run = 0
+        self.preroll.clear()
@@ -0,0 +1,100 @@
+# voice/commands.py
+import json
+import threading
+import time
+
+from vosk import KaldiRecognizer
+
+from config.command_verbs import COMMAND_VERBS
+from config.wake_words import WAKE_WORDS
+from utils.metrics import counter, latency
+from voice.capture import SAMPLE_RATE
+from voice.grammar import UNK, build_grammar
+
+CONSTRAINED = counter("voice.command.constrained")   # answered by the grammar pass
+FALLBACK = counter("voice.command.fallback")         # [unk] → decoded again free-form
+FALLBACK_LATENCY = latency("voice.command.fallback_ms")
+
+
+def command_phrases(patterns=(), verbs=COMMAND_VERBS, extra=()) -> list:
+    """
+    Grammar entries for command mode: the intent patterns, each verb on
+    its own (so "open <something unknown>" decodes as "open [unk]" and
+    falls back instead of being forced onto a pattern) and the wake
+    words, which are still in the pre-roll audio.
+    """
+    return [*WAKE_WORDS, *patterns, *sorted(verbs), *extra]
+
+
+class CommandDecoder:
+    """
+    Decodes one utterance after the wake word in two passes.
+
+    The constrained recognizer (grammar = known commands) runs on the
+    live audio, which is also kept. Only when its result contains [unk]
+    is the utterance decoded again by the full-vocabulary recognizer.
+
+    set_phrases() compiles the new grammar on the caller's thread (the
+    intent reloader) and it takes effect at the next start(), so an
+    utterance in progress is never switched mid-way.
+    """
+
+    def __init__(self, model, phrases=()):
+        self.model = model
+        self.full = KaldiRecognizer(model, SAMPLE_RATE)
+        self.constrained = None
+        self.grammar_size = 0
+
+        self._pending = None
+        self._lock = threading.Lock()
+        self._audio = []
+
+        self.set_phrases(phrases)
+        self.start()
+
+    def set_phrases(self, phrases):
+        grammar = build_grammar(self.model, phrases)
+        recognizer = KaldiRecognizer(self.model, SAMPLE_RATE, grammar)
+        with self._lock:
+            self._pending = recognizer
+            self.grammar_size = len(json.loads(grammar)) - 1
+
+    def start(self):
+        """Begin a new utterance."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            self.constrained = pending
+        else:
+            self.constrained.Reset()
+        self._audio = []
+
+    def feed(self, chunk: bytes) -> str:
+        """Transcript once the recognizer finalizes a phrase, else ""."""
+        self._audio.append(chunk)
+        if self.constrained.AcceptWaveform(chunk):
+            return self._decide(self.constrained.Result())
+        return ""
+
+    def finish(self) -> str:
+        """End of speech: transcript of whatever was said."""
+        return self._decide(self.constrained.FinalResult())
+
+    def _decide(self, result_json: str) -> str:
+        words = json.loads(result_json).get("text", "").split()
+        if not words:
+            self._audio = []   # silence endpoint, nothing to re-decode
+            return ""
+
+        if UNK not in words:
+            CONSTRAINED.inc()
+            return " ".join(words)
+
+        FALLBACK.inc()
+        started = time.perf_counter()
+        self.full.Reset()
+        for chunk in self._audio:
+            self.full.AcceptWaveform(chunk)
+        text = json.loads(self.full.FinalResult()).get("text", "")
+        FALLBACK_LATENCY.observe((time.perf_counter() - started) * 1000)
+        return text
@@ -0,0 +1,48 @@
+# voice/grammar.py
+import json
+import re
+
+UNK = "[unk]"
+
+
+def clean_phrase(text: str) -> str:
+    """Lowercase words only: what a Vosk grammar entry may contain."""
+    return " ".join(re.sub(r"[^a-z' ]+", " ", text.lower()).split())
+
+
+def build_grammar(model, phrases) -> str:
+    """
+    JSON grammar for KaldiRecognizer(model, rate, grammar).
+
+    Phrases with a word the model's lexicon doesn't know are left out
+    (Vosk would only warn and drop the word), duplicates removed, and
+    "[unk]" appended so out-of-grammar speech decodes as [unk] instead
+    of being forced onto the nearest phrase.
+    """
+    known = {}
+    entries = []
+
+    for phrase in phrases:
+        phrase = clean_phrase(phrase)
+        if not phrase or phrase in entries:
+            continue
+
+        words = phrase.split()
+        for word in words:
+            if word not in known:
+                known[word] = model.vosk_model_find_word(word) != -1
+        if all(known[word] for word in words):
+            entries.append(phrase)
+
+    return json.dumps(entries + [UNK])
+
+
+def result_text(result_json: str) -> str:
+    """Text of a Result()/FinalResult() with [unk] tokens removed."""
+    text = json.loads(result_json).get("text", "")
+    return " ".join(word for word in text.split() if word != UNK)
+
+
+def partial_text(partial_json: str) -> str:
+    text = json.loads(partial_json).get("partial", "")
+    return " ".join(word for word in text.split() if word != UNK)
@@ -0,0 +1,73 @@
+# voice/resample.py
+import numpy as np
+
+from voice.capture import SAMPLE_RATE
+
+# anti-aliasing filter: pass up to 90% of the output Nyquist frequency
+CUTOFF = 0.9
+TAPS_PER_STEP = 16   # filter length grows with the decimation ratio
+
+
+def lowpass_taps(step: float) -> np.ndarray:
+    """Windowed-sinc FIR (Blackman) for decimating by `step`."""
+    half = int(TAPS_PER_STEP * step / 2)
+    n = np.arange(-half, half + 1)
+    cutoff = CUTOFF / step   # fraction of the input Nyquist frequency
+    taps = cutoff * np.sinc(cutoff * n) * np.blackman(len(n))
+    return (taps / taps.sum()).astype(np.float32)
+
+
+class Resampler:
+    """
+    Streaming int16 mono resampler: when downsampling, a FIR low-pass
+    first removes what the output rate can't represent (a 10 kHz tone
+    at 48 kHz would otherwise fold to 6 kHz, inside the speech band),
+    then np.interp interpolates at the output rate.
+
+    Chunks can be any length: the filter history, the last input sample
+    and the fractional read position are carried over, so the output is
+    the same samples (to rounding) as resampling the whole stream at once.
+    """
+
+    def __init__(self, rate_in: int, rate_out: int = SAMPLE_RATE):
+        self.rate_in = rate_in
+        self.rate_out = rate_out
+        self.step = rate_in / rate_out
+        self._taps = lowpass_taps(self.step) if self.step > 1 else None
+        # the filter starts on (len - 1) samples of silence
+        self._history = np.zeros(0 if self._taps is None else len(self._taps) - 1, dtype=np.float32)
+        self._tail = np.empty(0, dtype=np.float32)
+        self._pos = 0.0   # next output position, relative to _tail[0]
+        self._odd = b""   # half a sample left from the previous chunk
+
+    def process(self, pcm: bytes) -> bytes:
+        pcm = self._odd + pcm
+        whole = len(pcm) // 2 * 2
+        pcm, self._odd = pcm[:whole], pcm[whole:]
+
+        if self.rate_in == self.rate_out:
+            return pcm
+
+        fresh = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+        if self._taps is not None:
+            padded = np.concatenate([self._history, fresh])
+            if len(self._history):
+                self._history = padded[-len(self._history):]
+            fresh = np.convolve(padded, self._taps, mode="valid").astype(np.float32)
+
+        samples = np.concatenate([self._tail, fresh])
+        last = len(samples) - 1
+        if last < self._pos:
+            self._tail = samples
+            return b""
+
+        count = int((last - self._pos) // self.step) + 1
+        positions = self._pos + self.step * np.arange(count)
+        out = np.interp(positions, np.arange(len(samples)), samples)
+
+        next_pos = self._pos + self.step * count
+        keep = min(int(next_pos), len(samples))
+        self._tail = samples[keep:]
+        self._pos = next_pos - keep
+
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16).tobytes()
@@ -0,0 +1,55 @@
+# voice/wake.py
+import time
+from collections import deque
+
+from vosk import KaldiRecognizer
+
+from config.wake_words import WAKE_WORDS
+from voice.capture import SAMPLE_RATE, FRAME_MS
+from voice.grammar import build_grammar, partial_text, result_text
+
+
+class WakeWordSpotter:
+    """
+    Always-on keyword spotter: a KaldiRecognizer whose grammar is only
+    the wake words plus [unk], so decoding is a handful of paths instead
+    of the full vocabulary. Partial results are checked too, so it fires
+    as soon as "jarvis" is decoded rather than at the end of the phrase.
+
+    The last `preroll_ms` of audio is kept; after a wake, preroll() hands
+    it to the full recognizer so "jarvis open chrome" said in one breath
+    keeps its first command words.
+    """
+
+    def __init__(self, model, words=WAKE_WORDS, preroll_ms: int = 1500):
+        self.words = tuple(words)
+        self.recognizer = KaldiRecognizer(model, SAMPLE_RATE, build_grammar(model, self.words))
+        self._preroll = deque(maxlen=max(1, preroll_ms // FRAME_MS))
+        self.fired_at = None
+
+    def _heard(self, text: str) -> bool:
+        return any(word in text for word in self.words)
+
+    def feed(self, frame: bytes) -> bool:
+        """True when a wake word was just heard."""
+        self._preroll.append(frame)
+
+        if self.recognizer.AcceptWaveform(frame):
+            text = result_text(self.recognizer.Result())
+        else:
+            text = partial_text(self.recognizer.PartialResult())
+
+        if text and self._heard(text):
+            self.recognizer.Reset()
+            self.fired_at = time.perf_counter()
+            return True
+        return False
+
+    def end_of_speech(self):
+        """VAD saw silence: start the next phrase from a clean state."""
+        self.recognizer.Reset()
+
+    def preroll(self) -> list:
+        frames = list(self._preroll)
+        self._preroll.clear()
+        return frames
@@ -4,7 +4,6 @@ import time
 import os
 
 API_URL = "http://127.0.0.1:8000/command"
-WAKE_WORDS = ("hey jarvis", "hello jarvis", "jarvis")
 
 recognizer = sr.Recognizer()
 microphone = sr.Microphone()
@@ -5,10 +5,21 @@ import requests
 from dotenv import load_dotenv
 from rapidfuzz import process, fuzz
 
+from location_service import cached_geocode
+from gazetteer.index import find_place
+from utils.metrics import register
+from utils.swr_cache import SWRCache
+
 load_dotenv()
 
 API_KEY = os.getenv("WEATHER_API_KEY")
 
+# current conditions change slowly: serve cached for WEATHER_CACHE_TTL,
+# then (up to WEATHER_STALE_TTL longer) serve stale and refresh behind
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", "1800"))
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", "256"))
+
 # Known cities for fuzzy correction (expand anytime)
 KNOWN_CITIES = [
     "Hyderabad", "Bangalore", "Chennai", "Delhi", "Mumbai",
@@ -34,7 +45,12 @@ COUNTRY_HINTS = {
 def normalize_city(city: str) -> str:
     """
     Fuzzy-correct city spelling
+    (bundled gazetteer first, then the KNOWN_CITIES list)
     """
+    place = find_place(city)
+    if place:
+        return place.name
+
     match, score, _ = process.extractOne(
         city,
         KNOWN_CITIES,
@@ -69,6 +85,30 @@ def extract_city_and_country(text: str):
     return city.title(), country
 
 
+def fetch_current(location_query: str) -> dict:
+    """One WeatherAPI current.json call (raises on network errors)."""
+    res = requests.get(
+        "https://api.weatherapi.com/v1/current.json",
+        params={
+            "key": API_KEY,
+            "q": location_query,
+            "aqi": "no"
+        },
+        timeout=5
+    )
+    return res.json()
+
+
+WEATHER_CACHE = SWRCache(
+    fetch_current,
+    ttl=WEATHER_CACHE_TTL,
+    stale_ttl=WEATHER_STALE_TTL,
+    max_entries=WEATHER_CACHE_SIZE,
+    cacheable=lambda data: "current" in data,   # never cache API errors
+)
+register("weather.cache", WEATHER_CACHE.stats)
+
+
 def get_weather(query: str) -> str:
     """
     Fetch accurate current weather using WeatherAPI (API key required)
@@ -86,23 +126,29 @@ def get_weather(query: str) -> str:
         if not city:
             return "Please tell me a city name."
 
-        # 🔥 Fuzzy city correction
-        city = normalize_city(city)
-
-        # 🔥 Build WeatherAPI query
-        location_query = city
-        if country:
-            location_query = f"{city}, {country}"
-
-        url = "https://api.weatherapi.com/v1/current.json"
-        params = {
-            "key": API_KEY,
-            "q": location_query,
-            "aqi": "no"
-        }
-
-        res = requests.get(url, params=params, timeout=5)
-        data = res.json()
+        # 🔥 Offline gazetteer: corrected name + coordinates
+        place = find_place(f"{city}, {country}" if country else city)
+
+        if place:
+            city = place.name
+            location_query = f"{place.lat},{place.lon}"
+        else:
+            # 🔥 Fuzzy city correction
+            city = normalize_city(city)
+
+            # 🔥 Build WeatherAPI query
+            location_query = city
+            if country:
+                location_query = f"{city}, {country}"
+
+            # Already geocoded (time/maps/pre-warm)? Ask by coordinates.
+            known = cached_geocode(location_query)
+            if known:
+                lat, lon = known[1]
+                location_query = f"{lat},{lon}"
+
+        # 🔥 Cached, coalesced WeatherAPI call
+        data = WEATHER_CACHE.get(location_query.lower())
 
         if "error" in data:
             return f"I couldn't find weather data for {city}."
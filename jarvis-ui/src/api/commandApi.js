@@ -26,3 +26,49 @@ export async function sendCommand(command) {
     return { reply: "Jarvis connection failed." };
   }
 }
+
+// 📡 STREAMING COMMAND: onDelta(text) per AI chunk, resolves with the final envelope
+// (or { reply, error: true } when the answer broke off; drop the deltas shown so far)
+export async function sendCommandStream(command, onDelta, chatId = null) {
+  const token = sessionStorage.getItem("jarvis_token");
+
+  const response = await fetch(`${API_URL}/stream`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+    },
+    body: JSON.stringify({ command, chat_id: chatId }),
+  });
+
+  if (!response.ok || !response.body) {
+    return { reply: "Jarvis encountered an error." };
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  let final = null;
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    const events = buffer.split("\n\n");
+    buffer = events.pop();
+
+    for (const raw of events) {
+      const event = raw.match(/^event: (.*)$/m)?.[1];
+      const data = raw.match(/^data: (.*)$/m)?.[1];
+      if (!data) continue;
+
+      const payload = JSON.parse(data);
+      if (event === "delta") onDelta?.(payload.text);
+      if (event === "final") final = payload;
+      if (event === "error") final = { reply: payload.detail, error: true };
+    }
+  }
+
+  return final ?? { reply: "No response from Jarvis" };
+}
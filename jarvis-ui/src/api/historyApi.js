@@ -34,3 +34,46 @@ export async function getChatHistory() {
 
   return res.json();
 }
+
+// 📋 GET CONVERSATION SUMMARIES (SIDEBAR)
+export async function getChatSummaries(cursor = 0, limit = 20) {
+  const token = sessionStorage.getItem("jarvis_token");
+
+  const res = await fetch(
+    `${BASE_URL}/auth/history/summaries?cursor=${cursor}&limit=${limit}`,
+    {
+      headers: token
+        ? { Authorization: `Bearer ${token}` }
+        : {},
+    }
+  );
+
+  if (!res.ok) {
+    throw new Error("Failed to fetch chat summaries");
+  }
+
+  return res.json(); // { items, next_cursor }
+}
+
+// 💬 GET ONE PAGE OF MESSAGES (pass next_cursor as `before` for older)
+export async function getChatMessages(chatId, before = null, limit = 50) {
+  const token = sessionStorage.getItem("jarvis_token");
+
+  const params = new URLSearchParams({ limit });
+  if (before !== null) params.set("before", before);
+
+  const res = await fetch(
+    `${BASE_URL}/auth/history/${chatId}/messages?${params}`,
+    {
+      headers: token
+        ? { Authorization: `Bearer ${token}` }
+        : {},
+    }
+  );
+
+  if (!res.ok) {
+    throw new Error("Failed to fetch chat messages");
+  }
+
+  return res.json(); // { chat_id, messages, next_cursor, total }
+}
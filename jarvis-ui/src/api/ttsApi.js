@@ -0,0 +1,13 @@
+const TTS_URL = "http://127.0.0.1:8000/tts";
+
+// 🔊 URL of the spoken reply (usable directly as <audio src>)
+export function getTtsUrl(text, { voice = "en-us", speed = 145, pitch = 50 } = {}) {
+  const params = new URLSearchParams({ text, voice, speed, pitch });
+  return `${TTS_URL}?${params}`;
+}
+
+export function playReply(text, options) {
+  const audio = new Audio(getTtsUrl(text, options));
+  audio.play().catch((error) => console.error("TTS Error:", error));
+  return audio;
+}
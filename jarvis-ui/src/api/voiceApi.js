@@ -0,0 +1,92 @@
+const VOICE_URL = "ws://127.0.0.1:8000/voice";
+
+// AudioWorklet: Float32 mic samples → Int16 PCM, posted to the page in ~100 ms batches
+const WORKLET = `
+class PcmCapture extends AudioWorkletProcessor {
+  constructor() {
+    super();
+    this.batch = [];
+    this.size = 0;
+    this.target = Math.round(sampleRate / 10);
+  }
+  process(inputs) {
+    const channel = inputs[0][0];
+    if (channel) {
+      const pcm = new Int16Array(channel.length);
+      for (let i = 0; i < channel.length; i++) {
+        const s = Math.max(-1, Math.min(1, channel[i]));
+        pcm[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
+      }
+      this.batch.push(pcm);
+      this.size += pcm.length;
+      if (this.size >= this.target) {
+        const out = new Int16Array(this.size);
+        let offset = 0;
+        for (const part of this.batch) { out.set(part, offset); offset += part.length; }
+        this.port.postMessage(out.buffer, [out.buffer]);
+        this.batch = [];
+        this.size = 0;
+      }
+    }
+    return true;
+  }
+}
+registerProcessor("pcm-capture", PcmCapture);
+`;
+
+// 🎙️ Stream the microphone to Jarvis.
+// onPartial(text) while speaking, onFinal(text) per utterance, onReply({ reply, intent, ... }).
+// Resolves with { end(), stop() }: end() finalizes the current utterance, stop() closes everything.
+export async function startVoiceSession({ chatId = null, onPartial, onFinal, onReply, onError } = {}) {
+  const stream = await navigator.mediaDevices.getUserMedia({
+    audio: { channelCount: 1, echoCancellation: true, noiseSuppression: true },
+  });
+  const context = new AudioContext();
+
+  const moduleUrl = URL.createObjectURL(new Blob([WORKLET], { type: "application/javascript" }));
+  await context.audioWorklet.addModule(moduleUrl);
+  URL.revokeObjectURL(moduleUrl);
+
+  const token = sessionStorage.getItem("jarvis_token");
+  const params = new URLSearchParams({ sample_rate: context.sampleRate });
+  if (chatId) params.set("chat_id", chatId);
+  if (token) params.set("token", token);
+
+  const socket = new WebSocket(`${VOICE_URL}?${params}`);
+  socket.binaryType = "arraybuffer";
+
+  socket.onmessage = (event) => {
+    const message = JSON.parse(event.data);
+    if (message.type === "partial") onPartial?.(message.text);
+    else if (message.type === "final") onFinal?.(message.text);
+    else if (message.type === "reply") onReply?.(message);
+    else if (message.type === "error") onError?.(message.detail);
+  };
+  socket.onerror = () => onError?.("Voice connection failed.");
+
+  const source = context.createMediaStreamSource(stream);
+  const capture = new AudioWorkletNode(context, "pcm-capture");
+  capture.port.onmessage = (event) => {
+    if (socket.readyState === WebSocket.OPEN) socket.send(event.data);
+  };
+  source.connect(capture);
+
+  let stopped = false;
+  const stop = () => {
+    if (stopped) return;
+    stopped = true;
+    source.disconnect();
+    capture.disconnect();
+    stream.getTracks().forEach((track) => track.stop());
+    context.close();
+    if (socket.readyState <= WebSocket.OPEN) socket.close();
+  };
+  socket.onclose = stop;
+
+  return {
+    end() {
+      if (socket.readyState === WebSocket.OPEN) socket.send(JSON.stringify({ type: "end" }));
+    },
+    stop,
+  };
+}